@@ -14,20 +14,21 @@
 # Dataframe libraries:
 import numpy as np
 import pandas as pd
-import xarray as xr
 import pickle
 from datetime import datetime
 
 # I/O libraries:
 import os, glob
 
-# Plotting libraries:
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+# GloSAT LUT libraries:
+from glosat_lut.lazy import lazy_import
+from glosat_lut.archive import read_archive
+from glosat_lut.cube import load_cube, cube_is_current
+from glosat_lut.crutem import write_station_file
 
-# Stats libraries:
-import scipy.stats as stats
-import statsmodels.api as sm
+# Plotting libraries (imported on first use):
+plt = lazy_import('matplotlib.pyplot')
+mdates = lazy_import('matplotlib.dates')
 
 #-----------------------------------------------------------------------------
 # SETTINGS
@@ -39,6 +40,7 @@ output_dir = 'OUT'
 
 one_station = True
 pkl_archive = 'DATA/df_temp.pkl'
+cube_archive = 'DATA/df_temp_cube/'     # used instead of pkl_archive when built (python -m glosat_lut.cube build)
 stationcode = '619670' # Diego Garcia
 
 stationfile_cru = output_dir + '/' + stationcode + '_' + 'cru.txt'
@@ -50,7 +52,11 @@ glosat_version = 'GloSAT.p04'
 # LOAD: GloSAT absolute temperature archive in pickled pandas dataframe format
 #------------------------------------------------------------------------------
 
-df_temp = pd.read_pickle(pkl_archive, compression='bz2')
+cube = load_cube(cube_archive) if cube_is_current(cube_archive, pkl_archive) else None
+if cube is not None and stationcode in cube:
+    df_temp = cube.station_frame(stationcode)
+else:
+    df_temp = read_archive(pkl_archive, stationcodes=[stationcode])
 try:
     value = np.where(df_temp['stationcode'].unique()==stationcode)[0][0]
 except:        
@@ -60,10 +66,9 @@ except:
 # EXTRACT: station data + metadata
 #------------------------------------------------------------------------------
 
-station_data = df_temp[df_temp['stationcode']==df_temp['stationcode'].unique()[value]].iloc[:,range(0,13)].reset_index(drop=True)
-station_metadata = df_temp[df_temp['stationcode']==df_temp['stationcode'].unique()[value]].iloc[0,range(14,23)]
-
 da = df_temp[df_temp['stationcode']==df_temp['stationcode'].unique()[value]]
+station_data = da.iloc[:,range(0,13)].reset_index(drop=True)
+station_metadata = da.iloc[0,range(14,23)]
 
 # TRIM: to start of Pandas datetime:
 
@@ -93,19 +98,7 @@ station_header = ' ' + stationcode[1:] + ' ' + stationlat + ' ' + stationlon + '
 # WRITE: station header + yearly rows of monthly values in CRUTEM format
 #------------------------------------------------------------------------------
 
-with open(stationfile_cru,'w') as f:
-    f.write(station_header+'\n')
-    for i in range(len(station_data)):  
-        year = str(int(station_data.iloc[i,:][0]))
-        rowstr = year
-        for j in range(1,13):
-            if np.isnan(station_data.iloc[i,:][j]):
-                monthstr = str(-999)
-            else:
-                monthstr = str(int(station_data.iloc[i,:][j]*10))
-            rowstr += f"{monthstr:>5}"          
-        f.write(rowstr+'\n')
-f.close()
+write_station_file(stationfile_cru, station_header, station_data['year'], station_data.iloc[:,1:13], scale=10)
         
 #-----------------------------------------------------------------------------
 # EXTRACT: station to CRUTEM format
@@ -173,20 +166,7 @@ if one_station == True:
     # WRITE: station header + yearly rows of monthly values in CRUTEM format
     #------------------------------------------------------------------------------
 
-    with open(stationfile_c3s,'w') as g:
-        g.write(station_header+'\n')
-        for i in range(len(station_data)):  
-            year = str(int(station_data[i][0]))
-            print('year=',str(year))
-            rowstr = year
-            for j in range(1,13):
-                if np.isnan(station_data[i][j]):
-                    monthstr = str(-999)
-                else:
-                    monthstr = str(int(station_data[i][j]*10))
-                rowstr += f"{monthstr:>5}"          
-            g.write(rowstr+'\n')
-    g.close()       
+    write_station_file(stationfile_c3s, station_header, [ row[0] for row in station_data ], [ row[1:] for row in station_data ], scale=10)
 
 ts_c3s = np.array([ station_data[i][1:] for i in range(len(station_data)) ]).ravel()
 t_c3s = pd.date_range(start=str(station_data[0][0]), periods=len(ts_c3s), freq='M')   
@@ -3,8 +3,8 @@
 #-----------------------------------------------------------------------
 # PROGRAM: glosat-c3s-crutem-converter.py
 #-----------------------------------------------------------------------
-# Version 0.1
-# 18 May, 2021
+# Version 0.2
+# 18 October, 2026
 # Dr Michael Taylor
 # https://patternizer.github.io
 # patternizer AT gmail DOT com
@@ -14,16 +14,15 @@
 # Dataframe libraries:
 import numpy as np
 import pandas as pd
-import xarray as xr
 import pickle
 from datetime import datetime
 
 # I/O libraries:
 import os, glob
 
-# Plotting libraries:
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+# GloSAT LUT libraries:
+from glosat_lut.stationids import resolve_station_codes, PRIMARY_STATION_ID_RULES
+from glosat_lut.crutem import crutem_header, write_station_file
 
 #-----------------------------------------------------------------------------
 # SETTINGS
@@ -97,32 +96,12 @@ for file in filelist:
     station_crucode = 'XXXXX'
 
     station_code_in = str(dg['primary_station_id'].unique()[0])
-    if station_code_in[-6:][0] == '0':
-        if station_code_in[-6:][1] == '6':
-    	    station_code = station_code_in[-5:] + '0'
-        elif station_code_in[-6:][1] == '0': 
-    	    station_code = '6' + station_code_in[-4:] + '0'
-        else:
-    	    station_code = station_code_in	        
-    else:
-        station_code = station_code_in	        
+    station_code = resolve_station_codes([station_code_in], PRIMARY_STATION_ID_RULES, missing=None)[0]
     station_source = dg['source_id '].unique()
 
     # CRUTEM station header
 
-    stationcode = "{:>6}".format(station_code[-6:])
-    stationlat = "{:>4}".format(str(int(station_lat*10)))
-    stationlon = "{:>5}".format(str(int(station_lon*10)))
-    stationelevation = "{:>5}".format(str(station_elevation))
-    stationname = "{:<20}".format(station_name[:20])
-    stationcountry = "{:<13}".format(station_country[:13])
-    stationfirst = "{:>4}".format(str(station_first))
-    stationlast = "{:>4}".format(str(station_last))
-    stationsource = "{:>2}".format('XX')    
-    stationfirstreliable = "{:>4}".format(str(station_firstreliable))
-    stationcrucode = "{:>8}".format('XXXXX')
-    
-    station_header = stationcode + stationlat + stationlon + stationelevation + ' ' + stationname + ' ' + stationcountry + ' ' + stationfirst + stationlast + '  ' + stationsource + stationfirstreliable + stationcrucode
+    station_header = crutem_header(station_code, station_lat, station_lon, station_elevation, station_name, station_country, station_first, station_last, station_firstreliable)
     
     #------------------------------------------------------------------------------
     # WRITE: station header + yearly rows of monthly values in CRUTEM format
@@ -133,19 +112,8 @@ for file in filelist:
     else:
         stationfile_c3s = output_dir + '/' + station_code + '_' + 'crutem_format' + '_' + 'temperature' + '.txt'
 
-    with open(stationfile_c3s,'w') as g:
-        g.write(station_header+'\n')
-        for i in range(len(station_data)):  
-            year = str(int(station_data[i][0]))
-            rowstr = year
-            for j in range(1,13):
-                if np.isnan(station_data[i][j]):
-                    monthstr = str(-999)
-                else:
-                    monthstr = str(int(station_data[i][j]*10))
-                rowstr += f"{monthstr:>5}"          
-            g.write(rowstr+'\n')
-    g.close()       
+    station_data = np.array(station_data, dtype=float)
+    write_station_file(stationfile_c3s, station_header, station_data[:,0], station_data[:,1:], scale=10)
                     
 #-----------------------------------------------------------------------------
 print('** END')
@@ -0,0 +1,14 @@
+#-----------------------------------------------------------------------
+# PACKAGE: glosat_lut
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Shared methods for the GloSAT look-up table (LUT) and CRUTEM converter scripts.
+"""
@@ -0,0 +1,361 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/adapters.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Inventory adapters and the shared LUT construction engine.
+
+Each source inventory is declared once as an InventoryAdapter: its loader
+(reader, file name, read options), an optional prepare() step, the station
+code rule, a column mapping onto the 13 LUT columns, constant columns and fill
+values for missing coordinates / elevation. build_lut() turns any adapter's
+frame into a LUT with the same vectorized code path, and build_luts() loads
+and builds independent adapters concurrently (each worker returns only its
+small LUT, never the raw inventory). Adding a source is one register_adapter()
+call:
+
+    register_adapter(InventoryAdapter(
+        name = 'lut5', source_lut = 5,
+        reader = 'excel', filename = 'new_inventory.xlsx',
+        station_code = lambda df: resolve_station_codes(df['wmo_id'], SECONDARY_ID_RULES),
+        columns = {'station_lat': 'lat', 'station_lon': 'lon', ...},
+        ))
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut.stationids import resolve_station_codes, SECONDARY_ID_RULES
+from glosat_lut.loaders import read_inventory, _executor
+from glosat_lut.schema import compact_lut
+
+# I/O libraries:
+import os, time
+from concurrent.futures import as_completed
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+LUT_COLUMNS = [
+    'station_code',
+    'station_lat',
+    'station_lon',
+    'station_elevation',
+    'station_name',
+    'station_country',
+    'station_firstyear',
+    'station_lastyear',
+    'source_code1',
+    'source_code2',
+    'source_lut',
+    'iso-3166',
+    'continent',
+    ]
+
+LUT_STRING_COLUMNS = {'station_code': 'string', 'station_name': 'string', 'station_country': 'string', 'source_code1': 'string', 'source_code2': 'string'}
+
+# missing values in CRUTEM format (lat*10, lon*10)
+
+LUT_FILL_VALUES = {'station_lat': -999, 'station_lon': -9999, 'station_elevation': -9999}
+
+ADAPTERS = {}
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+class InventoryAdapter:
+
+    """
+    Declaration of one source inventory:
+
+    name         = registry key (e.g. 'lut1')
+    source_lut   = value of the source_lut column
+    reader       = 'excel' | 'pickle' (see glosat_lut.loaders)
+    filename     = inventory file name relative to the data directory
+    read_kwargs  = extra reader options
+    prepare      = optional df --> df step run before mapping (e.g. reductions)
+    station_code = df --> array of CRU station codes ('-999' if unresolved)
+    columns      = {LUT column: source column}
+    constants    = {LUT column: value} (unmapped source_code2, iso-3166, continent default to '-999')
+    fill_values  = {LUT column: missing value} overriding LUT_FILL_VALUES
+    """
+
+    def __init__(self, name, source_lut, reader, filename, station_code, columns, read_kwargs=None, prepare=None, constants=None, fill_values=None):
+
+        self.name = name
+        self.source_lut = source_lut
+        self.reader = reader
+        self.filename = filename
+        self.read_kwargs = dict(read_kwargs or {})
+        self.prepare = prepare
+        self.station_code = station_code
+        self.columns = dict(columns)
+        self.constants = {'source_code2': str(-999), 'iso-3166': str(-999), 'continent': str(-999)}
+        self.constants.update(constants or {})
+        for column in self.columns:
+            self.constants.pop(column, None)
+        self.fill_values = dict(LUT_FILL_VALUES)
+        self.fill_values.update(fill_values or {})
+
+    def path(self, data_dir):
+
+        return os.path.join(data_dir, self.filename)
+
+    def load(self, data_dir, snapshot_dir=None):
+
+        return read_inventory(self.reader, self.path(data_dir), snapshot_dir=snapshot_dir, **self.read_kwargs)
+
+    def build(self, df, coords_dp=1, compact=False):
+
+        return build_lut(self, df, coords_dp=coords_dp, compact=compact)
+
+def register_adapter(adapter):
+
+    ADAPTERS[adapter.name] = adapter
+    return adapter
+
+def build_lut(adapter, df, coords_dp=1, compact=False):
+
+    """
+    Shared vectorized engine: map an inventory frame onto the LUT columns
+    (with the compact schema of glosat_lut.schema if compact=True).
+    """
+
+    if adapter.prepare is not None:
+        df = adapter.prepare(df)
+    lut = pd.DataFrame(index=df.index)
+    for column in LUT_COLUMNS:
+        if column == 'station_code':
+            values = pd.Series(adapter.station_code(df), index=df.index)
+        elif column == 'source_lut':
+            values = adapter.source_lut
+        elif column in adapter.constants:
+            values = adapter.constants[column]
+        elif column in ['station_lat', 'station_lon']:
+            scaled = (df[adapter.columns[column]]*10**coords_dp).fillna(adapter.fill_values[column])
+            values = np.round(scaled).astype(int)
+        elif column == 'station_elevation':
+            values = df[adapter.columns[column]].fillna(adapter.fill_values[column]).astype(int)
+        else:
+            values = df[adapter.columns[column]]
+            if column in adapter.fill_values:
+                values = values.fillna(adapter.fill_values[column])
+        lut[column] = values
+    lut = lut.astype(LUT_STRING_COLUMNS)
+    return compact_lut(lut) if compact else lut
+
+def _load_and_build(name, data_dir, snapshot_dir, coords_dp, compact):
+
+    t0 = time.perf_counter()
+    adapter = ADAPTERS[name]
+    lut = adapter.build(adapter.load(data_dir, snapshot_dir=snapshot_dir), coords_dp=coords_dp, compact=compact)
+    return name, lut, time.perf_counter() - t0
+
+def build_luts(names=None, data_dir='DATA/', coords_dp=1, compact=False, parallel=True, max_workers=None, snapshot_dir=None, verbose=True):
+
+    """
+    Load and build the LUTs of the named adapters (all registered adapters if
+    None) and return {name: LUT} in the order given. Adapters are independent,
+    so with parallel=True each one is loaded and built in its own worker.
+    """
+
+    names = list(ADAPTERS) if names is None else list(names)
+    t0 = time.perf_counter()
+    luts = {}
+    timings = {}
+
+    def report(name, seconds):
+        if verbose:
+            print('  built ' + name + ' (' + ADAPTERS[name].filename + ') in ' + '{:.2f}'.format(seconds) + 's')
+
+    if parallel and len(names) > 1:
+        nworkers = min(len(names), max_workers or os.cpu_count() or 1)
+        with _executor(nworkers) as pool:
+            futures = [ pool.submit(_load_and_build, name, data_dir, snapshot_dir, coords_dp, compact) for name in names ]
+            for future in as_completed(futures):
+                name, lut, timings[name] = future.result()
+                luts[name] = lut
+                report(name, timings[name])
+    else:
+        for name in names:
+            name, lut, timings[name] = _load_and_build(name, data_dir, snapshot_dir, coords_dp, compact)
+            luts[name] = lut
+            report(name, timings[name])
+    if verbose:
+        print('  wall-clock build time ' + '{:.2f}'.format(time.perf_counter() - t0) + 's (sum of sources ' + '{:.2f}'.format(sum(timings.values())) + 's)')
+    return { name: luts[name] for name in names }
+
+#-----------------------------------------------------------------------------
+# ADAPTERS: GloSAT inventories
+#-----------------------------------------------------------------------------
+# LUT1 dataset: Courtesy of Simon Noone, Peter Thorne and Robert Dunn
+#-----------------------------------------------------------------------------
+#Index(['station_id', 'source_uid', 'source_name', 'station name', 'lat', 'lon',
+#       'elev', 'country', 'observedVariable-measurand_variable', 'temporal',
+#       'temporalExtent'],
+#      dtype='object')
+#-----------------------------------------------------------------------------
+
+def _prepare_lut1(df):
+
+    temporal_extents = df['temporalExtent'].astype(str)
+    no_extent = temporal_extents == 'nan'
+    df = df.copy()
+    df['firstyear'] = temporal_extents.str[0:4].where(~no_extent, '-9999').astype(int)
+    df['lastyear'] = temporal_extents.str[5:10].where(~no_extent, '-9999').astype(int)
+    return df
+
+def _station_code_lut1(df):
+
+    station_ids = df['station_id'].astype(str)
+    return station_ids.str[:-5].where(station_ids.str[-5:] == '00000', '-999')
+
+register_adapter(InventoryAdapter(
+    name = 'lut1',
+    source_lut = 1,
+    reader = 'excel',
+    filename = 'Olg_Belgian_African_stns_inventoried.xlsx',
+    read_kwargs = {'sheet_name': 'c3s'},
+    prepare = _prepare_lut1,
+    station_code = _station_code_lut1,
+    columns = {
+        'station_lat': 'lat',
+        'station_lon': 'lon',
+        'station_elevation': 'elev',
+        'station_name': 'station name',
+        'station_country': 'country',
+        'station_firstyear': 'firstyear',
+        'station_lastyear': 'lastyear',
+        'source_code1': 'station_id',
+        },
+    ))
+
+#-----------------------------------------------------------------------------
+# LUT2 dataset: Courtesy of Simon Noone, Peter Thorne and Robert Dunn
+#-----------------------------------------------------------------------------
+#Index(['promary_id', 'secondary_id', 'station_na', 'longitude', 'latitude',
+#       'height_of_', 'start_date', 'end_date', 'region', 'source_id',
+#       'Country _id', 'Country', 'ISO'],
+#      dtype='object')
+#-----------------------------------------------------------------------------
+
+def _station_code_lut2(df):
+
+    return resolve_station_codes(df['secondary_id'], SECONDARY_ID_RULES)
+
+register_adapter(InventoryAdapter(
+    name = 'lut2',
+    source_lut = 2,
+    reader = 'excel',
+    filename = 'processed_monthly_temp_africa.xlsx',
+    station_code = _station_code_lut2,
+    columns = {
+        'station_lat': 'latitude',
+        'station_lon': 'longitude',
+        'station_elevation': 'height_of_',
+        'station_name': 'station_na',
+        'station_country': 'Country',
+        'station_firstyear': 'start_date',
+        'station_lastyear': 'end_date',
+        'source_code1': 'promary_id',
+        'source_code2': 'secondary_id',
+        'iso-3166': 'ISO',
+        },
+    ))
+
+#-----------------------------------------------------------------------------
+# LUT3 dataset: Courtesy of Simon Noone, Peter Thorne and Robert Dunn
+#-----------------------------------------------------------------------------
+#Index(['station_id', 'source_uid_1', 'source_name', 'descriptionDataset',
+#       'data_repository_ftp', 'station_name', 'lat', 'lon', 'elev',
+#       'fips_code', 'country', 'continent', 'station_data_policy',
+#       'Temp_start_year', 'Temp_end_year', 'WMO_RA', 'Region'],
+#      dtype='object')
+#-----------------------------------------------------------------------------
+
+def _station_code_lut3(df):
+
+    station_ids = df['station_id'].astype(str)
+    station_id_lengths = station_ids.str.len()
+    return np.select( [ station_id_lengths == 6, station_id_lengths == 5 ], [ station_ids, station_ids + '0' ], default='-999' )
+
+register_adapter(InventoryAdapter(
+    name = 'lut3',
+    source_lut = 3,
+    reader = 'excel',
+    filename = 'africa_temp_monthly_raw.xlsx',
+    station_code = _station_code_lut3,
+    columns = {
+        'station_lat': 'lat',
+        'station_lon': 'lon',
+        'station_elevation': 'elev',
+        'station_name': 'station_name',
+        'station_country': 'country',
+        'station_firstyear': 'Temp_start_year',
+        'station_lastyear': 'Temp_end_year',
+        'source_code1': 'station_id',
+        },
+    ))
+
+#-----------------------------------------------------------------------------
+# LUT4 dataset: GloSAT.p03
+#-----------------------------------------------------------------------------
+#Index(['year', '1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12',
+#       'stationcode', 'stationlat', 'stationlon', 'stationelevation',
+#       'stationname', 'stationcountry', 'stationfirstyear', 'stationlastyear',
+#       'stationsource', 'stationfirstreliable'],
+#      dtype='object')
+#-----------------------------------------------------------------------------
+
+def _prepare_lut4(df):
+
+    # REDUCE: one keyed pass over the metadata columns only (stations in order of first appearance)
+
+    stations = df[['stationcode','stationlat','stationlon','stationelevation','stationname','stationcountry','stationfirstyear','stationlastyear']].groupby('stationcode', sort=False).agg(
+        stationlat=('stationlat', 'mean'),
+        stationlon=('stationlon', 'mean'),
+        stationelevation=('stationelevation', 'mean'),
+        stationname=('stationname', 'first'),
+        stationcountry=('stationcountry', 'first'),
+        stationfirstyear=('stationfirstyear', 'mean'),
+        stationlastyear=('stationlastyear', 'mean'),
+        ).reset_index()
+    stations['stationelevation'] = np.round(stations['stationelevation'])
+    stations['stationfirstyear'] = stations['stationfirstyear'].astype(int)
+    stations['stationlastyear'] = stations['stationlastyear'].astype(int)
+    return stations
+
+def _station_code_lut4(df):
+
+    return df['stationcode'].astype(str)
+
+register_adapter(InventoryAdapter(
+    name = 'lut4',
+    source_lut = 4,
+    reader = 'pickle',
+    filename = 'df_temp.pkl',
+    read_kwargs = {'compression': 'bz2'},
+    prepare = _prepare_lut4,
+    station_code = _station_code_lut4,
+    columns = {
+        'station_lat': 'stationlat',
+        'station_lon': 'stationlon',
+        'station_elevation': 'stationelevation',
+        'station_name': 'stationname',
+        'station_country': 'stationcountry',
+        'station_firstyear': 'stationfirstyear',
+        'station_lastyear': 'stationlastyear',
+        },
+    constants = {'source_code1': str(-999)},
+    ))
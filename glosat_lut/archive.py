@@ -0,0 +1,383 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/archive.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Columnar storage for the GloSAT archives (DATA/df_temp.pkl, df_anom.pkl,
+df_normals.pkl).
+
+convert_archive() casts a bz2 pickle to the shared ARCHIVE_DTYPES schema,
+sorts it by stationcode and year and writes it as Parquet with row groups of
+archive_row_group_size rows. read_archive() then loads only the requested
+columns, and stationcode / year-range filters skip whole row groups using
+their min/max statistics, so a station or the station metadata is read
+without decompressing the rest of the archive. The pickled dtypes are kept
+in the Parquet metadata and restored on read, so that values print exactly
+as from the pickle (e.g. 100.0 and nan rather than 100 and <NA>):
+
+    df = read_archive('DATA/df_temp.pkl', stationcodes=['619670'])
+    df = read_archive('DATA/df_anom.pkl', columns=['stationcode','stationlat','stationlon'], years=(1781, 1849))
+    stations = read_station_metadata('DATA/df_temp.pkl')
+
+encode_archive() is the lossless alternative: the pickled frame as it is
+(dtypes, row order, index) in a compressed Arrow IPC file (.arrow) of
+archive_batch_size-row record batches with zstd-compressed buffers, which
+Arrow decompresses on all cores and memory-maps on read. Encoding is checked
+by reading the file back and comparing it with the pickle.
+
+Scripts keep referring to the .pkl paths: resolve_archive() substitutes a
+converted sibling (df_temp.parquet, then df_temp.arrow) when one exists, and
+read_archive() falls back to reading the pickle (then projecting and
+filtering in memory) when none does. Each sibling records the size, mtime and
+SHA-256 hash of the pickle it was converted from; a sibling that no longer
+matches its pickle is skipped with a warning:
+
+    $ python -m glosat_lut.archive convert DATA/df_temp.pkl DATA/df_anom.pkl DATA/df_normals.pkl
+    $ python -m glosat_lut.archive encode DATA/df_temp.pkl DATA/df_anom.pkl DATA/df_normals.pkl
+    $ python -m glosat_lut.archive info DATA/df_temp.parquet
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut.snapshots import _identical, file_sha256
+
+# I/O libraries:
+import os, json, warnings, argparse
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+archive_row_group_size = 65536
+archive_batch_size = 65536                  # rows per Arrow IPC record batch
+archive_compression = 'zstd'
+archive_compression_level = 9               # zstd level for encode_archive() (decoding speed is unaffected)
+archive_formats = ['.parquet', '.arrow']    # preferred converted formats (resolve_archive)
+archive_metadata_key = b'glosat_archive'    # Arrow schema metadata: source pickle record and pickled dtypes
+
+MONTH_COLUMNS = [ str(month) for month in range(1, 13) ]
+METADATA_COLUMNS = ['stationlat', 'stationlon', 'stationelevation', 'stationname', 'stationcountry', 'stationfirstyear', 'stationlastyear', 'stationsource', 'stationfirstreliable']
+
+# Shared schema of df_temp / df_anom / df_normals. Monthly values and
+# coordinates stay float64 so that int(x*10) in the CRUTEM writers gives the
+# same tenths as before; elevations and year-like integers use nullable Int16
+# where that is lossless. Columns not listed keep their pickled dtype.
+
+ARCHIVE_DTYPES = {
+    'year': 'int16',
+    **{ month: 'float64' for month in MONTH_COLUMNS },
+    'stationcode': 'str',
+    'stationlat': 'float64',
+    'stationlon': 'float64',
+    'stationelevation': 'Int16',
+    'stationname': 'str',
+    'stationcountry': 'str',
+    'stationfirstyear': 'Int16',
+    'stationlastyear': 'Int16',
+    'stationsource': 'Int16',
+    'stationfirstreliable': 'Int16',
+    'sourcecode': 'Int16',
+    }
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def apply_archive_dtypes(df, dtypes=ARCHIVE_DTYPES):
+
+    """
+    Cast the columns of df that appear in dtypes. Text columns keep missing
+    values as None; integer casts are only applied when they are lossless.
+    """
+
+    df = df.copy()
+    for column, dtype in dtypes.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if dtype == 'str':
+            df[column] = values.astype(str).where(values.notna(), None)
+        elif dtype.lower().startswith('int'):
+            values = pd.to_numeric(values)
+            present = values.dropna()
+            info = np.iinfo(dtype.lower())
+            lossless = (present == np.round(present)).all() and present.between(info.min, info.max).all()
+            nullable = dtype != dtype.lower()
+            if lossless and (nullable or len(present) == len(values)):
+                df[column] = values.astype(dtype)
+        else:
+            df[column] = pd.to_numeric(values).astype(dtype)
+    return df
+
+def _read_pickle(path):
+
+    return pd.read_pickle(path, compression='bz2' if path.endswith('.pkl') else 'infer')
+
+def source_record(pkl_file):
+
+    """
+    Size, mtime and SHA-256 hash of the pickle a sibling is converted from.
+    """
+
+    stat = os.stat(pkl_file)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_sha256(pkl_file)}
+
+def sibling_is_current(sibling, record, pkl_file):
+
+    """
+    True if a converted sibling still matches pkl_file (size and mtime, or
+    the content hash after a touch), or if there is no pickle to compare
+    with. Otherwise warns that the pickle is read instead and returns False.
+    """
+
+    if not os.path.exists(pkl_file):
+        return True
+    if record is not None:
+        stat = os.stat(pkl_file)
+        if record['size'] == stat.st_size and (record['mtime_ns'] == stat.st_mtime_ns or record['sha256'] == file_sha256(pkl_file)):
+            return True
+    warnings.warn(sibling + ' does not match ' + pkl_file + ' (' + ('not recorded' if record is None else 'changed since conversion') + '): reading the pickle', stacklevel=2)
+    return False
+
+def _sibling_metadata(path):
+
+    # the archive_metadata_key record of a converted sibling (None if absent)
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith('.arrow'):
+        with pa.memory_map(path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    else:
+        metadata = pq.read_schema(path).metadata or {}
+    return json.loads(metadata[archive_metadata_key]) if archive_metadata_key in metadata else None
+
+def resolve_archive(path, formats=None):
+
+    """
+    Return the first converted sibling of a .pkl archive that exists and still
+    matches the pickle (formats in archive_formats order), else path itself.
+    """
+
+    stem, ext = os.path.splitext(path)
+    for fmt in (archive_formats if formats is None else formats):
+        if ext != fmt and os.path.exists(stem + fmt):
+            metadata = _sibling_metadata(stem + fmt)
+            if sibling_is_current(stem + fmt, None if metadata is None else metadata['source'], stem + '.pkl'):
+                return stem + fmt
+    return path
+
+def convert_archive(pkl_file, output_file=None, row_group_size=archive_row_group_size, compression=archive_compression):
+
+    """
+    Re-encode a bz2 pickled archive as Parquet (see module docstring) and
+    return the output path.
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if output_file is None:
+        output_file = os.path.splitext(pkl_file)[0] + '.parquet'
+    source = source_record(pkl_file)
+    df = _read_pickle(pkl_file)
+    dtypes = { column: str(dtype) for column, dtype in df.dtypes.items() }
+    df = apply_archive_dtypes(df)
+    keys = [ column for column in ['stationcode', 'year'] if column in df.columns ]
+    if keys:
+        df = df.sort_values(keys, kind='stable')
+    df = df.reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), archive_metadata_key: json.dumps({'source': source, 'dtypes': dtypes})}
+    pq.write_table(table.replace_schema_metadata(metadata), output_file, compression=compression, row_group_size=row_group_size)
+    return output_file
+
+def _read_parquet(path, columns=None, filters=None):
+
+    # cast back to the pickled dtypes (nullable Int16 --> float64 with NaN,
+    # int16 --> int64, ...) and restore NaN for missing object-column values
+
+    df = pd.read_parquet(path, columns=columns, filters=filters)
+    metadata = _sibling_metadata(path)
+    dtypes = {} if metadata is None else metadata['dtypes']
+    for column in df.columns:
+        dtype = dtypes.get(column, str(df[column].dtype))
+        if dtype == 'object':
+            df[column] = df[column].astype(object).where(df[column].notna(), np.nan)
+        elif dtype != str(df[column].dtype):
+            df[column] = df[column].astype(dtype)
+    return df
+
+def encode_archive(pkl_file, output_file=None, compression=archive_compression, level=archive_compression_level, batch_size=archive_batch_size, verify=True):
+
+    """
+    Re-encode a bz2 pickled archive losslessly as compressed Arrow IPC (see
+    module docstring) and return the output path. Raises ValueError, and
+    writes nothing, if the frame does not round-trip exactly.
+    """
+
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    if output_file is None:
+        output_file = os.path.splitext(pkl_file)[0] + '.arrow'
+    source = source_record(pkl_file)
+    df = _read_pickle(pkl_file)
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowTypeError, pa.ArrowInvalid) as e:
+        raise ValueError(pkl_file + ' cannot be stored as Arrow: ' + str(e))
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), archive_metadata_key: json.dumps({'source': source})})
+    feather.write_feather(table, output_file, compression=compression, compression_level=level, chunksize=batch_size)
+    if verify and not _identical(df, _read_arrow(output_file)):
+        os.remove(output_file)
+        raise ValueError(pkl_file + ' does not round-trip exactly through Arrow IPC: keep the pickle')
+    return output_file
+
+def _read_arrow(path, columns=None):
+
+    # multi-threaded decompression of the memory-mapped IPC file; missing
+    # object-column values come back as None and are restored to NaN as in
+    # the pickles (encode_archive() verifies the round trip)
+
+    import pyarrow.feather as feather
+
+    table = feather.read_table(path, columns=columns, use_threads=True, memory_map=True)
+    df = table.to_pandas(use_threads=True)
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), np.nan)
+    return df
+
+def _filters(stationcodes=None, years=None):
+
+    filters = []
+    if stationcodes is not None:
+        filters.append(('stationcode', 'in', [ str(code) for code in stationcodes ]))
+    if years is not None:
+        first, last = years
+        if first is not None:
+            filters.append(('year', '>=', int(first)))
+        if last is not None:
+            filters.append(('year', '<=', int(last)))
+    return filters or None
+
+def _filter_frame(df, stationcodes=None, years=None):
+
+    keep = np.ones(len(df), dtype=bool)
+    if stationcodes is not None:
+        keep &= df['stationcode'].astype(str).isin([ str(code) for code in stationcodes ]).to_numpy()
+    if years is not None:
+        first, last = years
+        if first is not None:
+            keep &= (df['year'] >= first).to_numpy()
+        if last is not None:
+            keep &= (df['year'] <= last).to_numpy()
+    return df[keep]
+
+def read_archive(path, columns=None, stationcodes=None, years=None):
+
+    """
+    Load an archive with optional column projection, stationcode list and
+    (first, last) year range (either end may be None). path may name the
+    .pkl; its converted sibling is used when present.
+    """
+
+    path = resolve_archive(path)
+    if path.endswith('.parquet'):
+        return _read_parquet(path, columns=columns, filters=_filters(stationcodes, years))
+
+    if path.endswith('.arrow'):
+        needed = None
+        if columns is not None:
+            filter_columns = (['stationcode'] if stationcodes is not None else []) + (['year'] if years is not None else [])
+            needed = list(columns) + [ column for column in filter_columns if column not in columns ]
+        df = _read_arrow(path, needed)
+    else:
+        df = _read_pickle(path)
+    if stationcodes is None and years is None:
+        return df if columns is None else df[columns]
+    df = _filter_frame(df, stationcodes, years).reset_index(drop=True)
+    return df if columns is None else df[columns]
+
+def read_station_metadata(path, columns=METADATA_COLUMNS):
+
+    """
+    One row per station (first row of each stationcode) with its metadata
+    columns, reading only those columns. Served from the station table of a
+    star-schema sibling (df_temp_star/, glosat_lut.star) when one exists and
+    still matches the pickle.
+    """
+
+    from glosat_lut.star import StarArchive, star_is_current
+
+    star_dir = os.path.splitext(path)[0] + '_star'
+    if star_is_current(star_dir, os.path.splitext(path)[0] + '.pkl'):
+        df = StarArchive(star_dir).stations[['stationcode'] + list(columns)]
+        return df.drop_duplicates('stationcode').reset_index(drop=True)
+    df = read_archive(path, columns=['stationcode'] + list(columns))
+    return df.drop_duplicates('stationcode').reset_index(drop=True)
+
+def archive_info(path):
+
+    """
+    Row group layout of a Parquet archive: rows and stationcode / year ranges.
+    """
+
+    import pyarrow.parquet as pq
+
+    metadata = pq.ParquetFile(path).metadata
+    names = metadata.schema.names
+    rows = []
+    for i in range(metadata.num_row_groups):
+        group = metadata.row_group(i)
+        row = {'row_group': i, 'rows': group.num_rows, 'bytes': group.total_byte_size}
+        for column in ['stationcode', 'year']:
+            if column in names:
+                statistics = group.column(names.index(column)).statistics
+                row[column + '_min'] = statistics.min if statistics is not None else None
+                row[column + '_max'] = statistics.max if statistics is not None else None
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+#-----------------------------------------------------------------------------
+# MAIN:
+#-----------------------------------------------------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m glosat_lut.archive', description='Columnar GloSAT archives')
+    commands = parser.add_subparsers(dest='command', required=True)
+    convert_parser = commands.add_parser('convert', help='re-encode bz2 pickled archives as Parquet')
+    convert_parser.add_argument('archives', nargs='+')
+    convert_parser.add_argument('--row-group-size', type=int, default=archive_row_group_size)
+    encode_parser = commands.add_parser('encode', help='re-encode bz2 pickled archives losslessly as zstd Arrow IPC')
+    encode_parser.add_argument('archives', nargs='+')
+    encode_parser.add_argument('--level', type=int, default=archive_compression_level, help='zstd compression level')
+    encode_parser.add_argument('--batch-size', type=int, default=archive_batch_size)
+    encode_parser.add_argument('--no-verify', action='store_true', help='skip the read-back comparison with the pickle')
+    commands.add_parser('info', help='row groups of a Parquet archive').add_argument('archive')
+    args = parser.parse_args(argv)
+
+    if args.command in ['convert', 'encode']:
+        for pkl_file in args.archives:
+            if args.command == 'convert':
+                output_file = convert_archive(pkl_file, row_group_size=args.row_group_size)
+            else:
+                output_file = encode_archive(pkl_file, level=args.level, batch_size=args.batch_size, verify=not args.no_verify)
+            print(pkl_file, '-->', output_file, '{:.1f} MB'.format(os.path.getsize(output_file)/1e6))
+    else:
+        print(archive_info(args.archive).to_string(index=False))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/batch.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Batch conversion of C3S raw Tmin/Tmax source pairs (DATA/C3S_raw/<source>.min
+and <source>.max) to CRUTEM station files, as done for one pair by
+glosat-c3s-crutem-converter-raw.py.
+
+Sources are converted concurrently in a process pool (one source per task:
+parse and join with glosat_lut.c3s_raw, write with glosat_lut.crutem). Within
+a source the station files are written by station_workers threads, since
+pool workers cannot start processes of their own. Each source goes to
+OUT/<source>/ (Tmean) and OUT/<source>/<output>/ (other outputs), and its
+throughput (stations/s and rows/s over the station files written) is
+reported for sizing batch nodes:
+
+    $ python -m glosat_lut.batch
+    $ python -m glosat_lut.batch fwa ghcn --outputs tmean dtr --workers 2 --station-workers 8
+"""
+
+# Dataframe libraries:
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut.c3s_raw import join_raw_files
+from glosat_lut.crutem import write_station_files
+
+# I/O libraries:
+import os, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+input_dir = 'DATA/C3S_raw'
+output_dir = 'OUT'
+batch_workers = os.cpu_count() or 1          # processes (sources converted at once)
+station_workers = 4                         # threads writing station files per source
+
+SOURCES = ['fwa', 'griffiths-sa', 'south-africa', 'wwr', 'ghcn', 'ghcnd-nonconus']
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def source_files(source, input_dir=input_dir):
+
+    return os.path.join(input_dir, source + '.min'), os.path.join(input_dir, source + '.max')
+
+def convert_source(source, input_dir=input_dir, output_dir=output_dir, outputs=('tmean',), station_workers=station_workers):
+
+    """
+    Convert one source pair and return its throughput record (stations and
+    rows written over all outputs, parse and total seconds, stations/s,
+    rows/s).
+    """
+
+    t0 = time.perf_counter()
+    frames = join_raw_files(*source_files(source, input_dir), outputs=outputs)
+    t1 = time.perf_counter()
+    stations = rows = 0
+    for output, df in frames.items():
+        stationdir = os.path.join(output_dir, source) if output == 'tmean' else os.path.join(output_dir, source, output)
+        os.makedirs(stationdir, exist_ok=True)
+        stations += write_station_files(df, stationdir, scale=1, code='XXXXXX', workers=station_workers)
+        rows += len(df)
+    seconds = time.perf_counter() - t0
+    return {'source': source, 'stations': stations, 'rows': rows, 'parse_s': t1 - t0, 'seconds': seconds,
+        'stations_per_s': stations / seconds, 'rows_per_s': rows / seconds}
+
+def convert_sources(sources=SOURCES, input_dir=input_dir, output_dir=output_dir, outputs=('tmean',), workers=batch_workers, station_workers=station_workers):
+
+    """
+    Convert source pairs in a process pool and return the per-source
+    throughput as a DataFrame (in sources order). Raises FileNotFoundError
+    before starting if any .min/.max file is missing.
+    """
+
+    missing = [ path for source in sources for path in source_files(source, input_dir) if not os.path.exists(path) ]
+    if missing:
+        raise FileNotFoundError('missing source files: ' + ', '.join(missing))
+    if workers <= 1 or len(sources) <= 1:
+        return pd.DataFrame([ convert_source(source, input_dir, output_dir, outputs, station_workers) for source in sources ])
+    with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as pool:
+        futures = [ pool.submit(convert_source, source, input_dir, output_dir, outputs, station_workers) for source in sources ]
+        return pd.DataFrame([ future.result() for future in futures ])
+
+def format_report(report, seconds=None):
+
+    lines = [ '{:<20} {:>8} stations {:>10} rows {:8.2f} s  {:10.1f} stations/s {:12.1f} rows/s'.format(
+        row.source, row.stations, row.rows, row.seconds, row.stations_per_s, row.rows_per_s) for row in report.itertuples() ]
+    if seconds is not None:
+        lines.append('{:<20} {:>8} stations {:>10} rows {:8.2f} s  {:10.1f} stations/s {:12.1f} rows/s'.format(
+            'TOTAL', report['stations'].sum(), report['rows'].sum(), seconds, report['stations'].sum()/seconds, report['rows'].sum()/seconds))
+    return '\n'.join(lines)
+
+#-----------------------------------------------------------------------------
+# MAIN:
+#-----------------------------------------------------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m glosat_lut.batch', description='Convert C3S raw Tmin/Tmax source pairs to CRUTEM station files')
+    parser.add_argument('sources', nargs='*', default=SOURCES, help='source names (<source>.min / <source>.max, default: all)')
+    parser.add_argument('--input-dir', default=input_dir)
+    parser.add_argument('--output-dir', default=output_dir)
+    parser.add_argument('--outputs', nargs='+', default=['tmean'], help='tmean, tmin, tmax, dtr')
+    parser.add_argument('--workers', type=int, default=batch_workers, help='processes (sources converted at once)')
+    parser.add_argument('--station-workers', type=int, default=station_workers, help='threads writing station files per source')
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    report = convert_sources(args.sources, args.input_dir, args.output_dir, args.outputs, args.workers, args.station_workers)
+    print(format_report(report, time.perf_counter() - t0))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/c3s_raw.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Vectorized parser for the C3S raw header/data station files (fwa.min,
+ghcnd-nonconus.max, ...; via Simon Noone):
+
+    header  ID, NAME, LATITUDE, LONGITUDE, ELEVATION, FIRSTYEAR, LASTYEAR,
+            COUNTRY, SOURCECODE                 (a12,a30,i5,i6,i4,i4,i4,a20,a10)
+    data    YEAR, JAN, FEB, ..., DEC            (i4,12i5), missing = -9999
+
+    10300005306 KANDI                          1113   293 29019451979BENIN               MET FRANCE
+
+The file is read whole as one byte buffer (it is not streamed: peak memory is
+a few times the file size). Line offsets come from the newline positions, and a line is a data line when its 5th character is '-' or
+whitespace. The fixed-width fields of all data lines (and, separately, of all
+header lines) are gathered into a character matrix in chunks and decoded in
+bulk through NumPy fixed-width byte-string views ('S4', 'S5', ...), so there
+are no per-value Python float() calls. Each data line is assigned to the
+nearest preceding header line.
+
+Fields are character positions in the file decoded as raw_encoding (as the
+per-line scripts read it). Header lines holding non-ASCII characters, whose
+bytes would not line up with their characters, are decoded one by one: their
+matrix row gets one byte per character and their text fields are sliced from
+the decoded line.
+
+join_raw_files() pairs a Tmin and a Tmax file by (stationcode, year) rather
+than by row position, and derives Tmean (and optionally Tmin, Tmax and DTR)
+from the two aligned value arrays in one pass.
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+chunk_lines = 1 << 16                       # lines gathered per character matrix
+raw_missing = -9999                         # missing monthly value in the raw files
+raw_encoding = 'utf-8'                      # text encoding of the raw files (glosat_lut.crutem writes UTF-8)
+
+MONTH_COLUMNS = [ str(month) for month in range(1, 13) ]
+STATION_COLUMNS = ['stationcode', 'stationlat', 'stationlon', 'stationelevation', 'stationname', 'stationcountry', 'stationfirstyear', 'stationlastyear', 'stationsource', 'stationfirstreliable']
+
+# header field: (start, end) character positions (a12,a30,i5,i6,i4,i4,i4,a20,a10)
+
+HEADER_FIELDS = {
+    'ident': (0, 12),
+    'name': (12, 42),
+    'lat': (42, 47),
+    'lon': (47, 53),
+    'elevation': (53, 57),
+    'firstyear': (57, 61),
+    'lastyear': (61, 65),
+    'country': (65, 85),
+    'source': (85, 95),
+    }
+DATA_WIDTH = 4 + 12*5
+JOIN_OUTPUTS = ['tmean', 'tmin', 'tmax', 'dtr']
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def _line_offsets(buf):
+
+    # [start, end) of every line, without the line terminator
+
+    newlines = np.flatnonzero(buf == ord('\n'))
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buf)]))
+    if starts[-1] == len(buf):
+        starts, ends = starts[:-1], ends[:-1]
+    carriage = (ends > starts) & (buf[np.maximum(ends - 1, 0)] == ord('\r'))
+    return starts, ends - carriage
+
+def _char_matrix(buf, starts, ends, width):
+
+    # lines as a (n, width) uint8 matrix, space-padded past the line end
+
+    n = len(starts)
+    out = np.empty((n, width), dtype=np.uint8)
+    columns = np.arange(width)
+    for i in range(0, n, chunk_lines):
+        index = starts[i:i+chunk_lines, None] + columns
+        chars = buf.take(np.minimum(index, len(buf) - 1))
+        out[i:i+chunk_lines] = np.where(index < ends[i:i+chunk_lines, None], chars, ord(' '))
+    return out
+
+def _field(chars, start, end):
+
+    # one fixed-width field of every row as an 'S<width>' array
+
+    return np.ascontiguousarray(chars[:, start:end]).view('S' + str(end - start)).ravel()
+
+def _text(field):
+
+    return pd.Series(field).str.decode(raw_encoding)
+
+def _non_ascii_lines(buf, chars, starts, ends):
+
+    # decode the lines holding non-ASCII bytes and give their rows of the
+    # character matrix one byte per character ('?' for non-ASCII ones)
+
+    high = np.concatenate(([0], np.cumsum(buf >= 0x80)))
+    rows = np.flatnonzero(high[ends] > high[starts])
+    lines = [ buf[starts[k]:ends[k]].tobytes().decode(raw_encoding) for k in rows ]
+    for k, line in zip(rows, lines):
+        chars[k] = np.frombuffer(line.encode('ascii', 'replace')[:chars.shape[1]].ljust(chars.shape[1]), dtype=np.uint8)
+    return rows, lines
+
+def parse_raw_file(path):
+
+    """
+    Parse a C3S raw station file. Returns (stations, years, values, station)
+    with stations a DataFrame of the header lines (STATION_COLUMNS, in file
+    order), and per data line its year, (n, 12) float64 monthly values
+    (-9999 = missing, as written) and the row of its station in stations.
+    """
+
+    with open(path, 'rb') as f:
+        buf = np.frombuffer(f.read(), dtype=np.uint8)
+    starts, ends = _line_offsets(buf)
+    keep = ends - starts >= 5
+    starts, ends = starts[keep], ends[keep]
+
+    char4 = buf[starts + 4]
+    is_data = (char4 == ord('-')) | (char4 == ord(' ')) | ((char4 >= 9) & (char4 <= 13))
+    station = np.cumsum(~is_data) - 1
+    if len(station) and station[is_data].min(initial=0) < 0:
+        raise ValueError(path + ': data line before the first station header')
+
+    # HEADERS: one row per station
+
+    header = _char_matrix(buf, starts[~is_data], ends[~is_data], max(HEADER_FIELDS['source'][1], int((ends - starts)[~is_data].max(initial=0))))
+    rows, lines = _non_ascii_lines(buf, header, starts[~is_data], ends[~is_data])
+    fields = { name: _field(header, start, end) for name, (start, end) in HEADER_FIELDS.items() }
+    fields['source'] = _field(header, HEADER_FIELDS['source'][0], header.shape[1])
+    text = {
+        'stationcode': _text(fields['ident']).str.rstrip().to_numpy(dtype=object),
+        'stationname': _text(fields['name']).str.strip().to_numpy(dtype=object),
+        'stationcountry': _text(fields['country']).str.strip().to_numpy(dtype=object),
+        'stationsource': _text(fields['source']).str.strip().to_numpy(dtype=object),
+        }
+    for k, line in zip(rows, lines):
+        text['stationcode'][k] = line[slice(*HEADER_FIELDS['ident'])].rstrip()
+        text['stationname'][k] = line[slice(*HEADER_FIELDS['name'])].strip()
+        text['stationcountry'][k] = line[slice(*HEADER_FIELDS['country'])].strip()
+        text['stationsource'][k] = line[HEADER_FIELDS['source'][0]:].strip()
+    firstyear = fields['firstyear'].astype(np.int64)
+    stations = pd.DataFrame({
+        'stationcode': text['stationcode'],
+        'stationlat': np.round(fields['lat'].astype(np.float64) / 10.0, 0).astype(np.int64),      # round 2 d.p. to 1 d.p.
+        'stationlon': np.round(fields['lon'].astype(np.float64) / 10.0, 0).astype(np.int64),      # round 2 d.p. to 1 d.p.
+        'stationelevation': fields['elevation'].astype(np.int64),
+        'stationname': text['stationname'],
+        'stationcountry': text['stationcountry'],
+        'stationfirstyear': firstyear,
+        'stationlastyear': fields['lastyear'].astype(np.int64),
+        'stationsource': text['stationsource'],
+        'stationfirstreliable': firstyear,
+        })
+
+    # DATA: (i4,12i5)
+
+    data = _char_matrix(buf, starts[is_data], ends[is_data], DATA_WIDTH)
+    years = _field(data, 0, 4).astype(np.int64)
+    values = np.ascontiguousarray(data[:, 4:]).view('S5').astype(np.float64)
+    return stations, years, values, station[is_data]
+
+def raw_long_frame(stations, years, values, station):
+
+    """
+    The long frame of the raw converter: year, '1'..'12' and the station
+    columns repeated on every year row.
+    """
+
+    df = pd.DataFrame(values, columns=MONTH_COLUMNS)
+    df.insert(0, 'year', years)
+    return pd.concat([df, stations.take(station).reset_index(drop=True)], axis=1)
+
+def read_raw_file(path):
+
+    return raw_long_frame(*parse_raw_file(path))
+
+def join_raw_files(file_tmin, file_tmax, outputs=('tmean',), missing=raw_missing):
+
+    """
+    Join a Tmin and a Tmax raw file on (stationcode, year) and return
+    {output: long frame} for outputs among JOIN_OUTPUTS:
+
+        tmean   (Tmin + Tmax)/2     rows with a Tmin and a Tmax record
+        dtr     Tmax - Tmin         rows with a Tmin and a Tmax record
+        tmin    Tmin                rows with a Tmin record
+        tmax    Tmax                rows with a Tmax record
+
+    Stations and years may be present in only one of the files. Missing
+    values (missing) become NaN, and a month is NaN unless every input it
+    needs is present. Rows are ordered by stationcode and year. The station
+    metadata of a station in both files comes from the file supplying the
+    output: Tmax for tmax, Tmin otherwise. A (stationcode, year) listed twice
+    in one file keeps its last record. Both files are parsed whole in memory
+    (see parse_raw_file()).
+    """
+
+    unknown = [ output for output in outputs if output not in JOIN_OUTPUTS ]
+    if unknown:
+        raise ValueError('unknown outputs: ' + ', '.join(unknown) + ' (use ' + ', '.join(JOIN_OUTPUTS) + ')')
+    stations_min, years_min, values_min, station_min = parse_raw_file(file_tmin)
+    stations_max, years_max, values_max, station_max = parse_raw_file(file_tmax)
+    n_min = len(years_min)
+
+    # one integer key per (stationcode, year) over both files
+
+    codes = np.concatenate([stations_min['stationcode'].to_numpy()[station_min], stations_max['stationcode'].to_numpy()[station_max]])
+    ids, uniques = pd.factorize(codes, sort=True)
+    years = np.concatenate([years_min, years_max])
+    first_year = years.min(initial=0)
+    span = years.max(initial=0) - first_year + 1
+    keys, row = np.unique(ids*span + (years - first_year), return_inverse=True)
+
+    # Tmin and Tmax aligned on the joined rows
+
+    tmin = np.full((len(keys), 12), np.nan)
+    tmax = np.full((len(keys), 12), np.nan)
+    tmin[row[:n_min]] = np.where(values_min == missing, np.nan, values_min)
+    tmax[row[n_min:]] = np.where(values_max == missing, np.nan, values_max)
+    has_min = np.zeros(len(keys), dtype=bool)
+    has_max = np.zeros(len(keys), dtype=bool)
+    has_min[row[:n_min]] = True
+    has_max[row[n_min:]] = True
+
+    # station header of every station id, from the preferred file where the
+    # station is in both (later assignments win)
+
+    stations = pd.concat([stations_min, stations_max], ignore_index=True)
+    header_min = np.empty(len(uniques), dtype=np.int64)
+    header_min[ids[n_min:]] = len(stations_min) + station_max
+    header_min[ids[:n_min]] = station_min
+    header_max = np.empty(len(uniques), dtype=np.int64)
+    header_max[ids[:n_min]] = station_min
+    header_max[ids[n_min:]] = len(stations_min) + station_max
+    key_header = {'tmin': header_min[keys // span], 'tmax': header_max[keys // span]}
+    key_years = keys % span + first_year
+
+    frames = {}
+    for output in outputs:
+        if output == 'tmean':
+            values, rows = (tmin + tmax)/2, has_min & has_max
+        elif output == 'dtr':
+            values, rows = tmax - tmin, has_min & has_max
+        elif output == 'tmin':
+            values, rows = tmin, has_min
+        else:
+            values, rows = tmax, has_max
+        header = key_header['tmax'] if output == 'tmax' else key_header['tmin']
+        frames[output] = raw_long_frame(stations, key_years[rows], values[rows], header[rows])
+    return frames
@@ -0,0 +1,179 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/clusters.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Consolidation of the merged LUT into one row per physical station.
+
+Link evidence between LUT rows comes from three sources:
+
+    code      rows sharing the same station_code (other than -999)
+    spatial   scored duplicate pairs from glosat_lut.duplicates
+    name      top-ranked code suggestions from glosat_lut.names
+
+Rows are clustered with a union-find (disjoint set) structure with path
+halving and union by size, so clustering is linear in the number of links.
+Each set carries the station_code of its coded members: a spatial or name
+link that would join two sets with different codes is not applied but
+returned as a conflict, so chains of links cannot merge distinct stations.
+Each cluster becomes a master LUT row carrying a cluster id, the metadata of a
+canonical member (coded, longest record, lowest source_lut), the union of the
+members' first/last years, and the list of source_lut:source_code1:source_code2
+members.
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut.schema import as_float
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+class UnionFind:
+
+    """
+    Disjoint sets over the integers 0 .. n-1, each with the station code of
+    its members ('-999' while none is coded).
+    """
+
+    def __init__(self, n, codes=None):
+
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.code = ['-999'] * n if codes is None else [ str(code) for code in codes ]
+
+    def find(self, i):
+
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a, b):
+
+        a = self.find(a)
+        b = self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        if self.code[a] == '-999':
+            self.code[a] = self.code[b]
+        return a
+
+    def labels(self):
+
+        """
+        Return a cluster label per element, numbered 0 .. k-1 in order of each
+        cluster's first element.
+        """
+
+        roots = [ self.find(i) for i in range(len(self.parent)) ]
+        return pd.factorize(np.array(roots, dtype=np.int64))[0]
+
+def code_links(lut):
+
+    # link every coded row to the first row carrying the same station_code
+
+    codes = lut['station_code'].astype(str).reset_index(drop=True)
+    coded = codes[codes != '-999']
+    group = pd.Series(coded.index, index=coded.index).groupby(coded.to_numpy(), sort=False).transform('first')
+    keep = group.to_numpy() != coded.index.to_numpy()
+    return group.to_numpy()[keep], coded.index.to_numpy()[keep]
+
+def duplicate_links(duplicates, min_score=0.6):
+
+    pairs = duplicates[duplicates['score'] >= min_score]
+    return pairs['row_a'].to_numpy(), pairs['row_b'].to_numpy()
+
+def name_links(suggestions, min_score=0.9):
+
+    pairs = suggestions[(suggestions['rank'] == 1) & (suggestions['score'] >= min_score)]
+    return pairs['row'].to_numpy(), pairs['match_row'].to_numpy()
+
+def station_links(lut, duplicates=None, suggestions=None, min_duplicate_score=0.6, min_name_score=0.9):
+
+    """
+    Return link evidence as a DataFrame (row_a, row_b, evidence) of positional
+    LUT rows.
+    """
+
+    links = [ ('code', code_links(lut)) ]
+    if duplicates is not None:
+        links.append( ('spatial', duplicate_links(duplicates, min_duplicate_score)) )
+    if suggestions is not None:
+        links.append( ('name', name_links(suggestions, min_name_score)) )
+    return pd.concat([ pd.DataFrame({'row_a': a, 'row_b': b, 'evidence': evidence}) for evidence, (a, b) in links ], ignore_index=True)
+
+def cluster_stations(n, links, codes=None):
+
+    """
+    Union the linked row pairs in order and return (cluster id for each of
+    the n rows, conflicts). With codes (the station_code of each row), a link
+    between two sets holding different codes is skipped; conflicts holds
+    those links with the two codes (code_a, code_b).
+    """
+
+    clusters = UnionFind(n, codes)
+    rejected, code_a, code_b = [], [], []
+    for k, (a, b) in enumerate(zip(links['row_a'].tolist(), links['row_b'].tolist())):
+        ca = clusters.code[clusters.find(a)]
+        cb = clusters.code[clusters.find(b)]
+        if ca != cb and ca != '-999' and cb != '-999':
+            rejected.append(k)
+            code_a.append(ca)
+            code_b.append(cb)
+            continue
+        clusters.union(a, b)
+    conflicts = links.iloc[rejected].reset_index(drop=True)
+    conflicts['code_a'] = code_a
+    conflicts['code_b'] = code_b
+    return clusters.labels(), conflicts
+
+def master_lut(lut, cluster_id):
+
+    """
+    Collapse LUT rows to one row per cluster: canonical metadata, union of
+    first/last years, member count and ';'-separated source_lut:source_code1:
+    source_code2 member list.
+    """
+
+    lut = lut.reset_index(drop=True)
+    firstyear = pd.Series(as_float(lut['station_firstyear']))
+    lastyear = pd.Series(as_float(lut['station_lastyear']))
+    firstyear = firstyear.where(firstyear != -9999)
+    lastyear = lastyear.where(lastyear != -9999)
+
+    # canonical member: coded first, then the longest record, then lowest source_lut
+
+    coded = (lut['station_code'].astype(str) != '-999').to_numpy()
+    nyr = (lastyear - firstyear + 1).fillna(-1).to_numpy()
+    order = np.lexsort((np.arange(len(lut)), lut['source_lut'].to_numpy(), -nyr, ~coded, cluster_id))
+    canonical = order[np.r_[True, np.diff(cluster_id[order]) != 0]]
+    master = lut.iloc[canonical].drop(columns=['source_code1','source_code2','source_lut','Nyr'], errors='ignore').reset_index(drop=True)
+    master.insert(0, 'cluster_id', cluster_id[canonical])
+
+    years = pd.DataFrame({'cluster_id': cluster_id, 'first': firstyear, 'last': lastyear}).groupby('cluster_id').agg(first=('first','min'), last=('last','max'))
+    master['station_firstyear'] = years['first'].fillna(-9999).astype(int).to_numpy()
+    master['station_lastyear'] = years['last'].fillna(-9999).astype(int).to_numpy()
+    master['Nyr'] = np.where(master['station_firstyear'] == -9999, -9999, master['station_lastyear'] - master['station_firstyear'] + 1)
+
+    members = 'lut' + lut['source_lut'].astype(str) + ':' + lut['source_code1'].astype(str) + ':' + lut['source_code2'].astype(str)
+    members = members.groupby(cluster_id).agg(['size', ';'.join])
+    master['n_members'] = members['size'].to_numpy()
+    master['members'] = members['join'].to_numpy()
+    return master
@@ -0,0 +1,754 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/countries.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Country name normalization to ISO 3166-1 alpha-2 codes and continents.
+
+resolve_countries() dedupes the input country strings and resolves each
+distinct string through tiers of increasing cost:
+
+    1. exact hash lookup of the title-cased name in COUNTRY_TO_ALPHA2
+    2. case-folded lookup of the same table
+    3. COUNTRY_ALIASES (historical and variant spellings)
+    4. difflib fuzzy match (cutoff=0.5), memoized in a JSON cache file
+
+so that difflib only ever runs on strings not seen in a previous run.
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+import re
+import difflib
+
+# I/O libraries:
+import os, json, hashlib
+
+#-----------------------------------------------------------------------------
+# LOOK-UP TABLES: ISO 3166 alpha-2 codes (from country names)
+#-----------------------------------------------------------------------------
+
+COUNTRY_TO_ALPHA2 = {
+    'Abkhazia': 'AB',
+    'Afghanistan': 'AF',
+    'Åland Islands': 'AX',
+    'Albania': 'AL',
+    'Algeria': 'DZ',
+    'American Samoa': 'AS',
+    'Andorra': 'AD',
+    'Angola': 'AO',
+    'Anguilla': 'AI',
+    'Antigua and Barbuda': 'AG',
+    'Argentina': 'AR',
+    'Armenia': 'AM',
+    'Aruba': 'AW',
+    'Australia': 'AU',
+    'Austria': 'AT',
+    'Azerbaijan': 'AZ',
+    'Bahamas': 'BS',
+    'Bahrain': 'BH',
+    'Bangladesh': 'BD',
+    'Barbados': 'BB',
+    'Belarus': 'BY',
+    'Belgium': 'BE',
+    'Belize': 'BZ',
+    'Benin': 'BJ',
+    'Bermuda': 'BM',
+    'Bhutan': 'BT',
+    'Bolivia': 'BO',
+    'Bonaire': 'BQ',
+    'Bosnia and Herzegovina': 'BA',
+    'Botswana': 'BW',
+    'Bouvet Island': 'BV',
+    'Brazil': 'BR',
+    'British Indian Ocean Territory': 'IO',
+    'British Virgin Islands': 'VG',
+    'Virgin Islands, British': 'VG',
+    'Brunei': 'BN',
+    'Brunei Darussalam': 'BN',
+    'Bulgaria': 'BG',
+    'Burkina Faso': 'BF',
+    'Burundi': 'BI',
+    'Cambodia': 'KH',
+    'Cameroon': 'CM',
+    'Canada': 'CA',
+    'Cape Verde': 'CV',
+    'Cayman Islands': 'KY',
+    'Central African Republic': 'CF',
+    'Chad': 'TD',
+    'Chile': 'CL',
+    'China': 'CN',
+    'Christmas Island': 'CX',
+    'Cocos (Keeling) Islands': 'CC',
+    'Colombia': 'CO',
+    'Comoros': 'KM',
+    'Congo': 'CG',
+    'Congo, Republic of': 'CG',
+    'Republic of the Congo': 'CG',
+    'Cook Islands': 'CK',
+    'Costa Rica': 'CR',    
+    "Cote-D'Ivoir": 'CI',
+    'Croatia': 'HR',
+    'Cuba': 'CU',
+    'Curaçao': 'CW',
+    'Cyprus': 'CY',
+    'Czech Republic': 'CZ',
+    'Congo, Democratic Republic of': 'CD',
+    'Democratic Kampuchea': 'KH',    
+    'Dem.P.Rep.Kor': 'KP',    
+    'Democratic Republic of the Congo': 'CD',
+    'Denmark': 'DK',
+    'Djibouti': 'DJ',
+    'Dominica': 'DM',
+    'Dominican Republic': 'DO',
+    'East Timor': 'TP',
+    'Ecuador': 'EC',
+    'Egypt': 'EG',
+    'El Salvador': 'SV',
+    'England': 'GB',
+    'Equatorial Guinea': 'GQ',
+    'Eritrea': 'ER',
+    'Estonia': 'EE',
+    'Ethiopia': 'ET',
+    'Falkland Islands': 'FK',
+    'Faroe Islands': 'FO',
+    'Fiji': 'FJ',
+    'Finland': 'FI',
+    'France': 'FR',
+    'French Guiana': 'GF',
+    'French Polynesia': 'PF',
+    'Gabon': 'GA',
+    'Gambia': 'GM',
+    'Georgia': 'GE',
+    'Germany': 'DE',
+    'Ghana': 'GH',
+    'Gibraltar': 'GI',
+    'Greece': 'GR',
+    'Greenland': 'GL',
+    'Grenada': 'GD',
+    'Guadeloupe': 'GP',
+    'Great Britain': 'GB',
+    'Guam': 'GU',
+    'Guatemala': 'GT',
+    'Guernsey': 'GG',
+    'Guinea': 'GN',
+    'Guinea-Bissau': 'GW',
+    'Guyana': 'GY',
+    'Haiti': 'HT',
+    'Heard Island and McDonald Islands': 'HM',
+    'Honduras': 'HN',
+    'Hong Kong': 'HK',
+    'Hungary': 'HU',
+    'Iceland': 'IS',
+    'India': 'IN',
+    'Indonesia': 'ID',
+    'Iran': 'IR',
+    'Iraq': 'IQ',
+    'Ireland': 'IE',
+    'Isle of Man': 'IM',
+    'Islamic Republic of Iran': 'IR',
+    'Israel': 'IL',
+    'Italy': 'IT',
+    'Ivory Coast': 'CI',
+    'Jamaica': 'JM',
+    'Japan': 'JP',
+    'Jersey': 'JE',
+    'Jordan': 'JO',
+    'Kampuchea': 'KH',    
+    'Kazakhstan': 'KZ',
+    'Kenya': 'KE',
+    "Korea, Democratic People's Republic of": 'KP',
+    'Kiribati': 'KI',
+    'Korea, Republic Of': 'KR',
+    'Korea, North': 'KP',
+    'Kosovo': 'XK',
+    'Kuwait': 'KW',
+    'Kyrgyzstan': 'KG',
+    'Laos': 'LA',
+    "Lao People's Democratic Republic": 'LA',
+    "Lao P.D.R.": 'LA',        
+    'Latvia': 'LV',
+    'Lebanon': 'LB',
+    'Lesotho': 'LS',
+    'Liberia': 'LR',
+    'Libya': 'LY',
+    'Liechtenstein': 'LI',
+    'Lithuania': 'LT',
+    'Luxembourg': 'LU',
+    'Macau': 'MO',
+    'Macedonia': 'MK',
+    'Macedonia, The Former Yugoslav Republic Of': 'MK',
+    'Madagascar': 'MG',
+    'Malawi': 'MW',
+    'Malaysia': 'MY',
+    'Maldives': 'MV',
+    'Mali': 'ML',
+    'Malta': 'MT',
+    'Marshall Islands': 'MH',
+    'Martinique': 'MQ',
+    'Mauritania': 'MR',
+    'Mauritius': 'MU',
+    'Mayotte': 'YT',
+    'Mexico': 'MX',
+    'Micronesia': 'FM',
+    'Micronesia, Federated States of': 'FM',
+    'Moldova': 'MD',
+    'Moldova, Republic Of': 'MD',
+    'Monaco': 'MC',
+    'Mongolia': 'MN',
+    'Montenegro': 'ME',
+    'Montserrat': 'MS',
+    'Morocco': 'MA',
+    'Mozambique': 'MZ',
+    'Myanmar': 'MM',
+    'Namibia': 'NA',
+    'Nauru': 'NR',
+    'Nepal': 'NP',
+    'Netherlands': 'NL',
+    'Neth. Antille': 'NL',    
+    'New Caledonia': 'NC',
+    'New Zealand': 'NZ',
+    'Nicaragua': 'NI',
+    'Niger': 'NE',
+    'Nigeria': 'NG',
+    'Niue': 'NU',
+    'Norfolk Island': 'NF',
+    'North Korea': 'KP',
+    'Northern Cyprus': 'CY',
+    'Northern Mariana Islands': 'MP',
+    'Norway': 'NO',
+    'Ocean Is(BR).': 'BR',    
+    'Ocean Is(FR).': 'FR',    
+    'Oman': 'OM',      
+#    'Pacific Oc.': 'XX',       
+    'Pacific Oc.': 'XX',       
+    'Pacific (US)': 'US',    
+    'Pacific (Us)': 'US',    
+    'Pakistan': 'PK',
+    'Palau': 'PW',
+    'Palestine': 'PS',
+    'Panama': 'PA',
+    'Papua New Guinea': 'PG',
+    'Paraguay': 'PY',
+    'Peru': 'PE',
+    'Philippines': 'PH',
+    'Poland': 'PL',
+    'Portugal': 'PT',
+    'Puerto Rico': 'PR',
+    'Qatar': 'QA',
+    'Romania': 'RO',
+    'Russia': 'RU',
+    'Russian Federation': 'RU',
+    'Rwanda': 'RW',
+    'Réunion': 'RE',
+    'Saba': 'BQ',
+    'Saint Barthélemy': 'BL',
+    'Saint Helena, Ascension and Tristan da Cunha': 'SH',    
+    'St.Helena(BR)': 'SH',
+    'St.Helena (BR': 'SH',    
+    'Saint Kitts and Nevis': 'KN',
+    'St. Kitts and Nevis': 'KN',
+    'Saint Lucia': 'LC',
+    'St. Lucia': 'LC',
+    'Saint Martin': 'MF',
+    'St. Martin': 'MF',
+    'Saint Pierre and Miquelon': 'PM',
+    'St. Pierre and Miquelon': 'PM',
+    'Saint Vincent and the Grenadines': 'VC',
+    'St. Vincent and The Grenadines': 'VC',
+    'Samoa': 'WS',
+    'San Marino': 'SM',
+    'Saudi Arabia': 'SA',
+    'Scotland': 'GB',
+    'Senegal': 'SN',
+    'Serbia': 'RS',
+    'Seychelles': 'SC',
+    'Sierra Leone': 'SL',
+    'Singapore': 'SG',
+    'Sint Eustatius': 'BQ',
+    'Slovakia': 'SK',
+    'Slovenia': 'SI',
+    'Solomon Islands': 'SB',
+    'Somalia': 'SO',
+    'Somaliland': 'SO',
+    'South Africa': 'ZA',
+    'South Georgia and the South Sandwich Islands': 'GS',
+    'South Korea': 'KR',
+    'South Ossetia': 'OS',
+    'South Sudan': 'SS',
+    'Spain': 'ES',
+    'Sri Lanka': 'LK',
+    'Sudan': 'SD',
+    'Suriname': 'SR',
+    'Svalbard': 'SJ',
+    'Swaziland': 'SZ',
+    'Sweden': 'SE',
+    'Switzerland': 'CH',
+    'Syria': 'SY',
+    'Syrian Arab Republic': 'SY',
+    'São Tomé and Príncipe': 'ST',
+    'Sao Tome-And': 'ST',    
+    'Taiwan': 'TW',
+    'Taiwan, Province of China': 'TW',
+    'Tajikistan': 'TJ',
+    'Tanzania': 'TZ',
+    'Tanzania, United Republic Of': 'TZ',
+    'Thailand': 'TH',
+    'Togo': 'TG',
+    'Tokelau': 'TK',
+    'Tonga': 'TO',
+    'Trinidad and Tobago': 'TT',
+    'Tunisia': 'TN',
+    'Turkey': 'TR',
+    'Turkmenistan': 'TM',
+    'Turks and Caicos Islands': 'TC',
+    'Turks and Caicos': 'TC',
+    'Tuvalu': 'TV',
+    'Uganda': 'UG',
+    'Ukraine': 'UA',
+    'Uk': 'GB', # Added to handle abbreviated country name
+    'UK': 'GB', # Added to handle abbreviated country name
+    'United Kingdom': 'GB',
+    'United Arab Emirates': 'AE',
+    'U.A.E.': 'AE',    # Added to handle abbreviated country name
+    'United States Virgin Islands': 'VI',    
+    'United States': 'US',
+    'United States of America': 'US',
+    'Uruguay': 'UY',
+    'Us': 'US', # Added to handle abbreviated country name
+    'US': 'US', # Added to handle abbreviated country name
+    'Usa': 'US', # Added to handle abbreviated country name
+    'USA': 'US', # Added to handle abbreviated country name
+    'Ussr': 'RU', # Added to handle abbreviated country name
+    'USSR': 'RU', # Added to handle abbreviated country name
+    'Uzbekistan': 'UZ',
+    'Vanuatu': 'VU',
+    'Venezuela': 'VE',
+    'Vietnam': 'VN',
+    'Wales': 'GB',
+    'Wallis and Futuna': 'WF',
+    'Yemen': 'YE',
+    'Zambia': 'ZM',
+    'Zimbabwe': 'ZW',
+}
+
+#-----------------------------------------------------------------------------
+# LOOK-UP TABLES: continent (from alpha-2 codes)
+#-----------------------------------------------------------------------------
+
+ALPHA2_TO_CONTINENT = {
+    'AB': 'Asia',
+    'AD': 'Europe',
+    'AE': 'Asia',
+    'AF': 'Asia',
+    'AG': 'North America',
+    'AI': 'North America',
+    'AL': 'Europe',
+    'AM': 'Asia',
+    'AO': 'Africa',
+    'AQ': 'Antarctica',
+    'AR': 'South America',
+    'AS': 'Oceania',
+    'AT': 'Europe',
+    'AU': 'Oceania',
+    'AW': 'North America',
+    'AX': 'Europe',
+    'AZ': 'Asia',
+    'BA': 'Europe',
+    'BB': 'North America',
+    'BD': 'Asia',
+    'BE': 'Europe',
+    'BF': 'Africa',
+    'BG': 'Europe',
+    'BH': 'Asia',
+    'BI': 'Africa',
+    'BJ': 'Africa',
+    'BL': 'North America',
+    'BM': 'North America',
+    'BN': 'Asia',
+    'BO': 'South America',
+    'BQ': 'North America',
+    'BR': 'South America',
+    'BS': 'North America',
+    'BT': 'Asia',
+    'BV': 'Antarctica',
+    'BW': 'Africa',
+    'BY': 'Europe',
+    'BZ': 'North America',
+    'CA': 'North America',
+    'CC': 'Asia',
+    'CD': 'Africa',
+    'CF': 'Africa',
+    'CG': 'Africa',
+    'CH': 'Europe',
+    'CI': 'Africa',
+    'CK': 'Oceania',
+    'CL': 'South America',
+    'CM': 'Africa',
+    'CN': 'Asia',
+    'CO': 'South America',
+    'CR': 'North America',
+    'CU': 'North America',
+    'CV': 'Africa',
+    'CW': 'North America',
+    'CX': 'Asia',
+    'CY': 'Asia',
+    'CZ': 'Europe',
+    'DE': 'Europe',
+    'DJ': 'Africa',
+    'DK': 'Europe',
+    'DM': 'North America',
+    'DO': 'North America',
+    'DZ': 'Africa',
+    'EC': 'South America',
+    'EE': 'Europe',
+    'EG': 'Africa',
+    'ER': 'Africa',
+    'ES': 'Europe',
+    'ET': 'Africa',
+    'FI': 'Europe',
+    'FJ': 'Oceania',
+    'FK': 'South America',
+    'FM': 'Oceania',
+    'FO': 'Europe',
+    'FR': 'Europe',
+    'GA': 'Africa',
+    'GB': 'Europe',
+    'GD': 'North America',
+    'GE': 'Asia',
+    'GF': 'South America',
+    'GG': 'Europe',
+    'GH': 'Africa',
+    'GI': 'Europe',
+    'GL': 'North America',
+    'GM': 'Africa',
+    'GN': 'Africa',
+    'GP': 'North America',
+    'GQ': 'Africa',
+    'GR': 'Europe',
+    'GS': 'South America',
+    'GT': 'North America',
+    'GU': 'Oceania',
+    'GW': 'Africa',
+    'GY': 'South America',
+    'HK': 'Asia',
+    'HM': 'Antarctica',
+    'HN': 'North America',
+    'HR': 'Europe',
+    'HT': 'North America',
+    'HU': 'Europe',
+    'ID': 'Asia',
+    'IE': 'Europe',
+    'IL': 'Asia',
+    'IM': 'Europe',
+    'IN': 'Asia',
+    'IO': 'Asia',
+    'IQ': 'Asia',
+    'IR': 'Asia',
+    'IS': 'Europe',
+    'IT': 'Europe',
+    'JE': 'Europe',
+    'JM': 'North America',
+    'JO': 'Asia',
+    'JP': 'Asia',
+    'KE': 'Africa',
+    'KG': 'Asia',
+    'KH': 'Asia',
+    'KI': 'Oceania',
+    'KM': 'Africa',
+    'KN': 'North America',
+    'KP': 'Asia',
+    'KR': 'Asia',
+    'KW': 'Asia',
+    'KY': 'North America',
+    'KZ': 'Asia',
+    'LA': 'Asia',
+    'LB': 'Asia',
+    'LC': 'North America',
+    'LI': 'Europe',
+    'LK': 'Asia',
+    'LR': 'Africa',
+    'LS': 'Africa',
+    'LT': 'Europe',
+    'LU': 'Europe',
+    'LV': 'Europe',
+    'LY': 'Africa',
+    'MA': 'Africa',
+    'MC': 'Europe',
+    'MD': 'Europe',
+    'ME': 'Europe',
+    'MF': 'North America',
+    'MG': 'Africa',
+    'MH': 'Oceania',
+    'MK': 'Europe',
+    'ML': 'Africa',
+    'MM': 'Asia',
+    'MN': 'Asia',
+    'MO': 'Asia',
+    'MP': 'Oceania',
+    'MQ': 'North America',
+    'MR': 'Africa',
+    'MS': 'North America',
+    'MT': 'Europe',
+    'MU': 'Africa',
+    'MV': 'Asia',
+    'MW': 'Africa',
+    'MX': 'North America',
+    'MY': 'Asia',
+    'MZ': 'Africa',
+    'NA': 'Africa',
+    'NC': 'Oceania',
+    'NE': 'Africa',
+    'NF': 'Oceania',
+    'NG': 'Africa',
+    'NI': 'North America',
+    'NL': 'Europe',
+    'NO': 'Europe',
+    'NP': 'Asia',
+    'NR': 'Oceania',
+    'NU': 'Oceania',
+    'NZ': 'Oceania',
+    'OM': 'Asia',
+    'OS': 'Asia',
+    'PA': 'North America',
+    'PE': 'South America',
+    'PF': 'Oceania',
+    'PG': 'Oceania',
+    'PH': 'Asia',
+    'PK': 'Asia',
+    'PL': 'Europe',
+    'PM': 'North America',
+    'PR': 'North America',
+    'PS': 'Asia',
+    'PT': 'Europe',
+    'PW': 'Oceania',
+    'PY': 'South America',
+    'QA': 'Asia',
+    'RE': 'Africa',
+    'RO': 'Europe',
+    'RS': 'Europe',
+    'RU': 'Europe',
+    'RW': 'Africa',
+    'SA': 'Asia',
+    'SB': 'Oceania',
+    'SC': 'Africa',
+    'SD': 'Africa',
+    'SE': 'Europe',
+    'SG': 'Asia',
+    'SH': 'Africa',
+    'SI': 'Europe',
+    'SJ': 'Europe',
+    'SK': 'Europe',
+    'SL': 'Africa',
+    'SM': 'Europe',
+    'SN': 'Africa',
+    'SO': 'Africa',
+    'SR': 'South America',
+    'SS': 'Africa',
+    'ST': 'Africa',
+    'SV': 'North America',
+    'SY': 'Asia',
+    'SZ': 'Africa',
+    'TC': 'North America',
+    'TD': 'Africa',
+    'TG': 'Africa',
+    'TH': 'Asia',
+    'TJ': 'Asia',
+    'TK': 'Oceania',
+    'TM': 'Asia',
+    'TN': 'Africa',
+    'TO': 'Oceania',
+    'TP': 'Asia',
+    'TR': 'Asia',
+    'TT': 'North America',
+    'TV': 'Oceania',
+    'TW': 'Asia',
+    'TZ': 'Africa',
+    'UA': 'Europe',
+    'UG': 'Africa',
+    'US': 'North America',
+    'UY': 'South America',
+    'UZ': 'Asia',
+    'VC': 'North America',
+    'VE': 'South America',
+    'VG': 'North America',
+    'VI': 'North America',
+    'VN': 'Asia',
+    'VU': 'Oceania',
+    'WF': 'Oceania',
+    'WS': 'Oceania',
+    'XK': 'Europe',
+    'XX': 'Oceania',
+    'YE': 'Asia',
+    'YT': 'Africa',
+    'ZA': 'Africa',
+    'ZM': 'Africa',
+    'ZW': 'Africa',
+}
+
+#-----------------------------------------------------------------------------
+# LOOK-UP TABLES: aliases (variant and historical names --> COUNTRY_TO_ALPHA2 key)
+#-----------------------------------------------------------------------------
+
+COUNTRY_ALIASES = {
+    'Abyssinia': 'Ethiopia',
+    'Basutoland': 'Lesotho',
+    'Bechuanaland': 'Botswana',
+    'Belgian Congo': 'Democratic Republic of the Congo',
+    'Burma': 'Myanmar',
+    'Cabo Verde': 'Cape Verde',
+    'Ceylon': 'Sri Lanka',
+    'Congo (Brazzaville)': 'Congo',
+    'Congo (Kinshasa)': 'Democratic Republic of the Congo',
+    'Congo, Dem. Rep.': 'Democratic Republic of the Congo',
+    'Cote D Ivoire': 'Ivory Coast',
+    "Cote d'Ivoire": 'Ivory Coast',
+    "Côte d'Ivoire": 'Ivory Coast',
+    'Curacao': 'Curaçao',
+    'Czechia': 'Czech Republic',
+    'Dahomey': 'Benin',
+    'Dem. Rep. Congo': 'Democratic Republic of the Congo',
+    'DR Congo': 'Democratic Republic of the Congo',
+    'Eswatini': 'Swaziland',
+    'French Sudan': 'Mali',
+    'Gold Coast': 'Ghana',
+    'North Macedonia': 'Macedonia',
+    'Northern Rhodesia': 'Zambia',
+    'Nyasaland': 'Malawi',
+    'Persia': 'Iran',
+    'Reunion': 'Réunion',
+    'Rhodesia': 'Zimbabwe',
+    'Sao Tome and Principe': 'São Tomé and Príncipe',
+    'Siam': 'Thailand',
+    'South West Africa': 'Namibia',
+    'Southern Rhodesia': 'Zimbabwe',
+    'Tanganyika': 'Tanzania',
+    'Turkiye': 'Turkey',
+    'Upper Volta': 'Burkina Faso',
+    'Viet Nam': 'Vietnam',
+    'Zaire': 'Democratic Republic of the Congo',
+    'Zanzibar': 'Tanzania',
+}
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def strip_character(dataCol):
+    #ascii_alphabet = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~'
+#    r = re.compile(r'[^a-zA-Z !@#$%&*_+-=|\:";<>,./()[\]{}\']')
+    r = re.compile(r'[^a-zA-Z !@#$%&*_+-=|\:";<>,./()]')
+    return r.sub('', dataCol)
+
+def _fold(name):
+
+    # case-folded, character-stripped and whitespace-collapsed lookup key
+
+    return ' '.join(strip_character(name).casefold().split())
+
+COUNTRY_LIST = list(COUNTRY_TO_ALPHA2)
+FOLDED_TO_COUNTRY = {}
+for country in COUNTRY_LIST:
+    FOLDED_TO_COUNTRY.setdefault(_fold(country), country)
+ALIAS_TO_COUNTRY = { _fold(alias): country for alias, country in COUNTRY_ALIASES.items() }
+
+def _tables_signature():
+
+    # cached fuzzy matches are only valid for the look-up tables they were made with
+
+    tables = json.dumps([COUNTRY_LIST, sorted(COUNTRY_ALIASES.items())], ensure_ascii=False)
+    return hashlib.sha1(tables.encode('utf-8')).hexdigest()
+
+def load_country_cache(cache_file):
+
+    if cache_file is None or not os.path.exists(cache_file):
+        return {}
+    with open(cache_file, encoding='utf-8') as f:
+        cache = json.load(f)
+    if cache.get('signature') != _tables_signature():
+        return {}
+    return cache.get('matches', {})
+
+def save_country_cache(cache_file, matches):
+
+    if cache_file is None:
+        return
+    os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump({'signature': _tables_signature(), 'matches': matches}, f, ensure_ascii=False, indent=0, sort_keys=True)
+
+def _resolve_exact(name):
+
+    # tiers 1-3: exact, case-folded and alias look-ups (None if none match)
+
+    query = name.title()
+    if query in COUNTRY_TO_ALPHA2:
+        return query
+    folded = _fold(name)
+    if folded in FOLDED_TO_COUNTRY:
+        return FOLDED_TO_COUNTRY[folded]
+    if folded in ALIAS_TO_COUNTRY:
+        return ALIAS_TO_COUNTRY[folded]
+    return None
+
+def resolve_country(name, cache=None):
+
+    """
+    Resolve one (already stripped) country string to a COUNTRY_TO_ALPHA2 key,
+    or '-999' if no tier matches.
+    """
+
+    match = _resolve_exact(name)
+    if match is not None:
+        return match
+    query = name.title()
+    if cache is not None and query in cache:
+        return cache[query]
+    m = difflib.get_close_matches( query, COUNTRY_LIST, n=1, cutoff=0.5)
+    match = '-999' if len(m) == 0 else m[0]
+    if cache is not None:
+        cache[query] = match
+    return match
+
+def resolve_countries(countries, cache_file=None):
+
+    """
+    Resolve an array of free-text country names to COUNTRY_TO_ALPHA2 keys
+    ('-999' where unresolved). Each distinct string is resolved once and fuzzy
+    matches are persisted to cache_file (JSON) between runs.
+    """
+
+    codes, uniques = pd.factorize(pd.Series(countries, dtype=object).astype(str).str.rstrip('-'))
+    cache = load_country_cache(cache_file)
+    ncached = len(cache)
+    resolved = np.array([ resolve_country(strip_character(c), cache) for c in uniques ] + ['-999'], dtype=object)
+    if len(cache) != ncached:
+        save_country_cache(cache_file, cache)
+    return resolved[codes]
+
+def countries_resolved_exactly(countries):
+
+    """
+    True where a free-text country name resolves without the difflib tier (the
+    fuzzy matches are treated as ambiguous by glosat_lut.geolocate).
+    """
+
+    codes, uniques = pd.factorize(pd.Series(countries, dtype=object).astype(str).str.rstrip('-'))
+    exact = np.array([ _resolve_exact(strip_character(c)) is not None for c in uniques ] + [False], dtype=bool)
+    return exact[codes]
+
+def countries_to_alpha2(countries):
+
+    return pd.Series(countries, dtype=object).map(COUNTRY_TO_ALPHA2).fillna('-999').values
+
+def alpha2_to_continent(alpha2):
+
+    return pd.Series(alpha2, dtype=object).map(ALPHA2_TO_CONTINENT).fillna('-999').values
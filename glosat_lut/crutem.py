@@ -0,0 +1,159 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/crutem.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+CRUTEM station file writer:
+
+    010010 709   87   10 Jan Mayen            NORWAY        19212019  561921   99950
+    1921 -999 -999 -999  -13   -7   33   49   50   28  -10  -34  -58
+
+header  (i6,i4,i5,i5,x,a20,x,a13,x,i4,i4,2x,i2,i4,a8)
+rows    year, then 12 monthly values as int(x*scale) right-justified in 5
+        characters (i4,12i5); missing (NaN) = -999
+
+crutem_rows() renders all year rows of a frame at once: the monthly values
+are truncated to integers in NumPy and mapped through a table of their
+5-character texts, so a row is a fixed-width 'S65' record and the rows of a
+station are one contiguous byte slice. write_station_files() sorts a long
+frame once by stationcode, finds the station boundaries and writes each
+station file (header + rows) with a single write() call, instead of a
+dh[dh['stationcode']==code] scan and iloc formatting per station. With
+workers > 1 the station files are written by a thread pool.
+"""
+
+# Dataframe libraries:
+import numpy as np
+
+# I/O libraries:
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+crutem_missing = -999
+
+MONTH_COLUMNS = [ str(month) for month in range(1, 13) ]
+HEADER_COLUMNS = ['stationlat', 'stationlon', 'stationelevation', 'stationname', 'stationcountry', 'stationfirstyear', 'stationlastyear', 'stationsource', 'stationfirstreliable']
+
+# monthly integers with a fixed 5-character text (wider values fall back to
+# per-row formatting, as f"{monthstr:>5}" does not truncate them)
+
+table_min, table_max = -9999, 99999
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def crutem_header(code, lat, lon, elevation, name, country, first, last, firstreliable, source='XX', crucode='XXXXX', scale=10):
+
+    """
+    CRUTEM station header line (without newline). lat and lon are multiplied
+    by scale and truncated (10 for degrees, 1 when already in tenths).
+    """
+
+    return ("{:>6}".format(str(code)[-6:]) + "{:>4}".format(str(int(lat*scale))) + "{:>5}".format(str(int(lon*scale))) +
+        "{:>5}".format(str(elevation)) + ' ' + "{:<20}".format(str(name)[:20]) + ' ' + "{:<13}".format(str(country)[:13]) + ' ' +
+        "{:>4}".format(str(int(first))) + "{:>4}".format(str(int(last))) + '  ' + "{:>2}".format(source) +
+        "{:>4}".format(str(firstreliable)) + "{:>8}".format(crucode))
+
+def _month_table():
+
+    return np.array([ "{:>5}".format(value) for value in range(table_min, table_max + 1) ], dtype='S5')
+
+_table = None
+
+def crutem_rows(years, values, scale=10):
+
+    """
+    CRUTEM year rows of (n,) years and (n, 12) monthly values as an array of
+    n byte strings, each ending in a newline.
+    """
+
+    global _table
+
+    years = np.asarray(years).astype(np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(values)
+    months = np.where(missing, crutem_missing, np.trunc(np.where(missing, 0.0, values)*scale)).astype(np.int64)
+
+    if len(years) and (years.min() >= 1000) & (years.max() <= 9999) & (months.min() >= table_min) & (months.max() <= table_max):
+        if _table is None:
+            _table = _month_table()
+        rows = np.empty((len(years), 4 + 12*5 + 1), dtype=np.uint8)
+        rows[:, :4] = years.astype('S4')[:, None].view(np.uint8)
+        rows[:, 4:-1] = np.ascontiguousarray(_table[months - table_min]).view(np.uint8).reshape(len(years), 12*5)
+        rows[:, -1] = ord('\n')
+        return rows.view('S' + str(rows.shape[1])).ravel()
+
+    # general case: years outside 1000-9999 or wide monthly values
+
+    return np.array([ (str(year) + ''.join([ "{:>5}".format(month) for month in row ]) + '\n').encode() for year, row in zip(years.tolist(), months.tolist()) ], dtype=object)
+
+def _join_rows(rows):
+
+    # fixed-width records are one contiguous buffer
+
+    return rows.tobytes() if rows.dtype.kind == 'S' else b''.join(rows)
+
+def write_station_file(path, header, years, values, scale=10):
+
+    with open(path, 'wb') as f:
+        f.write(header.encode() + b'\n' + _join_rows(crutem_rows(years, values, scale)))
+
+def station_groups(df):
+
+    """
+    Sort a long frame once by stationcode (rows of a station keep their
+    order) and return (sorted frame, stationcodes, starts, ends).
+    """
+
+    df = df.sort_values('stationcode', kind='stable').reset_index(drop=True)
+    codes = df['stationcode'].to_numpy()
+    starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1]))) if len(codes) else np.zeros(0, dtype=np.int64)
+    ends = np.append(starts[1:], len(codes))
+    return df, codes[starts], starts, ends
+
+def write_station_files(df, output_dir, scale=10, code=None, filename=None, header=None, workers=1):
+
+    """
+    Write one CRUTEM file per station of a long frame (year, '1'..'12',
+    stationcode and HEADER_COLUMNS) to output_dir/<stationcode>.txt and return
+    the number of files. The header comes from the station's first row;
+    code replaces the stationcode written in it (e.g. 'XXXXXX'), filename
+    maps a stationcode to a file name and header maps the station's first
+    row (a dict) to its header line. workers > 1 writes contiguous blocks of
+    stations from a thread pool (the rows are rendered once beforehand).
+    """
+
+    df, stationcodes, starts, ends = station_groups(df)
+    rows = crutem_rows(df['year'].to_numpy(), df[MONTH_COLUMNS].to_numpy(dtype=np.float64), scale)
+    metadata = df.iloc[starts][['stationcode'] + HEADER_COLUMNS].to_dict('records')
+
+    def write(block):
+        for k in block:
+            station = metadata[k]
+            if header is not None:
+                station_header = header(station)
+            else:
+                station_header = crutem_header(stationcodes[k] if code is None else code, *[ station[column] for column in HEADER_COLUMNS[:7] ], firstreliable=station['stationfirstreliable'], scale=scale)
+            path = os.path.join(output_dir, filename(stationcodes[k]) if filename is not None else str(stationcodes[k]) + '.txt')
+            with open(path, 'wb') as f:
+                f.write(station_header.encode() + b'\n' + _join_rows(rows[starts[k]:ends[k]]))
+
+    blocks = np.array_split(np.arange(len(stationcodes)), max(min(workers, len(stationcodes)), 1))
+    if len(blocks) == 1:
+        write(blocks[0])
+    else:
+        with ThreadPoolExecutor(max_workers=len(blocks)) as pool:
+            list(pool.map(write, blocks))
+    return len(stationcodes)
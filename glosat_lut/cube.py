@@ -0,0 +1,278 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/cube.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Dense station x year x month store for the long GloSAT archives (df_temp,
+df_anom: one row per station-year with twelve month columns and the station
+metadata repeated on every row).
+
+build_cube() turns a long frame into
+
+    values      (n_stations, n_years, 12) float32 cube (NaN = missing), or
+                int16 in units of 10**-decimals with -32768 = missing
+    present     (n_stations, n_years) bool: the station-year row exists
+    stations    one metadata row per station, in cube order
+    index       stationcode --> station position
+
+so a station slice is one dict lookup and one array view, and whole-archive
+reductions (counts, means, ...) are NumPy reductions over axes. The decimal
+precision of the monthly values is detected on build and used to restore the
+exact float64 values of the long table (e.g. so that int(x*10) in the CRUTEM
+writers gives the same tenths as from the pickle).
+
+save_cube() writes a directory (values.npy and present.npy, memory-mapped by
+load_cube(), stations.parquet and cube.json). cube.json records the size,
+mtime and SHA-256 hash of the pickle the cube was built from, and
+cube_is_current() warns when the pickle has changed since:
+
+    $ python -m glosat_lut.cube build DATA/df_temp.pkl DATA/df_temp_cube/ [--int16]
+    $ python -m glosat_lut.cube info DATA/df_temp_cube/
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut.archive import read_archive, source_record, sibling_is_current, MONTH_COLUMNS
+
+# I/O libraries:
+import os, json, argparse
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+max_decimals = 4                            # float32 holds ~7 significant digits
+int16_missing = -32768
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def value_decimals(values, max_decimals=max_decimals):
+
+    """
+    Smallest number of decimal places that represents every finite value
+    exactly (None if more than max_decimals are needed).
+    """
+
+    values = values[np.isfinite(values)]
+    for decimals in range(max_decimals + 1):
+        if np.array_equal(np.round(values, decimals), values):
+            return decimals
+    return None
+
+class StationCube:
+
+    """
+    Dense station x year x month array with its station metadata.
+    """
+
+    def __init__(self, values, present, stations, first_year, decimals=None, scale=None):
+
+        self.values = values
+        self.present = present
+        self.stations = stations
+        self.first_year = int(first_year)
+        self.decimals = decimals
+        self.scale = scale
+        self.years = np.arange(self.first_year, self.first_year + values.shape[1])
+        self.index = { code: i for i, code in enumerate(stations['stationcode'].tolist()) }
+
+    def __len__(self):
+
+        return self.values.shape[0]
+
+    def __contains__(self, stationcode):
+
+        return stationcode in self.index
+
+    def _as_float(self, values):
+
+        # float64 monthly values as in the long table
+
+        if self.scale is not None:
+            values = np.where(values == int16_missing, np.nan, values / self.scale)
+        else:
+            values = values.astype(np.float64)
+        return values if self.decimals is None else np.round(values, self.decimals)
+
+    def station(self, stationcode, trim=True):
+
+        """
+        (years, values[n_years, 12]) of one station; trim=True keeps only the
+        years that are rows of the long table.
+        """
+
+        i = self.index[stationcode]
+        values = self._as_float(self.values[i])
+        if not trim:
+            return self.years, values
+        rows = np.asarray(self.present[i])
+        return self.years[rows], values[rows]
+
+    def station_frame(self, stationcode):
+
+        """
+        The station's rows in the long table layout (year, '1'..'12',
+        stationcode, station metadata).
+        """
+
+        years, values = self.station(stationcode)
+        df = pd.DataFrame(values, columns=MONTH_COLUMNS)
+        df.insert(0, 'year', years)
+        metadata = self.stations.iloc[self.index[stationcode]]
+        for column in self.stations.columns:
+            df[column] = metadata[column]
+        return df
+
+    def to_frame(self):
+
+        """
+        The whole long table (stations in cube order, years ascending).
+        """
+
+        s, y = np.nonzero(np.asarray(self.present))
+        df = pd.DataFrame(self._as_float(self.values[s, y]), columns=MONTH_COLUMNS)
+        df.insert(0, 'year', self.years[y])
+        stations = self.stations.take(s).reset_index(drop=True)
+        return pd.concat([df, stations], axis=1)
+
+    def station_months(self, first_year=None, last_year=None):
+
+        """
+        Number of non-missing months per station (optionally within a year
+        range), as a Series indexed by stationcode.
+        """
+
+        y0 = 0 if first_year is None else max(first_year - self.first_year, 0)
+        y1 = len(self.years) if last_year is None else max(last_year - self.first_year + 1, 0)
+        values = self.values[:, y0:y1]
+        valid = values != int16_missing if self.scale is not None else ~np.isnan(values)
+        return pd.Series(valid.sum(axis=(1, 2)), index=self.stations['stationcode'], name='stationmonths')
+
+    def nbytes(self):
+
+        return self.values.nbytes + self.present.nbytes + int(self.stations.memory_usage(deep=True).sum())
+
+def build_cube(df, dtype='float32'):
+
+    """
+    Build a StationCube from a long archive frame. dtype is 'float32' or
+    'int16' (values in units of 10**-decimals; ValueError if they do not fit).
+    Values with more than max_decimals decimal places are kept as float64.
+    Raises ValueError if a (stationcode, year) row is repeated, since a cube
+    cell holds one row.
+    """
+
+    codes, uniques = pd.factorize(df['stationcode'], sort=True)
+    years = df['year'].to_numpy().astype(np.int64)
+    first_year = int(years.min())
+    y = years - first_year
+    n_stations, n_years = len(uniques), int(y.max()) + 1
+    repeated = pd.Series(codes*n_years + y).duplicated().to_numpy()
+    if repeated.any():
+        raise ValueError(str(repeated.sum()) + ' repeated (stationcode, year) rows, e.g. ' + str(uniques[codes[repeated][0]]) + ' ' + str(years[repeated][0]) + ': the cube holds one row per station-year')
+
+    monthly = df[MONTH_COLUMNS].to_numpy(dtype=np.float64)
+    decimals = value_decimals(monthly)
+    scale = None
+    if dtype == 'int16':
+        if decimals is None:
+            raise ValueError('monthly values need more than ' + str(max_decimals) + ' decimal places: use float32')
+        scale = 10**decimals
+        scaled = np.round(monthly * scale)
+        if np.nanmax(np.abs(scaled), initial=0) >= 32767:
+            raise ValueError('monthly values do not fit int16 at ' + str(decimals) + ' decimal places: use float32')
+        values = np.full((n_stations, n_years, 12), int16_missing, dtype=np.int16)
+        values[codes, y] = np.where(np.isnan(scaled), int16_missing, scaled).astype(np.int16)
+    else:
+        values = np.full((n_stations, n_years, 12), np.nan, dtype=np.float32 if decimals is not None else np.float64)
+        values[codes, y] = monthly
+    present = np.zeros((n_stations, n_years), dtype=bool)
+    present[codes, y] = True
+
+    # metadata: first row of each station
+
+    columns = ['stationcode'] + [ column for column in df.columns if column not in ['year', 'stationcode'] + MONTH_COLUMNS ]
+    first = np.unique(codes, return_index=True)[1]
+    stations = df[columns].iloc[first].reset_index(drop=True)
+    return StationCube(values, present, stations, first_year, decimals, scale)
+
+def save_cube(cube, cube_dir, source=None):
+
+    """
+    Write a cube to cube_dir; source is the .pkl archive it was built from.
+    """
+
+    os.makedirs(cube_dir, exist_ok=True)
+    np.save(os.path.join(cube_dir, 'values.npy'), cube.values)
+    np.save(os.path.join(cube_dir, 'present.npy'), cube.present)
+    cube.stations.to_parquet(os.path.join(cube_dir, 'stations.parquet'), index=False)
+    with open(os.path.join(cube_dir, 'cube.json'), 'w') as f:
+        json.dump({'first_year': cube.first_year, 'decimals': cube.decimals, 'scale': cube.scale, 'shape': list(cube.values.shape), 'dtype': str(cube.values.dtype),
+            'source': None if source is None else source_record(source)}, f, indent=1)
+
+def load_cube(cube_dir, mmap=True):
+
+    """
+    Load a cube written by save_cube(); the arrays are memory-mapped unless
+    mmap=False.
+    """
+
+    with open(os.path.join(cube_dir, 'cube.json')) as f:
+        meta = json.load(f)
+    mode = 'r' if mmap else None
+    values = np.load(os.path.join(cube_dir, 'values.npy'), mmap_mode=mode)
+    present = np.load(os.path.join(cube_dir, 'present.npy'), mmap_mode=mode)
+    stations = pd.read_parquet(os.path.join(cube_dir, 'stations.parquet'))
+    return StationCube(values, present, stations, meta['first_year'], meta['decimals'], meta['scale'])
+
+def cube_is_current(cube_dir, pkl_file):
+
+    """
+    True if cube_dir exists and still matches the pickle it was built from
+    (warns and returns False if pkl_file has changed since).
+    """
+
+    if not os.path.exists(os.path.join(cube_dir, 'cube.json')):
+        return False
+    with open(os.path.join(cube_dir, 'cube.json')) as f:
+        meta = json.load(f)
+    return sibling_is_current(cube_dir, meta.get('source'), pkl_file)
+
+#-----------------------------------------------------------------------------
+# MAIN:
+#-----------------------------------------------------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m glosat_lut.cube', description='Dense station x year x month GloSAT archives')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='build a cube directory from a long archive')
+    build_parser.add_argument('archive')
+    build_parser.add_argument('cube_dir')
+    build_parser.add_argument('--int16', action='store_true', help='store int16 in units of the detected decimal precision')
+    commands.add_parser('info', help='shape and memory of a cube').add_argument('cube_dir')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        df = read_archive(args.archive)
+        cube = build_cube(df, dtype='int16' if args.int16 else 'float32')
+        save_cube(cube, args.cube_dir, source=args.archive if args.archive.endswith('.pkl') else None)
+        print(args.archive, '-->', args.cube_dir, 'long table {:.1f} MB, cube {:.1f} MB'.format(df.memory_usage(deep=True).sum()/1e6, cube.nbytes()/1e6))
+    else:
+        cube = load_cube(args.cube_dir)
+        print('stations:', len(cube), 'years:', cube.years[0], '-', cube.years[-1], 'dtype:', cube.values.dtype, 'decimals:', cube.decimals, 'memory: {:.1f} MB'.format(cube.nbytes()/1e6))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/diff.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Diff of two LUT releases (lut.csv or lut.parquet).
+
+Rows are keyed by source_lut + source_code1 + source_code2. LUT #4 rows, and
+any row whose source codes are both missing (-999), are keyed by source_lut +
+station_code instead. Rows are never paired by position: a key repeated within
+a release (e.g. a LUT #1 station_id listed once per observed variable) is not
+paired but reported in its own 'repeated' changelog section with its row
+counts and whether its rows changed. Keys are factorized to integer row ids
+and the two releases are aligned with one hash join on the ids; added and
+removed stations are the unmatched ids and field-level changes come from one
+vectorized comparison per column, so 10^6-row LUTs diff in seconds. The
+changelog is written as JSON:
+
+    $ python -m glosat_lut.diff OUT_previous/lut.csv OUT/lut.csv -o OUT/lut_changelog.json
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# I/O libraries:
+import json, argparse
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+KEY_COLUMNS = ['source_lut', 'source_code1', 'source_code2']
+STATION_KEYED_LUTS = ['4']                  # source_lut values keyed by station_code
+MISSING_CODES = ['-999', '']
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def read_lut_release(path):
+
+    """
+    Read a LUT release with every field as text, so that values compare
+    exactly as written (CSV) or as they would be written (Parquet).
+    """
+
+    if path.endswith('.parquet'):
+        lut = pd.read_parquet(path)
+        return lut.astype(object).where(lut.notna(), '').astype(str)
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return pd.read_csv(path, index_col=0, dtype=str, keep_default_na=False)
+
+    # multi-threaded Arrow parser with every column as non-null text
+
+    header = pd.read_csv(path, nrows=0, index_col=0).columns
+    table = pacsv.read_csv(path,
+        read_options = pacsv.ReadOptions(skip_rows=1, column_names=['index'] + list(header)),
+        parse_options = pacsv.ParseOptions(newlines_in_values=True),
+        convert_options = pacsv.ConvertOptions(column_types={ column: pa.string() for column in ['index'] + list(header) }, strings_can_be_null=False, quoted_strings_can_be_null=False, null_values=[]))
+    return table.drop(['index']).to_pandas()
+
+def row_keys(lut):
+
+    """
+    Text key of every row: source_lut|source_code1|source_code2, or
+    source_lut|station_code=<code> for STATION_KEYED_LUTS rows and rows
+    without source codes.
+    """
+
+    keys = lut[KEY_COLUMNS[0]].str.cat([ lut[column] for column in KEY_COLUMNS[1:] ], sep='|')
+    by_station = lut['source_lut'].isin(STATION_KEYED_LUTS) | (lut['source_code1'].isin(MISSING_CODES) & lut['source_code2'].isin(MISSING_CODES))
+    if by_station.any():
+        keys = keys.where(~by_station, lut['source_lut'] + '|station_code=' + lut['station_code'])
+    return keys
+
+def _repeated(old, new, old_keys, new_keys, keys, fields):
+
+    # per repeated key: row counts in each release and whether the (sorted)
+    # rows differ
+
+    if not keys:
+        return pd.DataFrame({'key': pd.Series(dtype=object), 'n_old': pd.Series(dtype=np.int64), 'n_new': pd.Series(dtype=np.int64), 'changed': pd.Series(dtype=bool)})
+
+    def rows(lut, lut_keys):
+        hit = lut_keys.isin(keys).to_numpy()
+        text = lut.loc[hit, fields].astype(str).agg('|'.join, axis=1) if fields else pd.Series('', index=lut.index[hit])
+        return text.groupby(lut_keys[hit].to_numpy()).agg(lambda group: sorted(group))
+
+    old_rows = rows(old, old_keys).reindex(keys)
+    new_rows = rows(new, new_keys).reindex(keys)
+    return pd.DataFrame({
+        'key': keys,
+        'n_old': old_keys[old_keys.isin(keys)].value_counts().reindex(keys, fill_value=0).to_numpy(),
+        'n_new': new_keys[new_keys.isin(keys)].value_counts().reindex(keys, fill_value=0).to_numpy(),
+        'changed': [ a != b for a, b in zip(old_rows.tolist(), new_rows.tolist()) ],
+        })
+
+def diff_luts(old, new, fields=None):
+
+    """
+    Return (added, removed, changed, repeated) DataFrames: added/removed rows
+    with all fields, one changed row per (key, field) with old and new values,
+    and one row per key repeated within either release (key, n_old, n_new,
+    changed), whose rows are left out of the other three. fields defaults to
+    all non-key columns common to both releases.
+    """
+
+    old = old.reset_index(drop=True)
+    new = new.reset_index(drop=True)
+    if fields is None:
+        fields = [ column for column in old.columns if column in new.columns and column not in KEY_COLUMNS ]
+    old_keys, new_keys = row_keys(old), row_keys(new)
+
+    # set aside keys repeated within a release: their rows cannot be paired
+
+    keys = pd.concat([old_keys[old_keys.duplicated()], new_keys[new_keys.duplicated()]]).drop_duplicates().sort_values().tolist()
+    repeated = _repeated(old, new, old_keys, new_keys, keys, fields)
+    if keys:
+        old_unique = ~old_keys.isin(keys).to_numpy()
+        new_unique = ~new_keys.isin(keys).to_numpy()
+        old, old_keys = old[old_unique].reset_index(drop=True), old_keys[old_unique].reset_index(drop=True)
+        new, new_keys = new[new_unique].reset_index(drop=True), new_keys[new_unique].reset_index(drop=True)
+
+    # integer row ids shared by both releases (factorized row keys)
+
+    ids = pd.factorize(pd.concat([old_keys, new_keys], ignore_index=True))[0]
+    old_ids, new_ids = ids[:len(old)], ids[len(old):]
+
+    # align the releases by row id with one hash lookup instead of a row loop
+
+    new_rows = pd.Index(new_ids).get_indexer(old_ids)
+    matched = new_rows >= 0
+    old_rows = np.flatnonzero(matched)
+    new_rows = new_rows[matched]
+    removed = old[~matched].reset_index(drop=True)
+    added = new[~pd.Index(new_ids).isin(old_ids)].reset_index(drop=True)
+
+    changes = []
+    for field in fields:
+        a = old[field].to_numpy()[old_rows]
+        b = new[field].to_numpy()[new_rows]
+        hit = a != b
+        if hit.any():
+            changes.append(pd.DataFrame({
+                'row': old_rows[hit],
+                'key': old_keys.to_numpy()[old_rows[hit]],
+                'field': field,
+                'old': a[hit],
+                'new': b[hit],
+                }))
+    changed = pd.concat(changes, ignore_index=True) if changes else pd.DataFrame(columns=['row','key','field','old','new'])
+    changed = changed.sort_values('row', kind='stable').drop(columns='row').reset_index(drop=True)
+    return added, removed, changed, repeated
+
+def changelog(old_path, new_path, fields=None):
+
+    """
+    Diff two releases and return (changelog JSON text, summary dict).
+    """
+
+    old = read_lut_release(old_path)
+    new = read_lut_release(new_path)
+    added, removed, changed, repeated = diff_luts(old, new, fields)
+    summary = {
+        'old': old_path,
+        'new': new_path,
+        'n_old': len(old),
+        'n_new': len(new),
+        'n_added': len(added),
+        'n_removed': len(removed),
+        'n_changed_stations': int(changed['key'].nunique()),
+        'n_changes_by_field': { field: int(n) for field, n in changed['field'].value_counts().sort_index().items() },
+        'n_repeated_keys': len(repeated),
+        'n_repeated_keys_changed': int(repeated['changed'].sum()),
+        }
+
+    # DataFrame.to_json() serialises the (potentially 10^6-row) record lists in C
+
+    return ('{"summary": ' + json.dumps(summary, indent=1) +
+        ',\n"added": ' + added.to_json(orient='records') +
+        ',\n"removed": ' + removed.to_json(orient='records') +
+        ',\n"changed": ' + changed.to_json(orient='records') +
+        ',\n"repeated": ' + repeated.to_json(orient='records') + '}\n'), summary
+
+#-----------------------------------------------------------------------------
+# MAIN:
+#-----------------------------------------------------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m glosat_lut.diff', description='Diff two LUT releases (lut.csv or lut.parquet)')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('-o', '--output', default=None, help='write the JSON changelog here (default: stdout)')
+    parser.add_argument('--fields', nargs='+', default=None, help='compare only these fields')
+    args = parser.parse_args(argv)
+
+    text, summary = changelog(args.old, args.new, args.fields)
+    if args.output is None:
+        print(text, end='')
+        return
+    with open(args.output, 'w') as f:
+        f.write(text)
+    print('LUT diff: N(added)=', summary['n_added'], 'N(removed)=', summary['n_removed'], 'N(changed stations)=', summary['n_changed_stations'], 'N(repeated keys)=', summary['n_repeated_keys'], '(changed:', str(summary['n_repeated_keys_changed']) + ')')
+    for field, n in summary['n_changes_by_field'].items():
+        print('  ' + field + ': ' + str(n))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/duplicates.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Cross-inventory duplicate station detection on the merged LUT.
+
+Every LUT row with valid x10 coordinates is placed in a KD-tree on the unit
+sphere, where the Euclidean chord length is monotonic in great-circle
+(haversine) distance. All pairs within radius_km are found with one
+query_pairs() call in O(N log N), filtered by elevation tolerance, and then
+scored by station name similarity and first/last-year overlap.
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+import difflib
+
+# GloSAT LUT libraries:
+from glosat_lut.names import normalize_name
+from glosat_lut.schema import as_float
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+earth_radius_km = 6371.0088
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def _normalise(name):
+
+    return normalize_name(name).casefold()
+
+def _unit_vectors(lat, lon):
+
+    lat = np.radians(lat)
+    lon = np.radians(lon)
+    return np.column_stack([ np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat) ])
+
+def haversine_km(lat1, lon1, lat2, lon2):
+
+    lat1, lon1, lat2, lon2 = [ np.radians(x) for x in (lat1, lon1, lat2, lon2) ]
+    a = np.sin((lat2-lat1)/2)**2 + np.cos(lat1)*np.cos(lat2)*np.sin((lon2-lon1)/2)**2
+    return 2*earth_radius_km*np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+def valid_coordinates(lut, coords_dp=1):
+
+    """
+    Return (rows, lat, lon) in degrees for LUT rows with usable x10 coordinates
+    (the -999 / -9999 missing values and out-of-range values are excluded).
+    """
+
+    lat = as_float(lut['station_lat']) / 10**coords_dp
+    lon = as_float(lut['station_lon']) / 10**coords_dp
+    valid = (np.abs(lat) <= 90) & (np.abs(lon) <= 180) & np.isfinite(lat) & np.isfinite(lon)
+    rows = np.flatnonzero(valid)
+    return rows, lat[rows], lon[rows]
+
+def find_duplicate_candidates(lut, radius_km=5.0, elevation_tol=100, coords_dp=1):
+
+    """
+    Return candidate duplicate pairs (row_a < row_b, positional LUT rows) within
+    radius_km whose elevations differ by at most elevation_tol metres (pairs
+    where either elevation is missing are kept).
+    """
+
+    from scipy.spatial import cKDTree
+
+    rows, lat, lon = valid_coordinates(lut, coords_dp)
+    tree = cKDTree(_unit_vectors(lat, lon))
+    chord = 2*np.sin(radius_km/(2*earth_radius_km))
+    pairs = tree.query_pairs(chord, output_type='ndarray')
+    a, b = pairs[:,0], pairs[:,1]
+
+    distance_km = haversine_km(lat[a], lon[a], lat[b], lon[b])
+    elevation = as_float(lut['station_elevation'])
+    elevation = np.where((elevation == -9999) | (elevation == -999), np.nan, elevation)
+    elevation_diff = np.abs(elevation[rows[a]] - elevation[rows[b]])
+    keep = (distance_km <= radius_km) & ~(elevation_diff > elevation_tol)
+
+    candidates = pd.DataFrame({
+        'row_a': np.minimum(rows[a], rows[b])[keep],
+        'row_b': np.maximum(rows[a], rows[b])[keep],
+        'distance_km': distance_km[keep],
+        'elevation_diff': elevation_diff[keep],
+        })
+    return candidates.sort_values(['row_a','row_b']).reset_index(drop=True)
+
+def year_overlap(first_a, last_a, first_b, last_b):
+
+    """
+    Fraction of the shorter record's years that overlap the other record
+    (NaN where either record has missing -9999 years).
+    """
+
+    first_a, last_a, first_b, last_b = [ np.asarray(x, dtype=float) for x in (first_a, last_a, first_b, last_b) ]
+    missing = (first_a == -9999) | (last_a == -9999) | (first_b == -9999) | (last_b == -9999)
+    overlap = np.maximum(np.minimum(last_a, last_b) - np.maximum(first_a, first_b) + 1, 0)
+    shortest = np.maximum(np.minimum(last_a - first_a, last_b - first_b) + 1, 1)
+    return np.where(missing, np.nan, overlap / shortest)
+
+def name_similarity(names_a, names_b):
+
+    # difflib ratio of normalised names, computed once per distinct name pair
+
+    ratios = {}
+    out = np.empty(len(names_a))
+    for k, pair in enumerate(zip(names_a, names_b)):
+        if pair not in ratios:
+            ratios[pair] = difflib.SequenceMatcher(None, _normalise(pair[0]), _normalise(pair[1])).ratio()
+        out[k] = ratios[pair]
+    return out
+
+def score_duplicate_candidates(lut, candidates, radius_km=5.0):
+
+    """
+    Attach both stations' identifiers, name similarity, year overlap and a
+    combined score in [0, 1] to the candidate pairs, best pairs first.
+    """
+
+    a = candidates['row_a'].to_numpy()
+    b = candidates['row_b'].to_numpy()
+    scored = candidates.copy()
+    for column in ['source_lut','station_code','source_code1','source_code2','station_name']:
+        values = lut[column].to_numpy()
+        scored[column + '_a'] = values[a]
+        scored[column + '_b'] = values[b]
+    scored['name_similarity'] = name_similarity(scored['station_name_a'], scored['station_name_b'])
+    scored['year_overlap'] = year_overlap(
+        as_float(lut['station_firstyear'])[a], as_float(lut['station_lastyear'])[a],
+        as_float(lut['station_firstyear'])[b], as_float(lut['station_lastyear'])[b])
+    proximity = 1 - scored['distance_km'] / radius_km
+    scored['score'] = 0.5*scored['name_similarity'] + 0.3*scored['year_overlap'].fillna(0) + 0.2*proximity
+    return scored.sort_values('score', ascending=False).reset_index(drop=True)
@@ -0,0 +1,253 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/geolocate.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Deterministic ISO 3166-1 alpha-2 inference from WMO block numbers and station
+coordinates.
+
+infer_alpha2() assigns each LUT row an alpha-2 code with the precedence
+
+    1. the country text, when it resolved by exact / case-folded / alias
+       lookup in glosat_lut.countries
+    2. WMO block / sub-block of the 6-digit CRU station_code (WMO_BLOCKS)
+    3. a precomputed lat/lon --> alpha-2 raster (coastal cells within
+       raster_buffer_cells of land take the nearest country)
+    4. the country text, when it only resolved by difflib fuzzy match
+
+Both lookups are plain array indexing: station codes index a 1000-entry
+sub-block table and coordinates index the raster grid. The raster is built
+once from the Natural Earth admin-0 polygons (cartopy + shapely >= 2.0) and
+stored as an .npz; without those libraries, or when the Natural Earth
+download fails, and without a stored raster the raster tier is skipped.
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut.schema import as_float
+
+# I/O libraries:
+import os, zipfile
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+raster_resolution = 0.1                     # degrees
+raster_buffer_cells = 5                     # coastal buffer (cells) filled with the nearest country
+
+#-----------------------------------------------------------------------------
+# LOOK-UP TABLES: WMO block (2-digit) and sub-block (3-digit) --> ISO 3166 alpha-2
+#-----------------------------------------------------------------------------
+# Only blocks / sub-blocks whose stations all lie in one ISO 3166 country are
+# listed; shared ones are left to the country text and the raster, e.g.
+# 010 Norway / Svalbard and Jan Mayen, 032 and 038 GB / Isle of Man / Channel
+# Islands, 165 Italy / Malta, 600 Canary Islands / Western Sahara, 617 Gambia /
+# Guinea-Bissau, 653 Togo / Benin, 670 Madagascar / Comoros / Mayotte, 682
+# Botswana / South Africa (68262 Pretoria), 689 South Africa / Gough Island,
+# 718 Canada / St Pierre and Miquelon, 949 Australia / Norfolk Island, 963
+# Brunei, 964 Malaysian Borneo, 969 Indonesia / Christmas Island and 973
+# Indonesia / Timor-Leste. Sub-block entries override block entries.
+#-----------------------------------------------------------------------------
+
+WMO_BLOCKS = {
+    # Region VI: Europe
+    '011': 'NO', '012': 'NO', '013': 'NO', '014': 'NO',
+    '030': 'GB', '031': 'GB', '033': 'GB', '034': 'GB', '035': 'GB', '036': 'GB', '037': 'GB',
+    '040': 'IS', '042': 'GL', '043': 'GL',
+    '062': 'NL', '063': 'NL', '064': 'BE', '066': 'CH', '067': 'CH',
+    '07': 'FR',
+    '10': 'DE',
+    '12': 'PL',
+    '160': 'IT', '161': 'IT', '162': 'IT', '163': 'IT', '164': 'IT', '166': 'GR', '167': 'GR',
+    '170': 'TR', '171': 'TR', '172': 'TR', '173': 'TR',
+    # Region II: Asia
+    '42': 'IN', '430': 'IN', '431': 'IN', '432': 'IN', '433': 'IN',
+    '471': 'KR', '474': 'JP', '475': 'JP', '476': 'JP', '477': 'JP', '478': 'JP', '479': 'JP',
+    '50': 'CN', '51': 'CN', '52': 'CN', '53': 'CN', '54': 'CN', '55': 'CN', '56': 'CN', '57': 'CN', '58': 'CN', '59': 'CN',
+    # Region I: Africa
+    '601': 'MA', '602': 'MA',
+    '604': 'DZ', '605': 'DZ', '606': 'DZ',
+    '607': 'TN',
+    '610': 'NE',
+    '612': 'ML',
+    '614': 'MR',
+    '616': 'SN',
+    '620': 'LY', '621': 'LY',
+    '623': 'EG', '624': 'EG',
+    '626': 'SD', '627': 'SD', '629': 'SS',
+    '630': 'ER',
+    '633': 'ET', '634': 'ET',
+    '642': 'CD', '644': 'CG', '645': 'GA', '646': 'CF', '647': 'TD', '649': 'CM',
+    '650': 'NG', '651': 'NG', '652': 'NG',
+    '654': 'GH',
+    '661': 'AO',
+    '671': 'MG',
+    '672': 'MZ', '673': 'MZ',
+    '677': 'ZW', '678': 'ZW', '679': 'ZW',
+    '681': 'NA',
+    '685': 'ZA', '686': 'ZA', '687': 'ZA', '688': 'ZA',
+    # Region IV: North and Central America
+    '70': 'US', '72': 'US', '74': 'US', '76': 'MX',
+    '710': 'CA', '711': 'CA', '712': 'CA', '713': 'CA', '714': 'CA', '715': 'CA', '716': 'CA', '717': 'CA', '719': 'CA',
+    # Region III: South America
+    '800': 'CO', '801': 'CO', '802': 'CO', '803': 'CO', '804': 'VE',
+    '82': 'BR', '83': 'BR',
+    '840': 'EC', '841': 'EC', '842': 'EC', '844': 'PE', '845': 'PE', '846': 'PE', '847': 'PE',
+    '850': 'BO', '851': 'BO', '852': 'BO', '853': 'BO', '854': 'CL', '855': 'CL', '856': 'CL', '857': 'CL', '858': 'CL', '859': 'CL',
+    '860': 'PY', '861': 'PY', '862': 'PY', '865': 'UY', '866': 'UY',
+    '87': 'AR',
+    # Antarctica and Region V: South-West Pacific
+    '89': 'AQ',
+    '93': 'NZ',
+    '940': 'AU', '941': 'AU', '942': 'AU', '943': 'AU', '944': 'AU', '945': 'AU', '946': 'AU', '947': 'AU', '948': 'AU', '95': 'AU',
+    '960': 'ID', '961': 'ID', '962': 'ID', '965': 'ID', '966': 'ID', '967': 'ID', '968': 'ID',
+    '970': 'ID', '971': 'ID', '972': 'ID', '974': 'ID', '975': 'ID', '976': 'ID', '977': 'ID', '978': 'ID', '979': 'ID',
+    '98': 'PH',
+}
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def _sub_block_table(blocks=WMO_BLOCKS):
+
+    # 1000-entry array indexed by the 3-digit WMO sub-block
+
+    table = np.full(1000, '-999', dtype=object)
+    for block, alpha2 in sorted(blocks.items(), key=lambda item: len(item[0])):
+        if len(block) == 2:
+            table[int(block)*10:int(block)*10+10] = alpha2
+        else:
+            table[int(block)] = alpha2
+    return table
+
+SUB_BLOCK_TO_ALPHA2 = _sub_block_table()
+
+def wmo_block_to_alpha2(station_codes):
+
+    """
+    Alpha-2 codes from the WMO (sub-)block of 6-digit CRU station codes ('-999'
+    for codes that are not 6 digits or whose block is not in WMO_BLOCKS).
+    """
+
+    codes = pd.Series(station_codes, dtype=object).astype(str)
+    valid = (codes.str.len() == 6) & codes.str.isdigit()
+    sub_block = pd.to_numeric(codes.str[:3].where(valid), errors='coerce').fillna(-1).astype(int).to_numpy()
+    return np.where(sub_block >= 0, SUB_BLOCK_TO_ALPHA2[np.maximum(sub_block, 0)], '-999').astype(object)
+
+def build_country_raster(raster_file, resolution=raster_resolution, buffer_cells=raster_buffer_cells):
+
+    """
+    Rasterise the Natural Earth 1:50m admin-0 country polygons onto a regular
+    lat/lon grid of cell-centre point-in-polygon tests and save it as .npz.
+    """
+
+    import shapely
+    from cartopy.io import shapereader
+    from scipy import ndimage
+
+    nlat = int(round(180 / resolution))
+    nlon = int(round(360 / resolution))
+    lats = 90 - (np.arange(nlat) + 0.5) * resolution
+    lons = -180 + (np.arange(nlon) + 0.5) * resolution
+    grid = np.zeros((nlat, nlon), dtype=np.uint16)
+    alpha2 = ['-999']
+
+    reader = shapereader.Reader(shapereader.natural_earth(resolution='50m', category='cultural', name='admin_0_countries'))
+    for record in reader.records():
+        attributes = record.attributes
+        code = attributes.get('ISO_A2_EH', attributes.get('ISO_A2', '-99'))
+        if code in ['-99', '', None]:
+            code = attributes.get('WB_A2', '-99')
+        if code in ['-99', '', None]:
+            continue
+        if code not in alpha2:
+            alpha2.append(code)
+        lon_min, lat_min, lon_max, lat_max = record.geometry.bounds
+        i = np.flatnonzero((lats >= lat_min) & (lats <= lat_max))
+        j = np.flatnonzero((lons >= lon_min) & (lons <= lon_max))
+        if len(i) == 0 or len(j) == 0:
+            continue
+        x, y = np.meshgrid(lons[j], lats[i])
+        inside = shapely.contains_xy(record.geometry, x, y)
+        grid[np.ix_(i, j)] = np.where(inside, alpha2.index(code), grid[np.ix_(i, j)])
+
+    # coastal buffer: sea cells near land take the nearest land cell's country
+
+    distance, (ii, jj) = ndimage.distance_transform_edt(grid == 0, return_indices=True)
+    grid = np.where((grid == 0) & (distance <= buffer_cells), grid[ii, jj], grid)
+
+    os.makedirs(os.path.dirname(raster_file) or '.', exist_ok=True)
+    np.savez_compressed(raster_file, grid=grid, alpha2=np.array(alpha2), resolution=resolution)
+
+def load_country_raster(raster_file, build=True):
+
+    """
+    Return (grid, alpha2, resolution) from raster_file, building it first if
+    it does not exist; None if it cannot be built (cartopy/shapely missing,
+    or no network / a failed Natural Earth download).
+    """
+
+    if not os.path.exists(raster_file):
+        if not build:
+            return None
+        try:
+            build_country_raster(raster_file)
+        except (ImportError, OSError, zipfile.BadZipFile):
+            return None
+    with np.load(raster_file) as raster:
+        return raster['grid'], raster['alpha2'].astype(object), float(raster['resolution'])
+
+def raster_to_alpha2(lat, lon, raster, coords_dp=1):
+
+    """
+    Alpha-2 codes of x10 station coordinates from the country raster ('-999'
+    for missing coordinates, open sea or no raster).
+    """
+
+    lat = as_float(lat) / 10**coords_dp
+    lon = as_float(lon) / 10**coords_dp
+    out = np.full(len(lat), '-999', dtype=object)
+    if raster is None:
+        return out
+    grid, alpha2, resolution = raster
+    valid = (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+    i = np.clip(((90 - lat[valid]) / resolution).astype(int), 0, grid.shape[0] - 1)
+    j = np.clip(((lon[valid] + 180) / resolution).astype(int), 0, grid.shape[1] - 1)
+    out[valid] = alpha2[grid[i, j]]
+    return out
+
+def infer_alpha2(station_codes, text_alpha2, text_exact, lat, lon, raster=None, coords_dp=1):
+
+    """
+    Combine the country text, WMO block and raster tiers (see module
+    docstring). Returns (alpha2, source) with source one of 'text', 'wmo',
+    'raster', 'fuzzy' or '-999' per row.
+    """
+
+    text_alpha2 = np.asarray(text_alpha2, dtype=object)
+    text_exact = np.asarray(text_exact, dtype=bool) & (text_alpha2 != '-999')
+    tiers = [
+        ('text', np.where(text_exact, text_alpha2, '-999')),
+        ('wmo', wmo_block_to_alpha2(station_codes)),
+        ('raster', raster_to_alpha2(lat, lon, raster, coords_dp)),
+        ('fuzzy', text_alpha2),
+        ]
+    alpha2 = np.full(len(text_alpha2), '-999', dtype=object)
+    source = np.full(len(text_alpha2), '-999', dtype=object)
+    for name, values in tiers:
+        fill = (alpha2 == '-999') & (values != '-999')
+        alpha2[fill] = values[fill]
+        source[fill] = name
+    return alpha2, source
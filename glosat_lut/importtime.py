@@ -0,0 +1,151 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/importtime.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Import-time budget for the scripts and the glosat_lut modules.
+
+Each target is timed in a fresh interpreter (best of `repeats` runs): for a
+module the `import` itself, for a script its top-level import statements and
+lazy_import() bindings (the work done before the script's SETTINGS). Targets
+over their IMPORT_BUDGETS entry are reported and the command exits non-zero,
+so a batch job or CI step can check startup cost before converting thousands
+of files:
+
+    $ python -m glosat_lut.importtime
+    $ python -m glosat_lut.importtime glosat-c3s-crutem-converter-raw.py --detail 10
+"""
+
+# I/O libraries:
+import os, sys, ast, json, argparse, subprocess
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+repeats = 3
+
+# target (script path relative to the repo root, or module name): budget (s)
+
+IMPORT_BUDGETS = {
+    'glosat-c3s-crutem-converter.py': 0.75,
+    'glosat-c3s-crutem-converter-raw.py': 0.75,
+    'glosat-c3s-crutem-comparison.py': 0.75,
+    'glosat-lut.py': 1.0,
+    'plot-station-months-map.py': 0.75,
+    'glosat_lut': 0.05,
+    'glosat_lut.lookup': 0.5,
+    'glosat_lut.diff': 1.0,
+    }
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def script_imports(path):
+
+    """
+    Source of the top-level import statements and lazy_import() bindings of a
+    script.
+    """
+
+    with open(path) as f:
+        tree = ast.parse(f.read(), filename=path)
+    nodes = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            nodes.append(node)
+        elif isinstance(node, ast.Assign) and isinstance(node.value, ast.Call) and getattr(node.value.func, 'id', None) == 'lazy_import':
+            nodes.append(node)
+    return ast.unparse(ast.Module(body=nodes, type_ignores=[]))
+
+def _target_source(target, root):
+
+    if target.endswith('.py'):
+        return script_imports(os.path.join(root, target))
+    return 'import ' + target
+
+def measure_import_time(target, root='.', repeats=repeats):
+
+    """
+    Best-of-`repeats` wall time (s) to import a module or a script's imports
+    in a fresh interpreter.
+    """
+
+    code = ('import time\n'
+        't0 = time.perf_counter()\n'
+        'exec(compile(' + repr(_target_source(target, root)) + ', "<imports>", "exec"))\n'
+        'print(time.perf_counter() - t0)\n')
+    best = None
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(target + ': ' + result.stderr.strip().splitlines()[-1])
+        elapsed = float(result.stdout.strip().splitlines()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def slowest_imports(target, root='.', n=10):
+
+    """
+    The n modules with the largest cumulative import time (s) for a target,
+    from `python -X importtime`.
+    """
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', _target_source(target, root)], cwd=root, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative) / 1e6, name.rstrip()))
+    return sorted(rows, reverse=True)[:n]
+
+def check_budgets(budgets=IMPORT_BUDGETS, root='.', scale=1.0, repeats=repeats):
+
+    """
+    Return {target: (seconds, budget, ok)} with budgets multiplied by scale
+    (for slower or faster machines).
+    """
+
+    report = {}
+    for target, budget in budgets.items():
+        elapsed = measure_import_time(target, root, repeats)
+        report[target] = (elapsed, budget*scale, elapsed <= budget*scale)
+    return report
+
+#-----------------------------------------------------------------------------
+# MAIN:
+#-----------------------------------------------------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m glosat_lut.importtime', description='Check import times against IMPORT_BUDGETS')
+    parser.add_argument('targets', nargs='*', help='scripts or modules (default: all budgeted targets)')
+    parser.add_argument('--root', default='.', help='repo root holding the scripts')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every budget by this factor')
+    parser.add_argument('--repeats', type=int, default=repeats)
+    parser.add_argument('--detail', type=int, default=0, metavar='N', help='also list the N slowest imported modules per target')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+
+    budgets = { target: IMPORT_BUDGETS.get(target, float('inf')) for target in args.targets } if args.targets else IMPORT_BUDGETS
+    report = check_budgets(budgets, args.root, args.scale, args.repeats)
+    if args.json:
+        print(json.dumps({ target: {'seconds': round(elapsed, 4), 'budget': budget, 'ok': ok} for target, (elapsed, budget, ok) in report.items() }, indent=1))
+    else:
+        for target, (elapsed, budget, ok) in report.items():
+            print('{:<40} {:7.3f} s  (budget {:.3f} s)  {}'.format(target, elapsed, budget, 'ok' if ok else 'OVER BUDGET'))
+            for seconds, name in (slowest_imports(target, args.root, args.detail) if args.detail > 0 else []):
+                print('    {:7.3f} s  {}'.format(seconds, name))
+    return 0 if all(ok for _, _, ok in report.values()) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/lazy.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Deferred imports for the plotting and mapping libraries.
+
+    plt = lazy_import('matplotlib.pyplot')
+    ccrs = lazy_import('cartopy.crs')
+
+binds a placeholder module that imports the real one on first attribute
+access, so scripts keep their usual plt.* / ccrs.* code while runs that never
+reach a PLOT section (or run without matplotlib / cartopy installed) do not
+pay for the import.
+"""
+
+# I/O libraries:
+import sys, importlib, types
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+class LazyModule(types.ModuleType):
+
+    """
+    Placeholder for a module that is imported on first attribute access.
+    """
+
+    def __init__(self, name):
+
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self):
+
+        if self.__dict__['_module'] is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_module'] = module
+            self.__dict__.update({ key: value for key, value in module.__dict__.items() if key not in ['__name__', '__spec__', '__loader__'] })
+        return self.__dict__['_module']
+
+    def __getattr__(self, attr):
+
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+
+        return dir(self._load())
+
+    def __repr__(self):
+
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return '<lazy module ' + repr(self.__name__) + ' (' + state + ')>'
+
+def lazy_import(name):
+
+    """
+    Return the module `name` if it is already imported, otherwise a
+    LazyModule that imports it when first used.
+    """
+
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
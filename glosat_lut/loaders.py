@@ -0,0 +1,57 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/loaders.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Readers and the worker pool for the LUT input inventories.
+
+read_inventory() reads one source with reader 'excel' (pd.read_excel) or
+'pickle' (pd.read_pickle); with a snapshot_dir, Excel sources are served from
+the snapshot cache in glosat_lut.snapshots. The Excel parser and bz2
+decompression are CPU-bound and hold the GIL, so glosat_lut.adapters loads and
+builds sources in the process pool from _executor() (fork start method), and
+the wall-clock load time is bounded by the slowest input rather than the sum
+of all of them.
+"""
+
+# Dataframe libraries:
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut.snapshots import read_excel_cached
+
+# I/O libraries:
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def read_inventory(reader, path, snapshot_dir=None, **kwargs):
+
+    if reader == 'excel' and snapshot_dir is not None:
+        return read_excel_cached(path, snapshot_dir=snapshot_dir, **kwargs)
+    elif reader == 'excel':
+        with open(path, 'rb') as f:
+            return pd.read_excel(f, **kwargs)
+    elif reader == 'pickle':
+        return pd.read_pickle(path, **kwargs)
+    else:
+        raise ValueError('unknown inventory reader: ' + str(reader))
+
+def _executor(nworkers):
+
+    # forked workers inherit the parent's imports and do not re-run the calling
+    # script; where fork is unavailable fall back to threads
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(max_workers=nworkers, mp_context=multiprocessing.get_context('fork'))
+    return ThreadPoolExecutor(max_workers=nworkers)
@@ -0,0 +1,420 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/lookup.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Low-latency station lookups over a prebuilt, memory-mapped LUT index.
+
+build_index() writes a directory of .npy arrays that StationIndex opens with
+np.load(mmap_mode='r'), so a query touches only the pages it needs and the
+LUT is never re-parsed:
+
+    codes    sorted station_code / source_code1 / source_code2 keys with row
+             permutations (binary search stands in for a hash map and is
+             memory-mappable)
+    names    sorted distinct normalised names (prefix search) and a CSR
+             trigram --> name posting list (fuzzy search, Dice coefficient)
+    spatial  rows bucketed by 1-degree lat/lon cell in CSR form (radius
+             search by great-circle distance over the neighbouring cells)
+
+Command line and services:
+
+    $ python -m glosat_lut.lookup build OUT/lut.parquet OUT/lut_index/
+    $ python -m glosat_lut.lookup code 619670
+    $ python -m glosat_lut.lookup name Kandi
+    $ python -m glosat_lut.lookup near 11.1 2.9 --radius 50
+    $ python -m glosat_lut.lookup source 61967000000
+    $ python -m glosat_lut.lookup serve --port 8765      # GET /name?q=Kandi, POST /batch
+    $ python -m glosat_lut.lookup serve --stdio          # one JSON query per line
+"""
+
+# Dataframe libraries:
+import numpy as np
+
+# I/O libraries:
+import os, sys, json, argparse
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+index_dir = 'OUT/lut_index/'
+earth_radius_km = 6371.0088
+
+TEXT_COLUMNS = ['station_code', 'station_name', 'station_country', 'iso-3166', 'continent', 'source_code1', 'source_code2']
+NUMERIC_COLUMNS = ['station_lat', 'station_lon', 'station_elevation', 'station_firstyear', 'station_lastyear', 'source_lut']
+MISSING_VALUES = [-999, -9999]
+
+#-----------------------------------------------------------------------------
+# METHODS: index build
+#-----------------------------------------------------------------------------
+
+def _encode(values):
+
+    # fixed-width UTF-8 byte strings ('-999' / missing --> b'')
+
+    values = [ '' if value in ['-999', '<NA>', 'nan', 'None'] else value for value in values ]
+    encoded = np.array([ value.encode('utf-8') for value in values ], dtype=object)
+    return encoded.astype('S') if len(encoded) else np.zeros(0, dtype='S1')
+
+def _sorted_keys(keys, rows):
+
+    order = np.argsort(keys, kind='stable')
+    return keys[order], rows[order].astype(np.int32)
+
+def _csr(groups, ngroups):
+
+    # rows sorted by group id and the group offsets into them
+
+    order = np.argsort(groups, kind='stable').astype(np.int32)
+    offsets = np.zeros(ngroups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(groups, minlength=ngroups), out=offsets[1:])
+    return order, offsets
+
+def _cells(lat, lon):
+
+    i = np.clip(np.floor(lat) + 90, 0, 179).astype(np.int64)
+    j = np.clip(np.floor(lon) + 180, 0, 359).astype(np.int64)
+    return i*360 + j
+
+def build_index(lut, index_dir=index_dir, coords_dp=1):
+
+    """
+    Build the lookup index of a LUT DataFrame (either schema) in index_dir.
+    """
+
+    from glosat_lut.names import normalize_name, name_ngrams
+    from glosat_lut.schema import as_float
+    import pandas as pd
+
+    os.makedirs(index_dir, exist_ok=True)
+    lut = lut.reset_index(drop=True)
+    n = len(lut)
+    arrays = {}
+
+    # RECORDS: text as fixed-width UTF-8, numbers as float32 (NaN = missing)
+
+    for column in TEXT_COLUMNS:
+        arrays['col_' + column] = _encode(lut[column].astype(str).tolist())
+    for column in NUMERIC_COLUMNS:
+        values = as_float(lut[column])
+        values[np.isin(values, MISSING_VALUES)] = np.nan
+        if column in ['station_lat', 'station_lon']:
+            values = values / 10**coords_dp
+        arrays['col_' + column] = values.astype(np.float32)
+
+    # CODES: sorted keys + row permutations
+
+    rows = np.arange(n)
+    for column in ['station_code', 'source_code1', 'source_code2']:
+        arrays['key_' + column], arrays['perm_' + column] = _sorted_keys(arrays['col_' + column], rows)
+
+    # NAMES: distinct normalised names (sorted) --> rows, trigram --> names
+
+    normalized = [ normalize_name(name).casefold() for name in lut['station_name'].astype(str) ]
+    name_id, uniques = pd.factorize(pd.Series(normalized), sort=True)
+    arrays['name_keys'] = _encode(list(uniques))
+    arrays['name_rows'], arrays['name_offsets'] = _csr(name_id, len(uniques))
+    grams = [ sorted(name_ngrams(name)) for name in uniques ]
+    arrays['name_ngram_count'] = np.array([ len(g) for g in grams ], dtype=np.int16)
+    pairs = [ (gram, k) for k, g in enumerate(grams) for gram in g ]
+    gram_keys, gram_id = np.unique(np.array([ gram.encode('utf-8') for gram, _ in pairs ], dtype='S12') if pairs else np.zeros(0, dtype='S12'), return_inverse=True)
+    arrays['gram_keys'] = gram_keys
+    postings, arrays['gram_offsets'] = _csr(gram_id, len(gram_keys))
+    arrays['gram_names'] = np.array([ k for _, k in pairs ], dtype=np.int32)[postings] if pairs else np.zeros(0, dtype=np.int32)
+
+    # SPATIAL: rows bucketed by 1-degree cell
+
+    lat = arrays['col_station_lat'].astype(float)
+    lon = arrays['col_station_lon'].astype(float)
+    valid = (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+    cells = np.where(valid, _cells(np.nan_to_num(lat), np.nan_to_num(lon)), 180*360)
+    arrays['cell_rows'], arrays['cell_offsets'] = _csr(cells, 180*360 + 1)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(index_dir, name + '.npy'), array)
+    with open(os.path.join(index_dir, 'index.json'), 'w') as f:
+        json.dump({'n': n, 'coords_dp': coords_dp, 'arrays': sorted(arrays)}, f, indent=1)
+
+def read_lut_file(path):
+
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, index_col=0, dtype={'station_code': str, 'source_code1': str, 'source_code2': str}, keep_default_na=False)
+
+#-----------------------------------------------------------------------------
+# METHODS: queries
+#-----------------------------------------------------------------------------
+
+def haversine_km(lat1, lon1, lat2, lon2):
+
+    lat1, lon1, lat2, lon2 = [ np.radians(x) for x in (lat1, lon1, lat2, lon2) ]
+    a = np.sin((lat2-lat1)/2)**2 + np.cos(lat1)*np.cos(lat2)*np.sin((lon2-lon1)/2)**2
+    return 2*earth_radius_km*np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+class StationIndex:
+
+    """
+    Memory-mapped LUT index written by build_index(). All query methods return
+    lists of station records (dicts).
+    """
+
+    def __init__(self, index_dir=index_dir):
+
+        with open(os.path.join(index_dir, 'index.json')) as f:
+            self.meta = json.load(f)
+        self.arrays = { name: np.load(os.path.join(index_dir, name + '.npy'), mmap_mode='r') for name in self.meta['arrays'] }
+
+    def __len__(self):
+
+        return self.meta['n']
+
+    def records(self, rows, **extra):
+
+        records = []
+        for k, row in enumerate(rows):
+            record = {'row': int(row)}
+            for column in TEXT_COLUMNS:
+                value = self.arrays['col_' + column][row].decode('utf-8')
+                record[column] = value if value != '' else None
+            for column in NUMERIC_COLUMNS:
+                value = float(self.arrays['col_' + column][row])
+                record[column] = None if np.isnan(value) else (round(value, 4) if column in ['station_lat', 'station_lon'] else int(value))
+            for key, values in extra.items():
+                record[key] = values[k]
+            records.append(record)
+        return records
+
+    def _exact(self, column, code):
+
+        keys = self.arrays['key_' + column]
+        key = str(code).encode('utf-8')
+        lo = np.searchsorted(keys, key, side='left')
+        hi = np.searchsorted(keys, key, side='right')
+        return np.sort(self.arrays['perm_' + column][lo:hi])
+
+    def by_code(self, code):
+
+        return self.records(self._exact('station_code', code))
+
+    def by_source_code(self, code):
+
+        rows = np.union1d(self._exact('source_code1', code), self._exact('source_code2', code))
+        return self.records(rows)
+
+    def by_name(self, query, limit=10):
+
+        """
+        Exact and prefix matches on the normalised name first, then trigram
+        (Dice) matches; up to `limit` distinct names, all their rows.
+        """
+
+        from glosat_lut.names import normalize_name, name_ngrams
+
+        q = normalize_name(query).casefold()
+        keys = self.arrays['name_keys']
+        key = q.encode('utf-8')
+        lo = np.searchsorted(keys, key, side='left')
+        hi = np.searchsorted(keys, key + b'\xff', side='left')
+        scores = { int(k): (2.0 if keys[k] == key else 1.0) for k in range(lo, min(hi, lo + limit)) }
+
+        grams = sorted(name_ngrams(q))
+        gram_keys = self.arrays['gram_keys']
+        postings = []
+        for gram in grams:
+            g = np.searchsorted(gram_keys, gram.encode('utf-8'))
+            if g < len(gram_keys) and gram_keys[g] == gram.encode('utf-8'):
+                postings.append(self.arrays['gram_names'][self.arrays['gram_offsets'][g]:self.arrays['gram_offsets'][g+1]])
+        if postings:
+            names, shared = np.unique(np.concatenate(postings), return_counts=True)
+            dice = 2*shared / (len(grams) + self.arrays['name_ngram_count'][names])
+            for k in np.argsort(-dice, kind='stable')[:limit]:
+                scores.setdefault(int(names[k]), float(dice[k]))
+
+        best = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        rows, score = [], []
+        for name, s in best:
+            name_rows = self.arrays['name_rows'][self.arrays['name_offsets'][name]:self.arrays['name_offsets'][name+1]]
+            rows.extend(name_rows.tolist())
+            score.extend([ round(min(s, 1.0), 4) ] * len(name_rows))
+        return self.records(rows, score=score)
+
+    def near(self, lat, lon, radius_km=50.0, limit=None):
+
+        """
+        Stations within radius_km of (lat, lon) in degrees, nearest first.
+        """
+
+        dlat = np.degrees(radius_km / earth_radius_km)
+        i0 = int(np.clip(np.floor(lat - dlat) + 90, 0, 179))
+        i1 = int(np.clip(np.floor(lat + dlat) + 90, 0, 179))
+        coslat = np.cos(np.radians(min(abs(lat) + dlat, 90.0)))
+        dlon = 180.0 if coslat < 1e-6 else min(dlat / coslat, 180.0)
+        j = np.arange(int(np.floor(lon - dlon)), int(np.floor(lon + dlon)) + 1)
+        j = np.unique((j + 180) % 360)
+        offsets = self.arrays['cell_offsets']
+        candidates = []
+        for i in range(i0, i1 + 1):
+            for cell in i*360 + j:
+                if offsets[cell+1] > offsets[cell]:
+                    candidates.append(self.arrays['cell_rows'][offsets[cell]:offsets[cell+1]])
+        if not candidates:
+            return []
+        rows = np.concatenate(candidates)
+        distance = haversine_km(lat, lon, self.arrays['col_station_lat'][rows].astype(float), self.arrays['col_station_lon'][rows].astype(float))
+        keep = distance <= radius_km
+        rows, distance = rows[keep], distance[keep]
+        order = np.argsort(distance, kind='stable')[:limit]
+        return self.records(rows[order], distance_km=[ round(float(d), 3) for d in distance[order] ])
+
+    def query(self, request):
+
+        """
+        Dispatch one JSON-style query: {'op': 'code' | 'source' | 'name' | 'near', ...}.
+        """
+
+        op = request.get('op')
+        if op == 'code':
+            return self.by_code(request['code'])
+        elif op == 'source':
+            return self.by_source_code(request['code'])
+        elif op == 'name':
+            return self.by_name(request['q'], limit=int(request.get('limit', 10)))
+        elif op == 'near':
+            return self.near(float(request['lat']), float(request['lon']), float(request.get('radius', 50.0)),
+                None if request.get('limit') is None else int(request['limit']))
+        raise ValueError('unknown lookup op: ' + str(op))
+
+#-----------------------------------------------------------------------------
+# METHODS: services
+#-----------------------------------------------------------------------------
+
+def serve_stdio(index, stdin=sys.stdin, stdout=sys.stdout):
+
+    # one JSON query per input line --> one JSON result per output line
+
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            result = {'result': index.query(json.loads(line))}
+        except Exception as e:
+            result = {'error': str(e)}
+        stdout.write(json.dumps(result) + '\n')
+        stdout.flush()
+
+def serve_http(index, host='127.0.0.1', port=8765):
+
+    """
+    GET /code/<code>, /source/<code>, /name?q=..&limit=.., /near?lat=..&lon=..&radius=..
+    POST /batch with a JSON list of queries.
+    """
+
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from urllib.parse import urlparse, parse_qs, unquote
+
+    class Handler(BaseHTTPRequestHandler):
+
+        def _reply(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [ unquote(p) for p in url.path.strip('/').split('/') ]
+            request = { key: values[0] for key, values in parse_qs(url.query).items() }
+            request['op'] = parts[0]
+            if len(parts) > 1:
+                request['code'] = parts[1]
+            try:
+                self._reply(200, index.query(request))
+            except (KeyError, ValueError) as e:
+                self._reply(400, {'error': str(e)})
+
+        def do_POST(self):
+            if urlparse(self.path).path.strip('/') != 'batch':
+                self._reply(404, {'error': 'POST /batch only'})
+                return
+            try:
+                requests = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                self._reply(200, [ index.query(request) for request in requests ])
+            except (KeyError, ValueError) as e:
+                self._reply(400, {'error': str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    print('serving LUT lookups on http://' + host + ':' + str(port), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+#-----------------------------------------------------------------------------
+# MAIN:
+#-----------------------------------------------------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m glosat_lut.lookup', description='Station lookups over a memory-mapped LUT index')
+    parser.add_argument('--index', default=index_dir)
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='build the index from lut.parquet or lut.csv')
+    build_parser.add_argument('lut')
+    build_parser.add_argument('output', nargs='?', default=None)
+    build_parser.add_argument('--coords-dp', type=int, default=1)
+    commands.add_parser('code', help='stations with this CRU station_code').add_argument('code')
+    commands.add_parser('source', help='stations with this source_code1 or source_code2').add_argument('code')
+    name_parser = commands.add_parser('name', help='stations by (fuzzy) name')
+    name_parser.add_argument('q', nargs='+')
+    name_parser.add_argument('--limit', type=int, default=10)
+    near_parser = commands.add_parser('near', help='stations within a radius of a point')
+    near_parser.add_argument('lat', type=float)
+    near_parser.add_argument('lon', type=float)
+    near_parser.add_argument('--radius', type=float, default=50.0)
+    near_parser.add_argument('--limit', type=int, default=None)
+    serve_parser = commands.add_parser('serve', help='run as a local HTTP or stdio service')
+    serve_parser.add_argument('--stdio', action='store_true')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        build_index(read_lut_file(args.lut), args.output or args.index, coords_dp=args.coords_dp)
+        return
+    index = StationIndex(args.index)
+    if args.command == 'serve':
+        if args.stdio:
+            serve_stdio(index)
+        else:
+            serve_http(index, args.host, args.port)
+        return
+    if args.command == 'code':
+        result = index.by_code(args.code)
+    elif args.command == 'source':
+        result = index.by_source_code(args.code)
+    elif args.command == 'name':
+        result = index.by_name(' '.join(args.q), limit=args.limit)
+    else:
+        result = index.near(args.lat, args.lon, args.radius, args.limit)
+    for record in result:
+        print(json.dumps(record))
+
+if __name__ == '__main__':
+    main()
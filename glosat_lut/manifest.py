@@ -0,0 +1,172 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/manifest.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Incremental LUT rebuilds driven by an input manifest.
+
+The per-source LUT built by each inventory adapter is kept in cache_dir as
+<name>.pkl, and manifest.json records for every source the input file's size,
+mtime and SHA-256, and a signature of the adapter declaration (mapping,
+constants, fill values, reader options, the source of its prepare and
+station code functions), coords_dp and the schema, together with an engine
+signature: the serialized station ID rule tables, LUT column/fill tables and
+country tables, and the source of the modules that build every LUT
+(ENGINE_MODULES). On the next run a source is reused when its input, adapter
+and engine are unchanged and rebuilt otherwise, so editing one
+inventory only reloads that inventory before the cheap merge/sort/write
+stages. Each run reports which sources were reused and which were rebuilt.
+"""
+
+# Dataframe libraries:
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut import adapters, stationids, countries
+from glosat_lut.adapters import ADAPTERS, build_luts
+from glosat_lut.snapshots import file_sha256
+
+# I/O libraries:
+import os, sys, json, hashlib, inspect, importlib
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+# modules on the build path of every adapter: editing any of them invalidates
+# all cached LUTs
+
+ENGINE_MODULES = ['glosat_lut.adapters', 'glosat_lut.stationids', 'glosat_lut.schema', 'glosat_lut.loaders', 'glosat_lut.snapshots', 'glosat_lut.countries']
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def _source(function):
+
+    if function is None:
+        return None
+    try:
+        return inspect.getsource(function)
+    except (OSError, TypeError):
+        return getattr(function, '__qualname__', repr(function))
+
+def _module_source(name):
+
+    module = sys.modules.get(name) or importlib.import_module(name)
+    try:
+        return inspect.getsource(module)
+    except (OSError, TypeError):
+        return None
+
+def engine_signature(modules=ENGINE_MODULES):
+
+    """
+    Hash of the rule tables as they are at run time (including any entries
+    added by a script) and of the source of the LUT build modules.
+    """
+
+    tables = {
+        'SECONDARY_ID_RULES': stationids.SECONDARY_ID_RULES,
+        'PRIMARY_STATION_ID_RULES': stationids.PRIMARY_STATION_ID_RULES,
+        'LUT_COLUMNS': adapters.LUT_COLUMNS,
+        'LUT_STRING_COLUMNS': adapters.LUT_STRING_COLUMNS,
+        'LUT_FILL_VALUES': adapters.LUT_FILL_VALUES,
+        'countries': countries._tables_signature(),
+        'modules': { name: _module_source(name) for name in modules },
+        }
+    return hashlib.sha1(json.dumps(tables, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def adapter_signature(adapter, coords_dp=1, compact=False, engine=None):
+
+    declaration = {
+        'source_lut': adapter.source_lut,
+        'reader': adapter.reader,
+        'filename': adapter.filename,
+        'read_kwargs': adapter.read_kwargs,
+        'columns': adapter.columns,
+        'constants': adapter.constants,
+        'fill_values': adapter.fill_values,
+        'prepare': _source(adapter.prepare),
+        'station_code': _source(adapter.station_code),
+        'coords_dp': coords_dp,
+        'compact': compact,
+        'engine': engine_signature() if engine is None else engine,
+        }
+    return hashlib.sha1(json.dumps(declaration, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def load_manifest(cache_dir):
+
+    manifest_file = os.path.join(cache_dir, 'manifest.json')
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file) as f:
+        return json.load(f)
+
+def save_manifest(manifest, cache_dir):
+
+    # write-then-rename so that an interrupted run leaves the old manifest intact
+
+    manifest_file = os.path.join(cache_dir, 'manifest.json')
+    with open(manifest_file + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(manifest_file + '.tmp', manifest_file)
+
+def _input_state(path, entry):
+
+    # size/mtime fast path; hash only when they changed (e.g. after a touch or copy)
+
+    stat = os.stat(path)
+    state = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        state['sha256'] = entry['sha256']
+    else:
+        state['sha256'] = file_sha256(path)
+    return state
+
+def build_luts_incremental(names=None, data_dir='DATA/', cache_dir='OUT/.lut_cache/', coords_dp=1, compact=False, parallel=True, max_workers=None, snapshot_dir=None, verbose=True):
+
+    """
+    build_luts() that reuses cached per-source LUTs whose input file and adapter
+    are unchanged. Returns ({name: LUT}, {name: 'reused' | 'rebuilt'}).
+    """
+
+    names = list(ADAPTERS) if names is None else list(names)
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = load_manifest(cache_dir)
+    states = {}
+    luts = {}
+    engine = engine_signature()
+    for name in names:
+        adapter = ADAPTERS[name]
+        entry = manifest.get(name)
+        state = _input_state(adapter.path(data_dir), entry)
+        state['signature'] = adapter_signature(adapter, coords_dp, compact, engine)
+        state['lut'] = name + '.pkl'
+        states[name] = state
+        if entry is not None and all(entry.get(key) == state[key] for key in ['path', 'sha256', 'signature']) and os.path.exists(os.path.join(cache_dir, entry['lut'])):
+            luts[name] = pd.read_pickle(os.path.join(cache_dir, entry['lut']))
+
+    stale = [ name for name in names if name not in luts ]
+    if len(stale) > 0:
+        for name, lut in build_luts(stale, data_dir=data_dir, coords_dp=coords_dp, compact=compact, parallel=parallel, max_workers=max_workers, snapshot_dir=snapshot_dir, verbose=verbose).items():
+            lut.to_pickle(os.path.join(cache_dir, states[name]['lut']))
+            luts[name] = lut
+
+    # also refreshes size/mtime of touched but unchanged inputs so the next run skips hashing
+    if any(manifest.get(name) != states[name] for name in names):
+        manifest.update(states)
+        save_manifest(manifest, cache_dir)
+
+    report = { name: ('rebuilt' if name in stale else 'reused') for name in names }
+    if verbose:
+        print('  reused: ' + (', '.join(name for name in names if report[name] == 'reused') or '-'))
+        print('  rebuilt: ' + (', '.join(stale) or '-'))
+    return { name: luts[name] for name in names }, report
@@ -0,0 +1,162 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/names.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Blocked fuzzy station-name matching for LUT rows without a CRU code.
+
+Station names are normalised (accent folding, punctuation removal, trailing
+GSN / AP suffixes stripped, title case) and split into padded character
+trigrams. Coded stations are put in a trigram inverted index per block, where
+a block is either an ISO 3166 country or a 1-degree lat/lon cell. Each
+uncoded row (station_code == '-999') is scored only against the coded rows
+that share its country or one of the 3x3 cells around it, using the Dice
+coefficient of shared trigrams, and the top-k candidates are returned as
+ranked suggestions.
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+import re
+import unicodedata
+from collections import defaultdict, Counter
+
+# GloSAT LUT libraries:
+from glosat_lut.schema import as_float
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+NAME_SUFFIXES = ['GSN', 'AP']
+MISSING_NAMES = ['', 'nan', '<na>', 'none', '-999']            # station_name values (stripped, case-folded) before normalising
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def normalize_name(name):
+
+    """
+    'EL-GOLEA GSN' --> 'El Golea', 'Dakar/Yoff AP' --> 'Dakar Yoff', 'São Tomé' --> 'Sao Tome'
+    """
+
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    words = re.sub(r'[^A-Za-z0-9]+', ' ', name).split()
+    while len(words) > 1 and words[-1].upper() in NAME_SUFFIXES:
+        words.pop()
+    return ' '.join(words).title()
+
+def normalize_names(names):
+
+    # normalise each distinct name once
+
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object).astype(str))
+    normalized = np.array([ normalize_name(name) for name in uniques ] + [''], dtype=object)
+    return normalized[codes]
+
+def usable_names(raw, normalized):
+
+    """
+    True where a station name can be matched: the raw name is not missing
+    (NaN, MISSING_NAMES in any case, e.g. '<Na>' and 'Nan' after the
+    str.title() in glosat-lut.py) and its normalised form has letters in it
+    ('<NA>' normalises to 'Na' and '-999' to '999').
+    """
+
+    raw = pd.Series(raw, dtype=object).reset_index(drop=True)
+    missing = raw.isna().to_numpy() | raw.astype(str).str.strip().str.casefold().isin(MISSING_NAMES).to_numpy()
+    normalized = pd.Series(normalized, dtype=object).str.replace(' ', '', regex=False)
+    return ~missing & (normalized != '').to_numpy() & ~normalized.str.isdigit().to_numpy()
+
+def name_ngrams(name, n=3):
+
+    padded = ' ' + name.casefold() + ' '
+    return frozenset( padded[i:i+n] for i in range(len(padded)-n+1) )
+
+def _cells(lat, lon, coords_dp=1):
+
+    # 1-degree cell indices from x10 coordinates (NaN where missing)
+
+    lat = as_float(lat) / 10**coords_dp
+    lon = as_float(lon) / 10**coords_dp
+    valid = (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+    return np.where(valid, np.floor(lat), np.nan), np.where(valid, np.floor(lon), np.nan)
+
+def _blocks(country, cell_lat, cell_lon, neighbours=False):
+
+    blocks = []
+    if country not in ['-999', 'nan', '<NA>', None]:
+        blocks.append(('country', country))
+    if np.isfinite(cell_lat):
+        steps = [-1, 0, 1] if neighbours else [0]
+        for i in steps:
+            for j in steps:
+                blocks.append(('cell', cell_lat + i, (cell_lon + j + 180) % 360 - 180))
+    return blocks
+
+def suggest_station_codes(lut, top_k=3, min_score=0.5, coords_dp=1):
+
+    """
+    Return ranked CRU code suggestions for every LUT row with station_code ==
+    '-999', matched by name against coded rows sharing a country or lat/lon
+    block. Columns: row (positional LUT row of the uncoded station), rank,
+    suggested station_code and the matching coded row's identifiers, score.
+    """
+
+    names = normalize_names(lut['station_name'])
+    grams = {}
+    for name in set(names):
+        grams[name] = name_ngrams(name)
+    codes = lut['station_code'].astype(str).to_numpy()
+    countries = lut['iso-3166'].astype(str).to_numpy() if 'iso-3166' in lut.columns else np.full(len(lut), '-999', dtype=object)
+    cell_lat, cell_lon = _cells(lut['station_lat'], lut['station_lon'], coords_dp)
+    usable = usable_names(lut['station_name'], names)
+    coded = np.flatnonzero((codes != '-999') & usable)
+    uncoded = np.flatnonzero((codes == '-999') & usable)
+
+    # INDEX: block --> trigram --> coded rows
+
+    index = defaultdict(lambda: defaultdict(list))
+    for row in coded:
+        for block in _blocks(countries[row], cell_lat[row], cell_lon[row]):
+            postings = index[block]
+            for gram in grams[names[row]]:
+                postings[gram].append(row)
+
+    # QUERY: uncoded rows against their blocks only
+
+    suggestions = []
+    for row in uncoded:
+        blocks = [ index[block] for block in _blocks(countries[row], cell_lat[row], cell_lon[row], neighbours=True) if block in index ]
+        if len(blocks) == 0:
+            continue
+        query = grams[names[row]]
+        shared = Counter()
+        for gram in query:
+            shared.update(set().union(*[ postings.get(gram, ()) for postings in blocks ]))
+        best = {}
+        for candidate, n in shared.items():
+            score = 2*n / (len(query) + len(grams[names[candidate]]))
+            code = codes[candidate]
+            if score >= min_score and score > best.get(code, (0,))[0]:
+                best[code] = (score, candidate)
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))[:top_k]
+        for rank, (code, (score, candidate)) in enumerate(ranked):
+            suggestions.append((row, rank+1, code, candidate, score))
+
+    suggestions = pd.DataFrame(suggestions, columns=['row','rank','suggested_code','match_row','score'])
+    for column in ['source_lut','source_code1','source_code2','station_name','iso-3166','station_lat','station_lon']:
+        if column in lut.columns:
+            values = lut[column].to_numpy()
+            suggestions[column] = values[suggestions['row'].to_numpy(dtype=int)]
+            suggestions['match_' + column] = values[suggestions['match_row'].to_numpy(dtype=int)]
+    return suggestions
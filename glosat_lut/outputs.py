@@ -0,0 +1,141 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/outputs.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Columnar LUT outputs.
+
+The merged LUT is written once as a typed Parquet file together with an .npz
+of int32 row permutations, one per sort order (e.g. name, Nyr, firstyear), so
+that sorted views are a take() on read rather than extra full copies on disk:
+
+    lut = read_lut('OUT/lut.parquet', order='Nyr')
+    perm = read_sort_order('OUT/lut.parquet', 'Nyr')
+
+CSV export formats row chunks with Arrow compute kernels in a thread pool,
+byte-identical to DataFrame.to_csv() for the integer and string LUT columns,
+and falls back to pandas for anything else (or when pyarrow is missing).
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# I/O libraries:
+import io, csv
+from concurrent.futures import ThreadPoolExecutor
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+# sort order name: (column, ascending)
+
+LUT_SORT_ORDERS = {
+    'name': ('station_name', True),
+    'Nyr': ('Nyr', False),
+    'firstyear': ('station_firstyear', True),
+    }
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def sort_permutations(lut, orders=LUT_SORT_ORDERS):
+
+    """
+    Return {order: int32 positional row permutation} equivalent to
+    lut.sort_values(by=column, ascending=ascending) for each sort order.
+    """
+
+    perms = {}
+    for order, (column, ascending) in orders.items():
+        perm = lut[column].reset_index(drop=True).sort_values(ascending=ascending).index
+        perms[order] = perm.to_numpy(dtype=np.int32)
+    return perms
+
+def sort_order_file(path):
+
+    return path.rsplit('.', 1)[0] + '_sortorders.npz'
+
+def write_lut_parquet(lut, path, perms=None):
+
+    lut.to_parquet(path, index=False)
+    if perms is not None:
+        np.savez(sort_order_file(path), **perms)
+
+def read_sort_order(path, order):
+
+    with np.load(sort_order_file(path)) as perms:
+        return perms[order]
+
+def read_lut(path, order=None, columns=None):
+
+    """
+    Read a Parquet LUT (optionally only some columns), in stored order or in
+    one of its saved sort orders.
+    """
+
+    lut = pd.read_parquet(path, columns=columns)
+    if order is None:
+        return lut
+    return lut.take(read_sort_order(path, order)).reset_index(drop=True)
+
+def _csv_lines(df):
+
+    # format one row chunk as CSV lines with Arrow compute kernels, quoting as
+    # DataFrame.to_csv() does: only string fields containing the delimiter,
+    # the quote character or the line terminator '\n' (not '\r')
+
+    import pyarrow as pa
+    import pyarrow.compute as pac
+
+    def literal(text):
+        return pa.scalar(text, pa.large_string())
+
+    fields = []
+    for array in [ pa.array(df.index.to_numpy()) ] + [ pa.Array.from_pandas(df[column]) for column in df.columns ]:
+        if pa.types.is_dictionary(array.type):
+            array = array.dictionary_decode()
+        if not (pa.types.is_integer(array.type) or pa.types.is_string(array.type) or pa.types.is_null(array.type)):
+            raise TypeError('no Arrow CSV formatting for ' + str(array.type))
+        text = pac.cast(array, pa.large_string()).fill_null('')
+        if pa.types.is_string(array.type):
+            quoted = pac.binary_join_element_wise(literal('"'), pac.replace_substring(text, '"', '""'), literal('"'), literal(''))
+            text = pac.if_else(pac.match_substring_regex(text, '[,"\n]'), quoted, text)
+        fields.append(text)
+    lines = pac.binary_join_element_wise(*fields, literal(','))
+    lines = pac.binary_join_element_wise(lines, literal('\n'), literal(''))
+    offsets = np.frombuffer(lines.buffers()[1], dtype=np.int64)[lines.offset:lines.offset+len(lines)+1]
+    return memoryview(lines.buffers()[2])[offsets[0]:offsets[-1]]
+
+def write_csv(df, path, chunksize=1<<18, max_workers=None):
+
+    """
+    df.to_csv(path) with rows formatted by Arrow compute kernels in a thread
+    pool (the kernels release the GIL). Output is byte-identical to pandas;
+    frames with float, boolean or mixed-type columns go through pandas.
+    """
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        df.to_csv(path)
+        return
+    header = io.StringIO()
+    csv.writer(header, lineterminator='\n').writerow([ '' if df.index.name is None else df.index.name ] + list(df.columns))
+    chunks = [ df.iloc[i:i+chunksize] for i in range(0, len(df), chunksize) ]
+    try:
+        with open(path, 'wb') as f, ThreadPoolExecutor(max_workers=max_workers) as pool:
+            f.write(header.getvalue().encode('utf-8'))
+            for lines in pool.map(_csv_lines, chunks):
+                f.write(lines)
+    except (TypeError, pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        df.to_csv(path)
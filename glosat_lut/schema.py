@@ -0,0 +1,92 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/schema.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Compact LUT schema.
+
+compact_lut() stores the low-cardinality text columns as categoricals,
+source_lut as int8 and the numeric columns as the narrowest nullable integer
+type that holds them (Int16 for x10 lat/lon, elevation and years), with the
+-999 / -9999 missing-value sentinels replaced by <NA>. Text sentinels ('-999'
+in station_code, iso-3166, continent, ...) are kept, so comparisons such as
+lut['station_code'] == '-999' behave as before.
+
+as_float() gives a float array (NaN for <NA>) from either schema for the
+numeric code in glosat_lut that works on NumPy arrays.
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+CATEGORY_COLUMNS = ['station_country', 'iso-3166', 'continent', 'source_code2']
+
+# numeric column: missing-value sentinels replaced by <NA>
+
+NULLABLE_COLUMNS = {
+    'station_lat': [-999, -9999],
+    'station_lon': [-999, -9999],
+    'station_elevation': [-999, -9999],
+    'station_firstyear': [-9999],
+    'station_lastyear': [-9999],
+    'Nyr': [],
+    }
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def _nullable_int(values):
+
+    # narrowest nullable integer dtype holding the non-missing values
+
+    lo = values.min(skipna=True)
+    hi = values.max(skipna=True)
+    if pd.isna(lo):
+        return 'Int16'
+    for dtype in ['Int8', 'Int16', 'Int32']:
+        info = np.iinfo(dtype.lower())
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return 'Int64'
+
+def compact_lut(lut):
+
+    """
+    Return lut with the compact schema (see module docstring). Columns not
+    present are skipped, so per-source and merged LUTs can both be compacted.
+    """
+
+    lut = lut.copy()
+    for column, sentinels in NULLABLE_COLUMNS.items():
+        if column not in lut.columns:
+            continue
+        values = pd.to_numeric(lut[column]).astype('Int64')
+        values = values.mask(values.isin(sentinels))
+        lut[column] = values.astype(_nullable_int(values))
+    for column in CATEGORY_COLUMNS:
+        if column in lut.columns:
+            lut[column] = lut[column].astype('category')
+    if 'source_lut' in lut.columns:
+        lut['source_lut'] = lut['source_lut'].astype(np.int8)
+    return lut
+
+def as_float(values):
+
+    """
+    Float array of a numeric column in either schema (<NA> --> NaN).
+    """
+
+    return pd.to_numeric(pd.Series(values)).astype(float).to_numpy()
@@ -0,0 +1,242 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/snapshots.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Transparent snapshot cache for spreadsheet inventories.
+
+read_excel_cached() parses an .xlsx inventory with pd.read_excel once and
+stores the frame as a typed Parquet snapshot (or an uncompressed pickle when
+the frame does not round-trip through Parquet, e.g. mixed int/str ID columns).
+Each snapshot has a JSON record holding the source path, read options, size,
+mtime and SHA-256 content hash. Later reads are served from the snapshot when
+size and mtime are unchanged, or when the content hash still matches after a
+touch. Stale snapshots are dropped with:
+
+    $ python -m glosat_lut.snapshots list
+    $ python -m glosat_lut.snapshots invalidate DATA/processed_monthly_temp_africa.xlsx
+    $ python -m glosat_lut.snapshots evict-stale
+    $ python -m glosat_lut.snapshots clear
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# I/O libraries:
+import os, glob, json, hashlib, argparse
+
+#-----------------------------------------------------------------------------
+# SETTINGS
+#-----------------------------------------------------------------------------
+
+snapshot_dir = 'DATA/.snapshots/'
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def file_sha256(path, chunksize=1<<20):
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunksize), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _snapshot_key(path, options):
+
+    # one snapshot per (source file, read options) so that e.g. two sheets of
+    # the same workbook are cached independently
+
+    key = json.dumps([os.path.abspath(path), options], sort_keys=True, default=str)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def _record_file(key, snapshot_dir):
+
+    return os.path.join(snapshot_dir, key + '.json')
+
+def _load_record(key, snapshot_dir):
+
+    record_file = _record_file(key, snapshot_dir)
+    if not os.path.exists(record_file):
+        return None
+    with open(record_file) as f:
+        record = json.load(f)
+    if not os.path.exists(os.path.join(snapshot_dir, record['snapshot'])):
+        return None
+    return record
+
+def _save_record(record, snapshot_dir):
+
+    # write-then-rename so that concurrent loaders never see a partial record
+
+    record_file = _record_file(record['key'], snapshot_dir)
+    with open(record_file + '.tmp', 'w') as f:
+        json.dump(record, f, indent=1, sort_keys=True)
+    os.replace(record_file + '.tmp', record_file)
+
+def _read_parquet(path):
+
+    # Arrow returns missing object-column values as None where pd.read_excel
+    # gives NaN: restore NaN (frames holding real None values are pickled)
+
+    df = pd.read_parquet(path)
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), np.nan)
+    return df
+
+def _read_snapshot(record, snapshot_dir):
+
+    snapshot = os.path.join(snapshot_dir, record['snapshot'])
+    if record['format'] == 'parquet':
+        return _read_parquet(snapshot)
+    return pd.read_pickle(snapshot)
+
+def _identical(df, other):
+
+    # DataFrame.equals() treats None and NaN as equal; the LUT builders str()
+    # object columns, so the element types of object columns must match too
+
+    if not df.equals(other) or list(df.columns) != list(other.columns):
+        return False
+    for column in df.columns:
+        if df[column].dtype == object and not df[column].map(type).equals(other[column].map(type)):
+            return False
+    return True
+
+def _write_snapshot(df, key, snapshot_dir):
+
+    # prefer typed Parquet, but only if the frame round-trips exactly
+
+    parquet = os.path.join(snapshot_dir, key + '.parquet')
+    try:
+        df.to_parquet(parquet)
+        if _identical(df, _read_parquet(parquet)):
+            return key + '.parquet', 'parquet'
+    except Exception:
+        # no Parquet engine installed, or object columns Arrow cannot type
+        pass
+    if os.path.exists(parquet):
+        os.remove(parquet)
+    df.to_pickle(os.path.join(snapshot_dir, key + '.pkl'), compression=None)
+    return key + '.pkl', 'pickle'
+
+def read_excel_cached(path, snapshot_dir=snapshot_dir, **kwargs):
+
+    """
+    pd.read_excel(path, **kwargs) served from a snapshot keyed by path, read
+    options, size, mtime and content hash.
+    """
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    key = _snapshot_key(path, kwargs)
+    stat = os.stat(path)
+    record = _load_record(key, snapshot_dir)
+    if record is not None and record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+        return _read_snapshot(record, snapshot_dir)
+    sha256 = file_sha256(path)
+    if record is not None and record['sha256'] == sha256:
+        record['size'] = stat.st_size
+        record['mtime_ns'] = stat.st_mtime_ns
+        _save_record(record, snapshot_dir)
+        return _read_snapshot(record, snapshot_dir)
+    if record is not None:
+        _remove_snapshot(record, snapshot_dir)
+    with open(path, 'rb') as f:
+        df = pd.read_excel(f, **kwargs)
+    snapshot, fmt = _write_snapshot(df, key, snapshot_dir)
+    _save_record({
+        'key': key,
+        'path': os.path.abspath(path),
+        'options': kwargs,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256,
+        'snapshot': snapshot,
+        'format': fmt,
+        }, snapshot_dir)
+    return df
+
+def list_snapshots(snapshot_dir=snapshot_dir):
+
+    records = []
+    for record_file in sorted(glob.glob(os.path.join(snapshot_dir, '*.json'))):
+        with open(record_file) as f:
+            records.append(json.load(f))
+    return records
+
+def is_stale(record):
+
+    # missing or modified source file (size/mtime changed and content differs)
+
+    if not os.path.exists(record['path']):
+        return True
+    stat = os.stat(record['path'])
+    if record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+        return False
+    return file_sha256(record['path']) != record['sha256']
+
+def _remove_snapshot(record, snapshot_dir):
+
+    for name in [ record['snapshot'], record['key'] + '.json' ]:
+        if os.path.exists(os.path.join(snapshot_dir, name)):
+            os.remove(os.path.join(snapshot_dir, name))
+
+def invalidate(paths=None, stale_only=False, snapshot_dir=snapshot_dir):
+
+    """
+    Drop snapshots of the given source paths (all snapshots if paths is None),
+    or only those whose source file has changed or gone if stale_only=True.
+    Returns the list of dropped records.
+    """
+
+    targets = None if paths is None else set(os.path.abspath(p) for p in paths)
+    dropped = []
+    for record in list_snapshots(snapshot_dir):
+        if targets is not None and record['path'] not in targets:
+            continue
+        if stale_only and not is_stale(record):
+            continue
+        _remove_snapshot(record, snapshot_dir)
+        dropped.append(record)
+    return dropped
+
+#-----------------------------------------------------------------------------
+# MAIN:
+#-----------------------------------------------------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m glosat_lut.snapshots', description='Manage spreadsheet inventory snapshots')
+    parser.add_argument('--snapshot-dir', default=snapshot_dir)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='list snapshots and whether their source is stale')
+    invalidate_parser = commands.add_parser('invalidate', help='drop snapshots of the given source files')
+    invalidate_parser.add_argument('paths', nargs='+')
+    commands.add_parser('evict-stale', help='drop snapshots whose source file has changed or gone')
+    commands.add_parser('clear', help='drop all snapshots')
+    args = parser.parse_args(argv)
+
+    if args.command == 'list':
+        for record in list_snapshots(args.snapshot_dir):
+            print(('STALE ' if is_stale(record) else 'OK    ') + record['format'].ljust(8) + record['path'] + ' ' + json.dumps(record['options']))
+        return
+    elif args.command == 'invalidate':
+        dropped = invalidate(args.paths, snapshot_dir=args.snapshot_dir)
+    elif args.command == 'evict-stale':
+        dropped = invalidate(stale_only=True, snapshot_dir=args.snapshot_dir)
+    else:
+        dropped = invalidate(snapshot_dir=args.snapshot_dir)
+    for record in dropped:
+        print('dropped ' + record['path'] + ' ' + json.dumps(record['options']))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/star.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Star-schema split of the long GloSAT archives (df_temp, df_anom, df_normals).
+
+The nine station metadata columns repeated on every station-year row are
+moved to a station dimension table with one row per distinct (stationcode,
+metadata) record and an int32 station_id. The fact table keeps only
+station_id, year and the value columns, in the original row order:
+
+    DATA/df_temp_star/stations.parquet     station_id, stationcode, stationlat, ...
+    DATA/df_temp_star/facts.parquet        station_id, year, 1, ..., 12
+
+StarArchive loads the (small) station table and joins fact rows back on
+demand: rejoin() restores the long frame, in its original column and row
+order, for all stations or only selected stationcodes / years (fact row groups
+are skipped by their station_id and year statistics). star.json records the
+size, mtime and SHA-256 hash of the pickle the split was made from, and
+star_is_current() warns when the pickle has changed since:
+
+    $ python -m glosat_lut.star split DATA/df_temp.pkl DATA/df_temp_star/
+    $ python -m glosat_lut.star info DATA/df_temp_star/
+"""
+
+# Dataframe libraries:
+import numpy as np
+import pandas as pd
+
+# GloSAT LUT libraries:
+from glosat_lut.archive import read_archive, source_record, sibling_is_current, METADATA_COLUMNS, archive_row_group_size, archive_compression
+
+# I/O libraries:
+import os, json, argparse
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def split_archive(df, metadata_columns=METADATA_COLUMNS):
+
+    """
+    Return (stations, facts) for a long archive frame. Metadata columns not
+    present in df are skipped; a station whose metadata changes between rows
+    gets one station_id per distinct record.
+    """
+
+    df = df.reset_index(drop=True)
+    dimension = ['stationcode'] + [ column for column in metadata_columns if column in df.columns ]
+
+    # factorize the metadata record (NaN-safe: every column as its own codes)
+
+    codes = [ pd.factorize(df[column], use_na_sentinel=False)[0] for column in dimension ]
+    station_id, first = _record_ids(codes)
+    stations = df[dimension].iloc[first].reset_index(drop=True)
+    stations.insert(0, 'station_id', np.arange(len(stations), dtype=np.int32))
+    facts = df.drop(columns=dimension)
+    facts.insert(0, 'station_id', station_id.astype(np.int32))
+    return stations, facts
+
+def _record_ids(codes):
+
+    # ids numbered in order of first appearance and the first row of each
+
+    keys = pd.MultiIndex.from_arrays(codes) if len(codes) > 1 else pd.Index(codes[0])
+    station_id, _ = pd.factorize(keys)
+    first = np.unique(station_id, return_index=True)[1]
+    return station_id, first
+
+def _read_parquet(path, columns=None, filters=None):
+
+    # missing object-column values come back from Arrow as None: restore NaN
+
+    df = pd.read_parquet(path, columns=columns, filters=filters)
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), np.nan)
+    return df
+
+def write_star(df, star_dir, row_group_size=archive_row_group_size, compression=archive_compression, source=None):
+
+    """
+    Split a long archive frame and write it to star_dir (see module docstring);
+    source is the .pkl archive it was read from.
+    """
+
+    stations, facts = split_archive(df)
+    os.makedirs(star_dir, exist_ok=True)
+    stations.to_parquet(os.path.join(star_dir, 'stations.parquet'), index=False, compression=compression)
+    facts.to_parquet(os.path.join(star_dir, 'facts.parquet'), index=False, compression=compression, row_group_size=row_group_size)
+    with open(os.path.join(star_dir, 'star.json'), 'w') as f:
+        json.dump({'columns': list(df.columns), 'n_stations': len(stations), 'n_facts': len(facts),
+            'source': None if source is None else source_record(source)}, f, indent=1)
+    return stations, facts
+
+def star_is_current(star_dir, pkl_file):
+
+    """
+    True if star_dir exists and still matches the pickle it was split from
+    (warns and returns False if pkl_file has changed since).
+    """
+
+    if not os.path.exists(os.path.join(star_dir, 'star.json')):
+        return False
+    with open(os.path.join(star_dir, 'star.json')) as f:
+        meta = json.load(f)
+    return sibling_is_current(star_dir, meta.get('source'), pkl_file)
+
+class StarArchive:
+
+    """
+    Station dimension table (loaded) and fact table (read on demand) of a
+    star_dir written by write_star().
+    """
+
+    def __init__(self, star_dir):
+
+        self.star_dir = star_dir
+        with open(os.path.join(star_dir, 'star.json')) as f:
+            self.meta = json.load(f)
+        self.columns = self.meta['columns']
+        self.stations = _read_parquet(os.path.join(star_dir, 'stations.parquet'))
+
+    def station_ids(self, stationcodes):
+
+        return self.stations['station_id'][self.stations['stationcode'].isin(list(stationcodes))].tolist()
+
+    def facts(self, columns=None, stationcodes=None, years=None):
+
+        """
+        Fact rows (station_id, year and value columns), optionally only some
+        columns, stationcodes and a (first, last) year range.
+        """
+
+        filters = []
+        if stationcodes is not None:
+            filters.append(('station_id', 'in', self.station_ids(stationcodes)))
+        if years is not None:
+            first, last = years
+            if first is not None:
+                filters.append(('year', '>=', int(first)))
+            if last is not None:
+                filters.append(('year', '<=', int(last)))
+        if columns is not None:
+            columns = ['station_id'] + [ column for column in columns if column != 'station_id' ]
+        return _read_parquet(os.path.join(self.star_dir, 'facts.parquet'), columns=columns, filters=filters or None)
+
+    def rejoin(self, columns=None, stationcodes=None, years=None):
+
+        """
+        The long archive frame (original column and row order), optionally
+        only some columns, stationcodes and a (first, last) year range.
+        """
+
+        columns = self.columns if columns is None else list(columns)
+        dimension = [ column for column in self.stations.columns if column != 'station_id' ]
+        facts = self.facts([ column for column in columns if column not in dimension ], stationcodes, years)
+
+        # station_id is the row position in the station table
+
+        stations = self.stations.take(facts['station_id'].to_numpy()).reset_index(drop=True)
+        df = pd.concat([facts.drop(columns='station_id').reset_index(drop=True), stations[[ column for column in dimension if column in columns ]]], axis=1)
+        return df[columns]
+
+def read_star(star_dir, columns=None, stationcodes=None, years=None):
+
+    return StarArchive(star_dir).rejoin(columns, stationcodes, years)
+
+#-----------------------------------------------------------------------------
+# MAIN:
+#-----------------------------------------------------------------------------
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(prog='python -m glosat_lut.star', description='Star-schema GloSAT archives')
+    commands = parser.add_subparsers(dest='command', required=True)
+    split_parser = commands.add_parser('split', help='split a long archive into station and fact tables')
+    split_parser.add_argument('archive')
+    split_parser.add_argument('star_dir')
+    commands.add_parser('info', help='table sizes of a star archive').add_argument('star_dir')
+    args = parser.parse_args(argv)
+
+    if args.command == 'split':
+        df = read_archive(args.archive)
+        stations, facts = write_star(df, args.star_dir, source=args.archive if args.archive.endswith('.pkl') else None)
+        print(args.archive, '-->', args.star_dir, 'long table {:.1f} MB --> stations {:.2f} MB + facts {:.1f} MB'.format(
+            df.memory_usage(deep=True).sum()/1e6, stations.memory_usage(deep=True).sum()/1e6, facts.memory_usage(deep=True).sum()/1e6))
+    else:
+        archive = StarArchive(args.star_dir)
+        sizes = { name: os.path.getsize(os.path.join(args.star_dir, name)) for name in ['stations.parquet', 'facts.parquet'] }
+        print('stations:', archive.meta['n_stations'], 'facts:', archive.meta['n_facts'], ' '.join([ name + ' {:.1f} MB'.format(size/1e6) for name, size in sizes.items() ]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+#-----------------------------------------------------------------------
+# MODULE: glosat_lut/stationids.py
+#-----------------------------------------------------------------------
+# Version 0.1
+# 18 October, 2026
+# Dr Michael Taylor
+# https://patternizer.github.io
+# patternizer AT gmail DOT com
+# michael DOT a DOT taylor AT uea DOT ac DOT uk
+#-----------------------------------------------------------------------
+
+"""
+Rule-table normalization of source station IDs to CRU station codes.
+
+Each rule is a tuple ( match, keep, prefix, suffix ):
+
+    match  = ('startswith', literal) | ('endswith', literal) | ('length', n) | ('slice', start, stop, literal)
+             | ('window', n, literal): the last n characters (the whole ID if
+             shorter) start with literal, i.e. ident[-n:].startswith(literal)
+    keep   = (start, stop) Python slice of the source ID kept in the CRU code
+    prefix = literal prepended to the kept slice
+    suffix = literal appended to the kept slice
+
+Rules are tried in table order and the first match wins. Adding a new national
+prefix is a one-line table entry, e.g.:
+
+    ( ('startswith', '1030000'), (-4, None), '6', '0' ),
+
+Tables are compiled once into grouped slice comparisons over a NumPy byte matrix
+so that whole arrays of IDs resolve in a single vectorized pass. Lengths and
+slices are taken in characters, as on the str IDs: the (rare) non-ASCII IDs,
+whose UTF-8 bytes would not line up with their characters, are matched and
+sliced per ID as Python strings.
+"""
+
+# Dataframe libraries:
+import numpy as np
+from functools import lru_cache
+
+#-----------------------------------------------------------------------------
+# RULE TABLES
+#-----------------------------------------------------------------------------
+
+# LUT2: processed_monthly_temp_africa.xlsx secondary_id --> cru_code
+
+SECONDARY_ID_RULES = (
+    # match                          keep          prefix  suffix
+    ( ('endswith', '99999'),         (None, -5),   '',     ''  ),
+    ( ('length', 9),                 (-5, None),   '',     '0' ),
+    ( ('length', 7),                 (0, 5),       '',     '0' ),
+    ( ('length', 5),                 (-5, None),   '',     '0' ),
+    ( ('startswith', 'WMO'),         (3, 8),       '',     '0' ),
+    ( ('startswith', 'AFWA'),        (4, 10),      '',     ''  ),
+    ( ('startswith', '000RR'),       (-6, None),   '',     ''  ),
+    ( ('startswith', 'EGY00'),       (-5, None),   '',     '0' ),
+    ( ('startswith', '1030000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1050000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1090000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1100000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1120000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1130000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1180000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1280000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1310000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1330000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1370000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '1510000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', 'MXN0000'),     (-4, None),   '6',    '0' ),
+    ( ('startswith', '117000'),      (-5, None),   '',     '0' ),
+    ( ('startswith', '141000'),      (-5, None),   '',     '0' ),
+    ( ('startswith', '651000'),      (-5, None),   '',     '0' ),
+    )
+
+# C3S CDM-lite PSV: primary_station_id (e.g. AG000060590) --> station_code
+
+PRIMARY_STATION_ID_RULES = (
+    # match                          keep          prefix  suffix
+    ( ('window', 6, '06'),           (-5, None),   '',     '0' ),
+    ( ('window', 6, '00'),           (-4, None),   '6',    '0' ),
+    )
+
+#-----------------------------------------------------------------------------
+# METHODS:
+#-----------------------------------------------------------------------------
+
+def _slice_bounds(lengths, start, stop):
+
+    # Python slice semantics evaluated per row for strings of varying length
+
+    def bound(index, default):
+        if index is None:
+            return default
+        elif index < 0:
+            return np.maximum(lengths + index, 0)
+        else:
+            return np.minimum(index, lengths)
+
+    first = bound(start, np.zeros_like(lengths))
+    last = bound(stop, lengths)
+    return first, np.maximum(last, first)
+
+def _substrings(matrix, lengths, start, stop):
+
+    # Slice every row of an (N, W) uint8 byte matrix and return an S-dtype array
+
+    if (start is not None and start >= 0) and (stop is not None and stop >= 0):
+        # fixed columns: bytes past the end of shorter IDs are already NUL
+        out = matrix[:, start:stop]
+        width = out.shape[1]
+    else:
+        first, last = _slice_bounds(lengths, start, stop)
+        width = int((last - first).max(initial=0))
+        if width > 0:
+            cols = first[:, None] + np.arange(width)
+            out = np.take_along_axis(matrix, np.minimum(cols, matrix.shape[1] - 1), axis=1)
+            out[cols >= last[:, None]] = 0
+    if width == 0:
+        return np.zeros(len(matrix), dtype='S1')
+    return np.ascontiguousarray(out).view('S%d' % width).ravel()
+
+def _windows(matrix, lengths, n, width):
+
+    # first `width` bytes of the last n bytes of every row (S-dtype array)
+
+    cols = np.maximum(lengths - n, 0)[:, None] + np.arange(width)
+    out = np.take_along_axis(matrix, np.minimum(cols, matrix.shape[1] - 1), axis=1)
+    out[cols >= lengths[:, None]] = 0
+    return np.ascontiguousarray(out).view('S%d' % width).ravel()
+
+def _byte_matrix(ids):
+
+    # str() every ID exactly as the per-row scripts did and view it as bytes
+
+    ids = np.asarray(ids)
+    if ids.dtype.kind in 'iu':
+        encoded = ids.astype('S')
+    else:
+        ids = ids.astype(object)
+        try:
+            encoded = ids.astype('S')
+        except UnicodeEncodeError:
+            encoded = np.char.encode(ids.astype(str), 'utf-8')
+    if len(encoded) == 0:
+        encoded = encoded.astype('S1')
+    width = encoded.dtype.itemsize
+    matrix = np.ascontiguousarray(encoded).view(np.uint8).reshape(len(encoded), width)
+    lengths = (matrix != 0).sum(axis=1)
+    return encoded, matrix, lengths
+
+def _non_ascii_rows(matrix):
+
+    # rows whose UTF-8 bytes are not one byte per character
+
+    return np.flatnonzero((matrix >= 0x80).any(axis=1))
+
+class StationIdRules:
+
+    """
+    Compiled station ID rule table. Matchers sharing the same source slice are
+    grouped so that each distinct slice is extracted once per resolve() call.
+    """
+
+    def __init__(self, rules):
+
+        self.rules = tuple(rules)
+        self.matchers = []
+        for match, keep, prefix, suffix in self.rules:
+            kind = match[0]
+            if kind == 'length':
+                self.matchers.append( ('length', None, int(match[1])) )
+            elif kind == 'startswith':
+                self.matchers.append( ('slice', (0, len(match[1])), match[1].encode()) )
+            elif kind == 'endswith':
+                self.matchers.append( ('slice', (-len(match[1]), None), match[1].encode()) )
+            elif kind == 'slice':
+                self.matchers.append( ('slice', (match[1], match[2]), match[3].encode()) )
+            elif kind == 'window':
+                self.matchers.append( ('window', (int(match[1]), len(match[2])), match[2].encode()) )
+            else:
+                raise ValueError('unknown station ID rule: ' + str(match))
+        self.slices = sorted(set(m[1] for m in self.matchers if m[0] == 'slice'), key=str)
+        self.windows = sorted(set(m[1] for m in self.matchers if m[0] == 'window'))
+
+    def match(self, ids):
+
+        """
+        Return the encoded IDs, their byte matrix and lengths, and the index of
+        the first matching rule for each ID (-1 if no rule applies).
+        """
+
+        encoded, matrix, lengths = _byte_matrix(ids)
+        sliced = { key: _substrings(matrix, lengths, *key) for key in self.slices }
+        windowed = { key: _windows(matrix, lengths, *key) for key in self.windows }
+        rule_index = np.full(len(encoded), -1, dtype=np.int32)
+        for k, (kind, key, value) in enumerate(self.matchers):
+            if kind == 'length':
+                hit = lengths == value
+            elif kind == 'window':
+                hit = windowed[key] == value
+            else:
+                hit = sliced[key] == value
+            rule_index[hit & (rule_index < 0)] = k
+        for row in _non_ascii_rows(matrix):
+            rule_index[row] = self.match_id(encoded[row].decode('utf-8'))
+        return encoded, matrix, lengths, rule_index
+
+    def match_id(self, ident):
+
+        """
+        Index of the first rule matching one str ID (-1 if none).
+        """
+
+        for k, (match, keep, prefix, suffix) in enumerate(self.rules):
+            kind = match[0]
+            if kind == 'length':
+                hit = len(ident) == int(match[1])
+            elif kind == 'startswith':
+                hit = ident.startswith(match[1])
+            elif kind == 'endswith':
+                hit = ident.endswith(match[1])
+            elif kind == 'window':
+                hit = ident[-match[1]:].startswith(match[2])
+            else:
+                hit = ident[match[1]:match[2]] == match[3]
+            if hit:
+                return k
+        return -1
+
+    def resolve(self, ids, missing='-999'):
+
+        """
+        Resolve an array of source IDs to CRU codes. Unmatched IDs are set to
+        `missing`, or passed through unchanged when missing=None.
+        """
+
+        # ASCII rows: S --> U casts and object-array concatenation (no
+        # per-element np.char calls); non-ASCII rows one by one as str
+
+        encoded, matrix, lengths, rule_index = self.match(ids)
+        codes = np.full(len(encoded), missing, dtype=object)
+        non_ascii = _non_ascii_rows(matrix)
+        ascii_index = rule_index.copy()
+        ascii_index[non_ascii] = len(self.rules)
+        if missing is None:
+            rows = np.flatnonzero(ascii_index < 0)
+            codes[rows] = encoded[rows].astype('U').astype(object)
+        for k, (match, keep, prefix, suffix) in enumerate(self.rules):
+            rows = np.flatnonzero(ascii_index == k)
+            if len(rows) == 0:
+                continue
+            code = _substrings(matrix[rows], lengths[rows], *keep).astype('U').astype(object)
+            if prefix:
+                code = prefix + code
+            if suffix:
+                code = code + suffix
+            codes[rows] = code
+        for row in non_ascii:
+            k = rule_index[row]
+            ident = encoded[row].decode('utf-8')
+            if k >= 0:
+                match, keep, prefix, suffix = self.rules[k]
+                codes[row] = prefix + ident[slice(*keep)] + suffix
+            elif missing is None:
+                codes[row] = ident
+        return codes
+
+@lru_cache(maxsize=None)
+def compile_rules(rules):
+
+    return StationIdRules(rules)
+
+def resolve_station_codes(ids, rules=SECONDARY_ID_RULES, missing='-999'):
+
+    """
+    Resolve an array (list, ndarray or pd.Series) of source station IDs to CRU
+    station codes using a rule table (see module docstring).
+    """
+
+    return compile_rules(tuple(rules)).resolve(ids, missing=missing)
@@ -21,9 +21,6 @@ import difflib
 # I/O libraries:
 import os, glob
 
-# ISO-3166 libraries:
-import pycountry
-
 #-----------------------------------------------------------------------------
 # SETTINGS
 #-----------------------------------------------------------------------------
@@ -17,41 +17,21 @@
 #------------------------------------------------------------------------------
 # Dataframe libraries:
 import numpy as np
-import numpy.ma as ma
-from scipy.interpolate import griddata
-from scipy import spatial
-import itertools
 import pandas as pd
-import xarray as xr
 #import klib
 import pickle
 from datetime import datetime
-import nc_time_axis
-import cftime
-# Plotting libraries:
-import matplotlib
-import matplotlib.pyplot as plt; plt.close('all')
-import matplotlib.cm as cm
-from matplotlib import colors as mcol
-from matplotlib.cm import ScalarMappable
-from pandas.plotting import register_matplotlib_converters
-register_matplotlib_converters()
-import matplotlib.dates as mdates
-import matplotlib.colors as mcolors
-import matplotlib.ticker as mticker
-from matplotlib.collections import PolyCollection
-from mpl_toolkits import mplot3d
-from mpl_toolkits.mplot3d import Axes3D
-from mpl_toolkits.mplot3d import proj3d
-import cmocean
-# Mapping libraries:
-import cartopy
-import cartopy.crs as ccrs
-from cartopy.io import shapereader
-import cartopy.feature as cf
-from cartopy.util import add_cyclic_point
-from cartopy.mpl.ticker import LongitudeFormatter, LatitudeFormatter
-from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
+
+# GloSAT LUT libraries:
+from glosat_lut.lazy import lazy_import
+from glosat_lut.archive import read_archive, read_station_metadata
+
+# Plotting libraries (imported on first use):
+plt = lazy_import('matplotlib.pyplot')
+mticker = lazy_import('matplotlib.ticker')
+# Mapping libraries (imported on first use):
+ccrs = lazy_import('cartopy.crs')
+gridliner = lazy_import('cartopy.mpl.gridliner')
 
 #import pyproj
 #import shapely
@@ -62,8 +42,6 @@ import os
 import os.path
 from pathlib import Path
 import sys
-import subprocess
-from subprocess import Popen
 import time
 
 # Silence library version notifications
@@ -99,7 +77,7 @@ glosat_version = 'GloSAT.p04'
 
 print('loading temperatures ...')
 
-df_temp = pd.read_pickle('DATA/df_temp.pkl', compression='bz2')    
+df_temp = read_station_metadata('DATA/df_temp.pkl')    # station metadata only
     
 #------------------------------------------------------------------------------
 # LOAD: Normals, SDs and FRYs
@@ -107,7 +85,7 @@ df_temp = pd.read_pickle('DATA/df_temp.pkl', compression='bz2')
 
 print('loading normals ...')
 
-df_normals = pd.read_pickle('DATA/df_normals.pkl', compression='bz2')    
+df_normals = read_archive('DATA/df_normals.pkl', columns=['stationcode','sourcecode'])    
             
 #------------------------------------------------------------------------------
 # LOAD: anomalies (1961-1990 baseline)
@@ -115,7 +93,7 @@ df_normals = pd.read_pickle('DATA/df_normals.pkl', compression='bz2')
 
 print('loading anomalies ...')
 
-df_anom = pd.read_pickle('DATA/df_anom.pkl', compression='bz2')    
+df_anom = read_archive('DATA/df_anom.pkl')    # all columns: ds_glosat.dropna() below drops rows with a NaN in any of them
 
 #------------------------------------------------------------------------------
 # LOAD: Copernicus stations
@@ -153,7 +131,7 @@ print('extracting_difference_list ...')
 decimalplaces = 1  
     
 df_anom_in = df_anom.copy()
-df_normals = pd.read_pickle('DATA/df_normals.pkl', compression='bz2')
+df_normals = read_archive('DATA/df_normals.pkl', columns=['stationcode','sourcecode'])
 ds_all = df_anom_in[df_anom_in['stationcode'].isin(df_normals[df_normals['sourcecode']>1]['stationcode'])]
 ds_glosat = ds_all[(ds_all['stationfirstyear']<=end_year)&(ds_all['stationlastyear']>=start_year)]
 ds_glosat_lon = ds_glosat.dropna().groupby('stationcode').mean()['stationlon'].apply(lambda x: round(x, decimalplaces))
@@ -237,8 +215,8 @@ if plot_station_months_map_copernicus == True:
         gl.ylines = True
         gl.xlocator = mticker.FixedLocator([-180,-120,-60,0,60,120,180])
         gl.ylocator = mticker.FixedLocator([-90,-60,-30,0,30,60,90])
-        gl.xformatter = LONGITUDE_FORMATTER
-        gl.yformatter = LATITUDE_FORMATTER
+        gl.xformatter = gridliner.LONGITUDE_FORMATTER
+        gl.yformatter = gridliner.LATITUDE_FORMATTER
         gl.xlabel_style = {'size': fontsize}
         gl.ylabel_style = {'size': fontsize}              
 #    ax.add_feature(cartopy.feature.OCEAN, zorder=100, alpha=0.2, edgecolor='k')
@@ -264,7 +242,7 @@ if plot_station_months_map_glosat == True:
     print('plot_station_months_map_glosat ...')
     
     df_anom_in = df_anom.copy()
-    df_normals = pd.read_pickle('DATA/df_normals.pkl', compression='bz2')
+    df_normals = read_archive('DATA/df_normals.pkl', columns=['stationcode','sourcecode'])
     ds_all = df_anom_in[df_anom_in['stationcode'].isin(df_normals[df_normals['sourcecode']>1]['stationcode'])]
     ds = ds_all[(ds_all['stationfirstyear']<=end_year)&(ds_all['stationlastyear']>=start_year)]
     lon = ds.groupby('stationcode').mean()['stationlon']
@@ -321,8 +299,8 @@ if plot_station_months_map_glosat == True:
         gl.ylines = True
         gl.xlocator = mticker.FixedLocator([-180,-120,-60,0,60,120,180])
         gl.ylocator = mticker.FixedLocator([-90,-60,-30,0,30,60,90])
-        gl.xformatter = LONGITUDE_FORMATTER
-        gl.yformatter = LATITUDE_FORMATTER
+        gl.xformatter = gridliner.LONGITUDE_FORMATTER
+        gl.yformatter = gridliner.LATITUDE_FORMATTER
         gl.xlabel_style = {'size': fontsize}
         gl.ylabel_style = {'size': fontsize}              
 #    ax.add_feature(cartopy.feature.OCEAN, zorder=100, alpha=0.2, edgecolor='k')
@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from glosat_lut.archive import convert_archive, read_archive, read_station_metadata, resolve_archive
+from glosat_lut.snapshots import _identical
+
+
+def archive_frame():
+
+    return pd.DataFrame({
+        'year': [1900, 1901, 1900],
+        **{ str(month): [1.5, np.nan, 2.0] for month in range(1, 13) },
+        'stationcode': ['619670', '619670', '037401'],
+        'stationlat': [-7.3, -7.3, 52.5],
+        'stationlon': [72.4, 72.4, -1.7],
+        'stationelevation': [100.0, 100.0, np.nan],
+        'stationname': ['DIEGO GARCIA', 'DIEGO GARCIA', np.nan],
+        'stationcountry': ['UK', 'UK', 'UK'],
+        'stationfirstyear': [1900.0, 1900.0, 1659.0],
+        'stationlastyear': [2019.0, 2019.0, 2019.0],
+        'stationsource': [35.0, 35.0, 17.0],
+        'stationfirstreliable': [np.nan, np.nan, 1900.0],
+        })
+
+
+def test_parquet_reads_back_pickled_dtypes(tmp_path):
+
+    pkl_file = str(tmp_path / 'df_temp.pkl')
+    df = archive_frame()
+    df.to_pickle(pkl_file, compression='bz2')
+    convert_archive(pkl_file)
+    assert resolve_archive(pkl_file).endswith('.parquet')
+
+    station = read_archive(pkl_file, stationcodes=['619670'])
+    assert _identical(station, df.iloc[:2])
+    assert [ str(value) for value in station.iloc[0, 14:23] ] == ['-7.3', '72.4', '100.0', 'DIEGO GARCIA', 'UK', '1900.0', '2019.0', '35.0', 'nan']
+    assert read_station_metadata(pkl_file)['stationcode'].tolist() == ['037401', '619670']
+
+
+def test_stale_parquet_falls_back_to_pickle(tmp_path):
+
+    pkl_file = str(tmp_path / 'df_temp.pkl')
+    df = archive_frame()
+    df.to_pickle(pkl_file, compression='bz2')
+    convert_archive(pkl_file)
+    df.iloc[:2].to_pickle(pkl_file, compression='bz2')
+
+    with pytest.warns(UserWarning, match='reading the pickle'):
+        assert resolve_archive(pkl_file) == pkl_file
+    with pytest.warns(UserWarning):
+        assert len(read_archive(pkl_file)) == 2
+
+
+def test_touched_pickle_keeps_parquet(tmp_path):
+
+    pkl_file = str(tmp_path / 'df_temp.pkl')
+    archive_frame().to_pickle(pkl_file, compression='bz2')
+    convert_archive(pkl_file)
+    stat = os.stat(pkl_file)
+    os.utime(pkl_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert resolve_archive(pkl_file).endswith('.parquet')
+
+
+def test_stale_arrow_falls_back_to_pickle(tmp_path):
+
+    from glosat_lut.archive import encode_archive
+
+    pkl_file = str(tmp_path / 'df_temp.pkl')
+    df = archive_frame()
+    df.to_pickle(pkl_file, compression='bz2')
+    encode_archive(pkl_file)
+    assert resolve_archive(pkl_file).endswith('.arrow')
+    assert _identical(read_archive(pkl_file), df)
+
+    df.iloc[:2].to_pickle(pkl_file, compression='bz2')
+    with pytest.warns(UserWarning, match='reading the pickle'):
+        assert len(read_archive(pkl_file)) == 2
@@ -0,0 +1,76 @@
+import numpy as np
+
+from glosat_lut.c3s_raw import parse_raw_file, join_raw_files
+from glosat_lut.crutem import write_station_files
+
+
+def header_line(ident, name, lat, lon, elevation, first, last, country, source):
+
+    return '{:<12}{:<30}{:>5}{:>6}{:>4}{:>4}{:>4}{:<20}{}'.format(ident, name, lat, lon, elevation, first, last, country, source)
+
+
+def data_line(year, values):
+
+    return str(year) + ''.join([ '{:>5}'.format(value) for value in values ])
+
+
+STATIONS = [
+    (header_line('10300005306', 'KANDI', 1113, 293, 290, 1945, 1946, 'BENIN', 'MET FRANCE'), [1945, 1946]),
+    (header_line('61934000', 'SÃO TOMÉ', 38, 672, 8, 1951, 1951, 'SÃO TOMÉ E PRÍNCIPE', 'MET FRANCE'), [1951]),
+    (header_line('60030000', 'DAKAR/YOFF', 1473, -1750, 24, 1947, 1947, 'SENEGAL', 'MET FRANCE'), [1947]),
+    ]
+
+
+def write_raw_file(path, offset=0):
+
+    lines = []
+    for header, years in STATIONS:
+        lines.append(header)
+        lines.extend([ data_line(year, [ 200 + offset + month for month in range(11) ] + [-9999]) for year in years ])
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def baseline_headers(path):
+
+    # per-line character slicing of the decoded text, as the raw converter did
+
+    with open(path, encoding='utf-8') as f:
+        lines = f.readlines()
+    return [ [line[0:12].rstrip(), int(np.round(float(line[42:47].strip())/10.0, 0)), int(np.round(float(line[47:53].strip())/10.0, 0)),
+        int(line[53:57]), line[12:42].strip(), line[65:85].strip(), int(line[57:61]), int(line[61:65]), line[85:].strip()]
+        for line in lines if not (line[4] == '-' or line[4].isspace()) ]
+
+
+def test_non_ascii_header_fields_are_sliced_by_character(tmp_path):
+
+    path = str(tmp_path / 'fwa.min')
+    write_raw_file(path)
+    stations, years, values, station = parse_raw_file(path)
+    columns = ['stationcode', 'stationlat', 'stationlon', 'stationelevation', 'stationname', 'stationcountry', 'stationfirstyear', 'stationlastyear', 'stationsource']
+    assert stations[columns].values.tolist() == baseline_headers(path)
+    assert years.tolist() == [1945, 1946, 1951, 1947]
+    assert station.tolist() == [0, 0, 1, 2]
+    assert values[2, :2].tolist() == [200.0, 201.0]
+
+
+def test_non_ascii_names_are_written_as_utf8(tmp_path):
+
+    write_raw_file(str(tmp_path / 'fwa.min'))
+    write_raw_file(str(tmp_path / 'fwa.max'), offset=100)
+    frames = join_raw_files(str(tmp_path / 'fwa.min'), str(tmp_path / 'fwa.max'))
+    assert write_station_files(frames['tmean'], str(tmp_path), scale=1) == 3
+    with open(str(tmp_path / '61934000.txt'), encoding='utf-8') as f:
+        assert 'SÃO TOMÉ' in f.readline()
+
+
+def test_station_metadata_comes_from_the_file_supplying_the_output(tmp_path):
+
+    with open(str(tmp_path / 'a.min'), 'w') as f:
+        f.write(header_line('AAAAAA', 'a', 100, 200, 10, 1900, 1900, 'X', 'S') + '\n' + data_line(1900, [1] * 12) + '\n')
+    with open(str(tmp_path / 'a.max'), 'w') as f:
+        f.write(header_line('AAAAAA', 'a2', 110, 210, 20, 1900, 1900, 'X', 'S') + '\n' + data_line(1900, [3] * 12) + '\n')
+    frames = join_raw_files(str(tmp_path / 'a.min'), str(tmp_path / 'a.max'), outputs=('tmean', 'tmin', 'tmax', 'dtr'))
+    names = { output: df['stationname'].tolist() for output, df in frames.items() }
+    assert names == {'tmean': ['a'], 'tmin': ['a'], 'tmax': ['a2'], 'dtr': ['a']}
+    assert frames['tmax']['stationelevation'].tolist() == [20]
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from glosat_lut.clusters import cluster_stations
+
+
+def test_links_do_not_chain_different_station_codes():
+
+    # 0 and 3 are different coded stations; 1 and 2 are uncoded rows linked
+    # to both of them by spatial and name evidence
+
+    codes = ['605900', '-999', '-999', '606000', '605900']
+    links = pd.DataFrame({
+        'row_a': [0, 1, 2, 1, 2],
+        'row_b': [4, 0, 3, 2, 0],
+        'evidence': ['code', 'spatial', 'spatial', 'name', 'name'],
+        })
+    cluster_id, conflicts = cluster_stations(len(codes), links, codes)
+    assert cluster_id.tolist() == [0, 0, 1, 1, 0]
+    assert conflicts[['row_a', 'row_b', 'evidence', 'code_a', 'code_b']].values.tolist() == [
+        [1, 2, 'name', '605900', '606000'],
+        [2, 0, 'name', '606000', '605900'],
+        ]
+
+
+def test_without_codes_every_link_is_applied():
+
+    links = pd.DataFrame({'row_a': [0, 1], 'row_b': [1, 2], 'evidence': ['spatial', 'name']})
+    cluster_id, conflicts = cluster_stations(4, links)
+    assert cluster_id.tolist() == [0, 0, 0, 1]
+    assert len(conflicts) == 0
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from glosat_lut.cube import build_cube, save_cube, load_cube, cube_is_current
+
+
+def test_cube_is_checked_against_its_pickle(tmp_path):
+
+    pkl_file = str(tmp_path / 'df_temp.pkl')
+    cube_dir = str(tmp_path / 'df_temp_cube')
+    df = pd.DataFrame({'year': [1900, 1901], **{ str(month): [1.5, np.nan] for month in range(1, 13) }, 'stationcode': ['619670', '619670']})
+    df.to_pickle(pkl_file, compression='bz2')
+    assert not cube_is_current(cube_dir, pkl_file)
+
+    save_cube(build_cube(df), cube_dir, source=pkl_file)
+    assert cube_is_current(cube_dir, pkl_file)
+    assert load_cube(cube_dir).station('619670')[1][0, 0] == 1.5
+
+    df.iloc[:1].to_pickle(pkl_file, compression='bz2')
+    with pytest.warns(UserWarning, match='reading the pickle'):
+        assert not cube_is_current(cube_dir, pkl_file)
+
+
+def test_repeated_station_years_are_rejected():
+
+    df = pd.DataFrame({'year': [1900, 1901, 1901], **{ str(month): [1.5, 2.0, 2.5] for month in range(1, 13) }, 'stationcode': ['619670'] * 3})
+    with pytest.raises(ValueError, match='619670 1901'):
+        build_cube(df)
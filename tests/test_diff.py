@@ -0,0 +1,48 @@
+import pandas as pd
+
+from glosat_lut.diff import diff_luts
+
+
+def release(rows):
+
+    return pd.DataFrame(rows, columns=['source_lut', 'source_code1', 'source_code2', 'station_code', 'station_name']).astype(str)
+
+
+LUT4 = [ ['4', '-999', '-999', code, name] for code, name in [('010010', 'Jan Mayen'), ('037401', 'Hadcet'), ('619670', 'Diego Garcia')] ]
+
+
+def test_lut4_insert_is_one_added_row():
+
+    old = release([['1', 'A1', '-999', '010010', 'Jan Mayen']] + LUT4)
+    new = release([['1', 'A1', '-999', '010010', 'Jan Mayen']] + LUT4[:1] + [['4', '-999', '-999', '030050', 'Lerwick']] + LUT4[1:])
+    added, removed, changed, repeated = diff_luts(old, new)
+    assert added['station_code'].tolist() == ['030050']
+    assert len(removed) == 0
+    assert len(changed) == 0
+
+
+def test_lut4_field_change_is_keyed_by_station_code():
+
+    old = release(LUT4)
+    new = release(LUT4[::-1])
+    new.loc[new['station_code'] == '037401', 'station_name'] = 'HadCET'
+    added, removed, changed, repeated = diff_luts(old, new)
+    assert len(added) == 0 and len(removed) == 0
+    assert changed[['key', 'field', 'old', 'new']].values.tolist() == [['4|station_code=037401', 'station_name', 'Hadcet', 'HadCET']]
+
+
+def test_repeated_keys_are_reported_separately():
+
+    # a LUT #1 station_id listed once per observed variable
+
+    lut1 = [ ['1', '10300005306', '-999', '-999', 'Kandi'], ['1', '10300005306', '-999', '-999', 'Kandi'], ['1', 'A2', '-999', '-999', 'Natitingou'] ]
+    old = release(lut1 + LUT4)
+    new = release(lut1[:1] + [['1', '10300005306', '-999', '-999', 'KANDI']] + lut1[2:] + LUT4)
+    new.loc[new['station_code'] == '037401', 'station_name'] = 'HadCET'
+    added, removed, changed, repeated = diff_luts(old, new)
+    assert len(added) == 0 and len(removed) == 0
+    assert changed['key'].tolist() == ['4|station_code=037401']
+    assert repeated.values.tolist() == [['1|10300005306|-999', 2, 2, True]]
+
+    added, removed, changed, repeated = diff_luts(old, old)
+    assert repeated['changed'].tolist() == [False]
@@ -0,0 +1,45 @@
+import numpy as np
+
+from glosat_lut.countries import alpha2_to_continent
+from glosat_lut.geolocate import wmo_block_to_alpha2, infer_alpha2
+
+
+def test_shared_sub_blocks_are_not_assigned():
+
+    # Brunei, Malaysian Borneo, Pretoria (ZA in the BW sub-block), Svalbard
+    codes = ['963150', '964130', '682620', '010080']
+    assert wmo_block_to_alpha2(codes).tolist() == ['-999', '-999', '-999', '-999']
+
+
+def test_single_country_sub_blocks():
+
+    codes = ['967450', '011520', '717000', '945780', '37', '-999']
+    assert wmo_block_to_alpha2(codes).tolist() == ['ID', 'NO', 'CA', 'AU', '-999', '-999']
+
+
+def test_exact_text_wins_over_wmo_block():
+
+    codes = ['682620', '967450', '967450', '600200']
+    text = ['ZA', 'SG', 'MY', '-999']
+    exact = [True, True, False, False]
+    lat = np.zeros(4)
+    lon = np.zeros(4)
+    alpha2, source = infer_alpha2(codes, text, exact, lat, lon)
+    assert alpha2.tolist() == ['ZA', 'SG', 'ID', '-999']
+    assert source.tolist() == ['text', 'text', 'wmo', '-999']
+
+
+def test_antarctica_continent():
+
+    assert alpha2_to_continent(['AQ']).tolist() == ['Antarctica']
+
+
+def test_failed_raster_download_skips_the_raster_tier(tmp_path, monkeypatch):
+
+    import glosat_lut.geolocate as geolocate
+
+    def offline(raster_file):
+        raise OSError('Name or service not known')
+
+    monkeypatch.setattr(geolocate, 'build_country_raster', offline)
+    assert geolocate.load_country_raster(str(tmp_path / 'country_raster.npz')) is None
@@ -0,0 +1,35 @@
+import json
+
+import pandas as pd
+
+from glosat_lut.lookup import build_index, StationIndex
+
+
+def station_index(tmp_path, n=8):
+
+    lut = pd.DataFrame({
+        'station_code': [ '%06d' % (605900 + k) for k in range(n) ],
+        'station_name': [ 'Station %s' % chr(ord('A') + k) for k in range(n) ],
+        'station_country': ['ALGERIA'] * n,
+        'iso-3166': ['DZ'] * n,
+        'continent': ['Africa'] * n,
+        'source_code1': [ 'A%d' % k for k in range(n) ],
+        'source_code2': ['-999'] * n,
+        'station_lat': [ 305 + k for k in range(n) ],
+        'station_lon': [28] * n,
+        'station_elevation': [397] * n,
+        'station_firstyear': [1900] * n,
+        'station_lastyear': [2000] * n,
+        'source_lut': [1] * n,
+        })
+    build_index(lut, str(tmp_path))
+    return StationIndex(str(tmp_path))
+
+
+def test_near_limit_from_json_request(tmp_path):
+
+    index = station_index(tmp_path)
+    request = json.loads('{"op": "near", "lat": 30.5, "lon": 2.8, "radius": 100, "limit": "3"}')
+    records = index.query(request)
+    assert [ record['station_code'] for record in records ] == ['605900', '605901', '605902']
+    assert len(index.query({'op': 'near', 'lat': 30.5, 'lon': 2.8, 'radius': 100})) == 8
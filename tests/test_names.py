@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from glosat_lut.names import suggest_station_codes, normalize_name
+
+
+def lut_frame(rows):
+
+    return pd.DataFrame(rows, columns=['source_lut', 'source_code1', 'source_code2', 'station_code', 'station_name', 'iso-3166', 'station_lat', 'station_lon'])
+
+
+def test_normalize_name():
+
+    assert normalize_name('EL-GOLEA GSN') == 'El Golea'
+    assert normalize_name('Dakar/Yoff AP') == 'Dakar Yoff'
+
+
+def test_matching_names_are_suggested():
+
+    lut = lut_frame([
+        [1, 'A1', '-999', '605900', 'EL-GOLEA', 'DZ', 305, 28],
+        [2, 'B1', '-999', '-999', 'El Golea GSN', 'DZ', 305, 28],
+        ])
+    suggestions = suggest_station_codes(lut)
+    assert suggestions['suggested_code'].tolist() == ['605900']
+    assert suggestions['score'].iloc[0] == 1.0
+
+
+def test_missing_names_get_no_suggestions():
+
+    missing = [np.nan, None, '<NA>', 'nan', '-999', '', '  ', '12345']
+    coded = [ [1, 'A' + str(i), '-999', str(600000 + i), name, 'DZ', 305, 28] for i, name in enumerate(missing) ]
+    uncoded = [ [2, 'B' + str(i), '-999', '-999', name, 'DZ', 305, 28] for i, name in enumerate(missing) ]
+    suggestions = suggest_station_codes(lut_frame(coded + uncoded))
+    assert len(suggestions) == 0
+
+
+def test_title_cased_missing_names_get_no_suggestions():
+
+    # glosat-lut.py merges the LUTs with station_name.astype('string').astype(str).str.title()
+
+    names = pd.Series([pd.NA, np.nan, 'nan', '<NA>', 'Tamanrasset'] * 2).astype('string').astype(str).str.title()
+    coded = [ [1, 'A' + str(i), '-999', str(600000 + i), name, 'DZ', 305, 28] for i, name in enumerate(names[:5]) ]
+    uncoded = [ [2, 'B' + str(i), '-999', '-999', name, 'DZ', 305, 28] for i, name in enumerate(names[5:]) ]
+    assert set(names) == {'<Na>', 'Nan', 'Tamanrasset'}
+    suggestions = suggest_station_codes(lut_frame(coded + uncoded))
+    assert suggestions['suggested_code'].tolist() == ['600004']
@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from glosat_lut.outputs import write_csv, _csv_lines
+
+pytest.importorskip('pyarrow')
+
+
+def test_write_csv_matches_pandas(tmp_path):
+
+    df = pd.DataFrame({
+        'station_code': ['010010', '-999', '619670', '037401', '123456', '654321', '111111'],
+        'station_name': ['Jan Mayen', 'Dakar, Yoff', 'Diego "Garcia"', 'Line\rFeed', 'Two\r\nLines', 'Multi\nLine', None],
+        'station_firstyear': [1921, 1850, 1950, 1659, 1900, 1901, 1902],
+        })
+    expected = df.to_csv().encode('utf-8')
+    assert bytes(_csv_lines(df)) == expected.split(b'\n', 1)[1]       # the Arrow path itself, not the pandas fallback
+    path = tmp_path / 'lut.csv'
+    write_csv(df, path, chunksize=3)
+    assert path.read_bytes() == expected
+    df.to_csv(tmp_path / 'pandas.csv')
+    assert pd.read_csv(path, index_col=0, dtype=str).equals(pd.read_csv(tmp_path / 'pandas.csv', index_col=0, dtype=str))
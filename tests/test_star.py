@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from glosat_lut.archive import read_station_metadata
+from glosat_lut.star import write_star, star_is_current
+
+
+def test_star_station_table_is_checked_against_its_pickle(tmp_path):
+
+    pkl_file = str(tmp_path / 'df_temp.pkl')
+    star_dir = str(tmp_path / 'df_temp_star')
+    df = pd.DataFrame({'year': [1900, 1900], **{ str(month): [1.5, np.nan] for month in range(1, 13) },
+        'stationcode': ['619670', '037401'], 'stationlat': [-7.3, 52.5], 'stationname': ['DIEGO GARCIA', 'HADCET']})
+    df.to_pickle(pkl_file, compression='bz2')
+    write_star(df, star_dir, source=pkl_file)
+    assert star_is_current(star_dir, pkl_file)
+
+    # a station table that differs from the pickle shows which one was read
+
+    df.iloc[:1].to_pickle(pkl_file, compression='bz2')
+    with pytest.warns(UserWarning, match='reading the pickle'):
+        stations = read_station_metadata(pkl_file, columns=['stationlat', 'stationname'])
+    assert stations['stationcode'].tolist() == ['619670']
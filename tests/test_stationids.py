@@ -0,0 +1,60 @@
+from glosat_lut.stationids import resolve_station_codes, SECONDARY_ID_RULES, PRIMARY_STATION_ID_RULES
+
+
+def reference_code(ident):
+
+    # per-ID str semantics of the rule table (len() and slices in characters)
+
+    for match, keep, prefix, suffix in SECONDARY_ID_RULES:
+        kind = match[0]
+        if kind == 'length':
+            hit = len(ident) == match[1]
+        elif kind == 'startswith':
+            hit = ident.startswith(match[1])
+        elif kind == 'endswith':
+            hit = ident.endswith(match[1])
+        else:
+            hit = ident[match[1]:match[2]] == match[3]
+        if hit:
+            return prefix + ident[slice(*keep)] + suffix
+    return '-999'
+
+
+def test_ascii_ids():
+
+    ids = ['12345', '1234567', '123456789', 'WMO12345', 'AFWA123456', '1030000123', '5000099999', 'XYZ']
+    assert list(resolve_station_codes(ids)) == [ reference_code(ident) for ident in ids ]
+
+
+def test_non_ascii_ids_use_character_lengths():
+
+    ids = ['É1234', 'WMOé1234', '12345', 'Ö123456', 'ÅÅ']
+    codes = list(resolve_station_codes(ids))
+    assert codes == [ reference_code(ident) for ident in ids ]
+    assert codes[0] == 'É12340'
+    assert codes[1] == 'é12340'
+    assert codes[4] == '-999'
+
+
+def test_non_ascii_ids_pass_through_when_unmatched():
+
+    assert list(resolve_station_codes(['ÅÅ'], missing=None)) == ['ÅÅ']
+
+
+def baseline_primary_code(station_code_in):
+
+    # glosat-c3s-crutem-converter.py before the rule table
+
+    if station_code_in[-6:][0] == '0':
+        if station_code_in[-6:][1] == '6':
+            return station_code_in[-5:] + '0'
+        elif station_code_in[-6:][1] == '0':
+            return '6' + station_code_in[-4:] + '0'
+    return station_code_in
+
+
+def test_primary_station_ids_match_the_baseline_converter():
+
+    ids = ['AG000060590', 'AG000006590', 'AGM00060590', '06123', '00123', '061234', '001234', '0612', '0012', '16123', 'ÉÉ0060590', '0É123']
+    assert list(resolve_station_codes(ids, PRIMARY_STATION_ID_RULES, missing=None)) == [ baseline_primary_code(ident) for ident in ids ]
+    assert list(resolve_station_codes(['06123', '00123'], PRIMARY_STATION_ID_RULES, missing=None)) == ['061230', '601230']